@@ -0,0 +1,78 @@
+# Standart libarry imports
+import os
+import csv
+from contextlib import redirect_stdout
+
+# Local package imports
+from social_network_analysis.benchmarks.synthetic_dataset import SyntheticDatasetGenerator
+from social_network_analysis.network_utils.network_factory import NetworkFabric
+from social_network_analysis.network_utils.network_base import NetworkAnalytics
+from social_network_analysis.profiling import profiler, profile_stage, PROFILING_REPORT_COLUMNS
+from social_network_utils import import_and_clean_dataset, process_dataset, create_fuzzy_author_matcher, SOCIAL_NETWORK_NAMES
+
+# Numbers of publication records of synthetic datasets that are benchmarked (up to 5000000; datasets above 100000 records are written to .csv)
+BENCHMARK_SCALES = [1000, 10000, 100000]
+
+# Directory where synthetic datasets, pipeline logs and benchmark reports are stored (datasets are generated only once)
+BENCHMARK_DIRECTORY = 'benchmark'
+
+# Synthetic dataset options: coauthors distribution can be 'poisson', 'zipf' or 'fixed' (defaults in benchmarks/settings.py)
+DATASET_OPTIONS = {
+    'coauthors_distribution': 'poisson',
+    'mean_authors_per_publication': 4,
+    'seed': 0,
+}
+
+# Resolving unmatched author names (typos in synthetic records) with fuzzy matching
+USE_FUZZY_AUTHOR_MATCHING = True
+
+# Running network analytics besides creating networks (exact betweenness does not finish on largest scales, use 'sampled' mode there)
+RUN_NETWORK_ANALYSIS = False
+ANALYSIS_OPTIONS = {
+    'mode': 'sampled',
+}
+
+
+def run_benchmark(path, authors_file_name, publications_file_name):
+    """Runs pipeline on given dataset, recording every stage of import, processing and creation (and analysis) of each network."""
+    profiler.reset()
+    with profile_stage('import_and_clean_dataset'):
+        all_authors, all_publication_records = import_and_clean_dataset(path, authors_file_name, publications_file_name)
+    with profile_stage('process_dataset'):
+        fuzzy_matcher = create_fuzzy_author_matcher(path, all_authors) if USE_FUZZY_AUTHOR_MATCHING else None
+        publications = process_dataset(all_authors, all_publication_records, fuzzy_matcher)
+    network_fabric = NetworkFabric(all_authors, publications)
+    for social_network_name in SOCIAL_NETWORK_NAMES:
+        with profile_stage(social_network_name):
+            network = network_fabric.get_network(social_network_name).materialize()
+            if RUN_NETWORK_ANALYSIS:
+                with profile_stage('analysis'):
+                    NetworkAnalytics(network, social_network_name).run_analysis(**ANALYSIS_OPTIONS)
+    return len(all_publication_records), len(publications)
+
+
+if __name__ == '__main__':
+
+    dataset_generator = SyntheticDatasetGenerator(**DATASET_OPTIONS)
+    dataset_path = os.path.join(BENCHMARK_DIRECTORY, 'dataset')
+    summary_records = []
+    for number_of_records in BENCHMARK_SCALES:
+        authors_file_name, publications_file_name = dataset_generator.get_file_names(number_of_records)
+        if not os.path.isfile(os.path.join(dataset_path, publications_file_name)):
+            print(f'Generating synthetic dataset with {number_of_records} publication records...')
+            dataset_generator.generate(dataset_path, number_of_records)
+
+        print(f'Benchmarking {publications_file_name}...')
+        # Pipeline output is written to log file, so that printing does not affect measured times
+        with open(os.path.join(BENCHMARK_DIRECTORY, f'Benchmark Log - {number_of_records} records.txt'), 'w', encoding='utf8') as log, redirect_stdout(log):
+            number_of_valid_records, number_of_publications = run_benchmark(dataset_path, authors_file_name, publications_file_name)
+        print(f'{number_of_valid_records} valid records, {number_of_publications} publications')
+        profiler.print_report()
+        profiler.export_report(path=BENCHMARK_DIRECTORY, file_name=f'Benchmark Report - {number_of_records} records')
+        summary_records.extend(dict(record, records=number_of_records) for record in profiler.records)
+
+    # Summary of all scales, for comparing how each stage scales with number of records
+    with open(os.path.join(BENCHMARK_DIRECTORY, 'Benchmark Summary.csv'), 'w', encoding='utf8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['records'] + PROFILING_REPORT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(summary_records)
@@ -1,24 +1,146 @@
+# Standart libarry imports
+import os
+
 # Local package imports
 from social_network_analysis.network_utils.network_factory import NetworkFabric
-from social_network_utils import import_and_clean_dataset, process_dataset, create_and_process_social_networks
+from social_network_analysis.network_utils.dataset_index import DatasetFilter
+from social_network_analysis.network_utils.dataset_snapshot import DatasetSnapshot
+from social_network_analysis.profiling import profiler
+from social_network_analysis.result_cache import ResultCache, RESULT_CACHE_DIRECTORY_NAME
+from social_network_utils import import_and_clean_dataset, process_dataset, import_and_process_dataset_in_chunks, import_and_update_dataset_state, create_fuzzy_author_matcher, create_and_process_social_networks, get_network_cache_keys, get_dataset_snapshot_path
 
 # Input file names
 PUBLICATIONS_FILE_NAME = 'UB_cs_papers_scopus.xlsx'
 AUTORS_FILE_NAME = 'UB_cs_authors.xlsx'
 
+# Keeping imported excel files in binary format (dataset/.cache), so they are parsed only once
+USE_DATASET_CACHE = False
+
+# Resolving author names that are not matched exactly (typos, initials, missing diacritics) with fuzzy matching
+USE_FUZZY_AUTHOR_MATCHING = False
+
+# Keeping processed dataset between runs (dataset/.cache) and applying only new or changed publication rows,
+# networks that did not change are not exported and analysed again
+INCREMENTAL_UPDATE = False
+
+# In incremental update mode, publications file contains only new rows (e.g. weekly delta) instead of full export, so rows applied
+# in previous runs are kept. With full export, rows that were removed or changed (title, authors or year) since previous run are retracted
+PUBLICATIONS_FILE_IS_DELTA = False
+
+# Keeping processed dataset as memory-mapped snapshot (dataset/.cache/snapshots), keyed by hashes of input files and dataset processing settings,
+# so that next runs create networks from snapshot without importing and processing excel files, and network workers attach to snapshot
+# instead of receiving a copy of dataset. Not used in incremental update mode.
+USE_DATASET_SNAPSHOT = False
+
+# Reading publications in chunks of given number of rows, for exports too large to fit in memory (None reads whole file at once)
+PUBLICATIONS_CHUNK_SIZE = None
+
+# Centrality analysis options, mode can be 'exact', 'sampled' or 'adaptive' (defaults in network_utils/settings.py)
+ANALYSIS_OPTIONS = {
+    'mode': 'exact',
+}
+
+# Keeping graphs and centralities of analysed networks (output/.analytics), so that in next run closeness and betweenness 
+# are recalculated only in changed components and eigenvector centrality starts from previous values (exact mode only)
+INCREMENTAL_ANALYTICS = False
+
+# Exporting wall time, CPU time and peak memory of each pipeline stage (output/Profiling Report.json and .csv)
+PROFILING_REPORT = False
+
+# Creating networks only from part of dataset, e.g. {'first_year': 2010, 'last_year': 2018, 'faculties': ['matematicki fakultet'], 'publication_types': ['Article']}
+# (None creates networks from whole dataset)
+NETWORK_FILTER = None
+
+# Keeping created networks and their analytics (output/.results), keyed by hashes of input files and all settings, so that in next run
+# networks that did not change are only exported (if no network changed, dataset is not even imported). Not used in incremental update mode.
+USE_RESULT_CACHE = False
+
+# Maximum size of result cache, least recently used results are removed when it is exceeded
+RESULT_CACHE_MAX_SIZE_MB = 1024
+
+# Export options of nodes and edges files, compression can be None (.csv), 'gzip' (.csv.gz) or 'zstd' (.csv.zst, requires zstandard package),
+# with parallel writers nodes and edges files are written concurrently. Export options are not part of result cache keys.
+EXPORT_OPTIONS = {
+    'compression': None,
+    'parallel_writers': True,
+}
+
+# Formats each network is exported to: 'csv', 'gexf' (Gephi graph file), 'parquet' (typed node and edge tables, requires pyarrow)
+# and 'edgelist' (memory-mappable int32 .npy edge list), e.g. {'Article Paper Network': ['csv', 'gexf']}. Networks that are not listed are exported to csv.
+NETWORK_EXPORT_FORMATS = {}
+
+# Analytics report options, node metrics formats ('csv', 'json') export attributes and centralities of every node
+# to structured files next to analytics report (e.g. 'CoAuthor Network - Node Metrics.csv')
+REPORT_OPTIONS = {
+    'node_metrics_formats': [],
+}
+
+# Number of processes used for creating and analysing networks in parallel (None uses all available cores)
+NETWORK_WORKERS = 1
+
 if __name__ == '__main__':
 
-    # Importing dataset
-    cleaned_dataset = import_and_clean_dataset(path='dataset', authors_file_name=AUTORS_FILE_NAME, publications_file_name=PUBLICATIONS_FILE_NAME)
-    all_authors = cleaned_dataset[0]
-    all_publication_records = cleaned_dataset[1]
+    result_cache = None
+    network_cache_keys = None
+    if USE_RESULT_CACHE and not INCREMENTAL_UPDATE:
+        result_cache = ResultCache(path=os.path.join('output', RESULT_CACHE_DIRECTORY_NAME), max_size=RESULT_CACHE_MAX_SIZE_MB * 1024 * 1024)
+        network_cache_keys = get_network_cache_keys(path='dataset', authors_file_name=AUTORS_FILE_NAME, publications_file_name=PUBLICATIONS_FILE_NAME, options={
+            'fuzzy_matching': USE_FUZZY_AUTHOR_MATCHING,
+            'network_filter': NETWORK_FILTER,
+            'analysis_options': ANALYSIS_OPTIONS,
+            'incremental_analytics': INCREMENTAL_ANALYTICS,
+        })
+
+    snapshot_path = None
+    if USE_DATASET_SNAPSHOT and not INCREMENTAL_UPDATE:
+        snapshot_path = get_dataset_snapshot_path(path='dataset', authors_file_name=AUTORS_FILE_NAME, publications_file_name=PUBLICATIONS_FILE_NAME, options={
+            'fuzzy_matching': USE_FUZZY_AUTHOR_MATCHING,
+            'network_filter': NETWORK_FILTER,
+        })
+
+    if result_cache is not None and all(result_cache.contains(cache_key) for cache_key in network_cache_keys.values()):
+        # All networks are exported from result cache, so dataset is not needed
+        print('All networks are in result cache, skipping dataset import...')
+        network_fabric = None
+    elif snapshot_path is not None and DatasetSnapshot.exists(snapshot_path):
+        # Creating networks from processed dataset of previous run
+        print('Processed dataset snapshot found, skipping dataset import...')
+        network_fabric = NetworkFabric.from_snapshot(snapshot_path)
+    else:
+        if INCREMENTAL_UPDATE:
+            # Applying new publication rows to dataset processed in previous runs
+            dataset_state = import_and_update_dataset_state(path='dataset', authors_file_name=AUTORS_FILE_NAME, publications_file_name=PUBLICATIONS_FILE_NAME, use_cache=USE_DATASET_CACHE, fuzzy_matching=USE_FUZZY_AUTHOR_MATCHING,
+                                                            publications_delta=PUBLICATIONS_FILE_IS_DELTA)
+            all_authors = dataset_state.authors
+            publications = dataset_state.publications
+        elif PUBLICATIONS_CHUNK_SIZE:
+            # Importing and processing dataset chunk by chunk
+            all_authors, publications = import_and_process_dataset_in_chunks(path='dataset', authors_file_name=AUTORS_FILE_NAME, publications_file_name=PUBLICATIONS_FILE_NAME, chunk_size=PUBLICATIONS_CHUNK_SIZE, use_cache=USE_DATASET_CACHE, fuzzy_matching=USE_FUZZY_AUTHOR_MATCHING)
+        else:
+            # Importing dataset
+            cleaned_dataset = import_and_clean_dataset(path='dataset', authors_file_name=AUTORS_FILE_NAME, publications_file_name=PUBLICATIONS_FILE_NAME, use_cache=USE_DATASET_CACHE)
+            all_authors = cleaned_dataset[0]
+            all_publication_records = cleaned_dataset[1]
 
-    # Processing dataset
-    publications = process_dataset(all_authors, all_publication_records)
+            # Processing dataset
+            fuzzy_matcher = create_fuzzy_author_matcher('dataset', all_authors) if USE_FUZZY_AUTHOR_MATCHING else None
+            publications = process_dataset(all_authors, all_publication_records, fuzzy_matcher)
+        network_fabric = NetworkFabric(all_authors, publications, dataset_filter=DatasetFilter(**NETWORK_FILTER) if NETWORK_FILTER else None)
+        if snapshot_path is not None:
+            network_fabric.save_snapshot(snapshot_path)
     
     # Creating social networks, running analytics and exporting network's nodes, edges and metrics for further analysis
-    network_fabric = NetworkFabric(all_authors, publications)
-    create_and_process_social_networks(network_fabric, output_directory='output')
+    if INCREMENTAL_UPDATE:
+        create_and_process_social_networks(network_fabric, output_directory='output', analysis_options=ANALYSIS_OPTIONS, workers=NETWORK_WORKERS, network_digests=dataset_state.network_digests, incremental_analytics=INCREMENTAL_ANALYTICS,
+                                           export_options=EXPORT_OPTIONS, export_formats=NETWORK_EXPORT_FORMATS, report_options=REPORT_OPTIONS)
+        dataset_state.save()
+    else:
+        create_and_process_social_networks(network_fabric, output_directory='output', analysis_options=ANALYSIS_OPTIONS, workers=NETWORK_WORKERS, incremental_analytics=INCREMENTAL_ANALYTICS,
+                                           result_cache=result_cache, network_cache_keys=network_cache_keys, export_options=EXPORT_OPTIONS, export_formats=NETWORK_EXPORT_FORMATS, report_options=REPORT_OPTIONS)
 
     
-    
\ No newline at end of file
+    
+
+    if PROFILING_REPORT:
+        profiler.print_report()
+        profiler.export_report(path='output', file_name='Profiling Report')
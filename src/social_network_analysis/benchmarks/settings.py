@@ -0,0 +1,34 @@
+# Distributions of number of authors per publication: 'poisson' (most papers have around mean number of authors),
+# 'zipf' (heavy tail, few papers with very many authors) or 'fixed' (every paper has mean number of authors)
+COAUTHORS_DISTRIBUTIONS = ['poisson', 'zipf', 'fixed']
+
+# Default parameters of synthetic dataset
+SYNTHETIC_MEAN_AUTHORS_PER_PUBLICATION = 4
+SYNTHETIC_MAX_AUTHORS_PER_PUBLICATION = 100
+SYNTHETIC_ZIPF_EXPONENT = 2.5
+
+# Share of publication's authors that are in authors roster (other authors appear only in authors column)
+SYNTHETIC_ROSTER_AUTHOR_SHARE = 0.4
+
+# Number of publication records per roster author, used when number of authors is not given
+SYNTHETIC_RECORDS_PER_AUTHOR = 10
+
+# Probability that roster coauthor of a publication is from same department as its first roster author
+SYNTHETIC_DEPARTMENT_AFFINITY = 0.7
+
+# Shape of Pareto distribution of author productivity (smaller values give few very productive authors), None gives uniform productivity
+SYNTHETIC_PRODUCTIVITY_SHAPE = 1.5
+
+# Share of publication records whose author name contains typo, only resolved by fuzzy matching
+SYNTHETIC_NAME_TYPO_SHARE = 0.01
+
+# Share of publication records with publication type that is not processed (e.g. 'Editorial')
+SYNTHETIC_INVALID_TYPE_SHARE = 0.02
+
+SYNTHETIC_DEPARTMENTS_PER_FACULTY = 4
+SYNTHETIC_FIRST_YEAR = 1990
+SYNTHETIC_LAST_YEAR = 2020
+
+# Publications are written to .xlsx up to this number of records and to .csv above it (writing large excel files is very slow,
+# and excel sheet can not have more than 1048576 rows)
+SYNTHETIC_EXCEL_MAX_RECORDS = 100000
@@ -0,0 +1,225 @@
+# Standart libarry imports
+import os
+import csv
+
+# Third party imports
+import numpy as np
+import openpyxl
+
+# Local project imports
+from ..data_processing.settings import (FACULTY_NAMES, AUTHORS_FIRST_NAME, AUTHORS_LAST_NAME, AUTHORS_MIDDLE_NAME, AUTHORS_DEPARTMENT_NAME, AUTHORS_FACULTY_NAME,
+                                        PUBLICATIONS_AUTHOR, PUBLICATIONS_PAPER_TITLE, PUBLICATIONS_YEAR, PUBLICATIONS_AUTHORS, PUBLICATIONS_TYPE, PUBLICATIONS_ARTICLE_NAME,
+                                        VALID_PUBLICATION_TYPES)
+from .settings import (COAUTHORS_DISTRIBUTIONS, SYNTHETIC_MEAN_AUTHORS_PER_PUBLICATION, SYNTHETIC_MAX_AUTHORS_PER_PUBLICATION, SYNTHETIC_ZIPF_EXPONENT,
+                       SYNTHETIC_ROSTER_AUTHOR_SHARE, SYNTHETIC_RECORDS_PER_AUTHOR, SYNTHETIC_DEPARTMENT_AFFINITY, SYNTHETIC_PRODUCTIVITY_SHAPE,
+                       SYNTHETIC_NAME_TYPO_SHARE, SYNTHETIC_INVALID_TYPE_SHARE, SYNTHETIC_DEPARTMENTS_PER_FACULTY, SYNTHETIC_FIRST_YEAR,
+                       SYNTHETIC_LAST_YEAR, SYNTHETIC_EXCEL_MAX_RECORDS)
+
+# Columns of generated files, in the same order as in Scopus export and authors roster
+AUTHORS_COLUMNS = [AUTHORS_FIRST_NAME, AUTHORS_LAST_NAME, AUTHORS_MIDDLE_NAME, AUTHORS_DEPARTMENT_NAME, AUTHORS_FACULTY_NAME]
+PUBLICATIONS_COLUMNS = [PUBLICATIONS_AUTHOR, PUBLICATIONS_PAPER_TITLE, PUBLICATIONS_YEAR, PUBLICATIONS_AUTHORS, PUBLICATIONS_TYPE, PUBLICATIONS_ARTICLE_NAME]
+
+# Publication types that are not processed, added to dataset so that filtering is benchmarked too
+INVALID_PUBLICATION_TYPES = ['Editorial', 'Erratum', 'Note', 'Conference Review']
+
+FIRST_NAMES = [
+    'aleksandar', 'ana', 'bojan', 'bosko', 'branko', 'dejan', 'dragan', 'dusan', 'gordana', 'goran', 'ivan', 'ivana', 'jelena', 'jovan',
+    'katarina', 'marija', 'marko', 'milan', 'milena', 'milos', 'miroslav', 'nenad', 'nikola', 'predrag', 'sanja', 'sinisa', 'slobodan',
+    'snezana', 'stefan', 'tatjana', 'uros', 'vesna', 'vladimir', 'zoran', 'zorica', 'petar', 'filip', 'luka', 'mina', 'teodora',
+]
+NAME_SYLLABLES = [
+    'ja', 'ni', 'ci', 'pa', 'vlo', 'la', 'ze', 'ko', 'mi', 'lo', 'se', 'vu', 'do', 'ra', 'to', 'ma', 'sto', 'jo', 'ka', 'de', 'ne', 'bo',
+    'dra', 'go', 'pe', 'tro', 'sa', 'vi', 'ti', 'ri', 'mla', 'ju', 'no', 'vak', 'su', 'lji', 'ba', 'zi', 'ku', 'ste',
+]
+TOPIC_WORDS = [
+    'graph', 'network', 'learning', 'algorithm', 'database', 'semantic', 'parallel', 'distributed', 'automated', 'reasoning',
+    'software', 'verification', 'signal', 'image', 'retrieval', 'optimization', 'security', 'cloud', 'model', 'analysis',
+    'computing', 'systems', 'theory', 'languages', 'compilers', 'hardware', 'robotics', 'vision', 'mining', 'information',
+]
+
+
+class SyntheticDatasetGenerator():
+    """
+    Generates synthetic authors roster (one sheet per faculty) and publications export with the same columns as UB dataset, at any scale.
+    Each publication has random number of authors (drawn from chosen coauthors distribution), roster authors of publication
+    produce one record each, same as in Scopus export. Author productivity is skewed and roster coauthors are mostly from same department,
+    so that created networks have structure similar to real ones. Same parameters and seed always give the same dataset.
+    Rows are written as they are generated, so generating millions of records does not keep them in memory.
+    """
+
+    def __init__(self, coauthors_distribution='poisson', mean_authors_per_publication=SYNTHETIC_MEAN_AUTHORS_PER_PUBLICATION,
+                 max_authors_per_publication=SYNTHETIC_MAX_AUTHORS_PER_PUBLICATION, zipf_exponent=SYNTHETIC_ZIPF_EXPONENT,
+                 roster_author_share=SYNTHETIC_ROSTER_AUTHOR_SHARE, department_affinity=SYNTHETIC_DEPARTMENT_AFFINITY,
+                 productivity_shape=SYNTHETIC_PRODUCTIVITY_SHAPE, name_typo_share=SYNTHETIC_NAME_TYPO_SHARE,
+                 invalid_type_share=SYNTHETIC_INVALID_TYPE_SHARE, seed=0):
+        if coauthors_distribution not in COAUTHORS_DISTRIBUTIONS:
+            raise ValueError(f'Unknown coauthors distribution {coauthors_distribution}, expected one of {COAUTHORS_DISTRIBUTIONS}')
+        self.coauthors_distribution = coauthors_distribution
+        self.mean_authors_per_publication = mean_authors_per_publication
+        self.max_authors_per_publication = max_authors_per_publication
+        self.zipf_exponent = zipf_exponent
+        self.roster_author_share = roster_author_share
+        self.department_affinity = department_affinity
+        self.productivity_shape = productivity_shape
+        self.name_typo_share = name_typo_share
+        self.invalid_type_share = invalid_type_share
+        self.seed = seed
+
+    def get_file_names(self, number_of_records, publications_format=None):
+        """Returns names of authors and publications files for given number of records, named by generator parameters."""
+        if publications_format is None:
+            publications_format = 'xlsx' if number_of_records <= SYNTHETIC_EXCEL_MAX_RECORDS else 'csv'
+        dataset_name = f'synthetic_{number_of_records}_{self.coauthors_distribution}_{self.mean_authors_per_publication}_{self.seed}'
+        return f'{dataset_name}_authors.xlsx', f'{dataset_name}_papers.{publications_format}'
+
+    def generate(self, path, number_of_records, number_of_authors=None, publications_format=None):
+        """
+        Generates dataset with given number of publication records into path and returns names of authors and publications files.
+        Publications are written to .xlsx or .csv (by default .csv only for datasets too large for excel).
+        """
+        os.makedirs(path, exist_ok=True)
+        authors_file_name, publications_file_name = self.get_file_names(number_of_records, publications_format)
+        random = np.random.default_rng(self.seed)
+        if number_of_authors is None:
+            number_of_authors = max(number_of_records // SYNTHETIC_RECORDS_PER_AUTHOR, len(FACULTY_NAMES) * SYNTHETIC_DEPARTMENTS_PER_FACULTY)
+        authors = self._create_authors(random, number_of_authors)
+        self._write_authors(os.path.join(path, authors_file_name), authors)
+        publication_rows = self._create_publication_rows(random, authors, number_of_records)
+        SyntheticDatasetGenerator._write_rows(os.path.join(path, publications_file_name), PUBLICATIONS_COLUMNS, publication_rows)
+        return authors_file_name, publications_file_name
+
+    def _create_authors(self, random, number_of_authors):
+        """Returns list of roster rows (first name, last name, middle name, department, faculty), with unique full names."""
+        departments = [(f'katedra za {TOPIC_WORDS[(faculty_index * SYNTHETIC_DEPARTMENTS_PER_FACULTY + i) % len(TOPIC_WORDS)]} {i + 1}', faculty_name)
+                       for faculty_index, faculty_name in enumerate(FACULTY_NAMES) for i in range(SYNTHETIC_DEPARTMENTS_PER_FACULTY)]
+        # Last names get more syllables in larger rosters, so that random names rarely repeat
+        syllables_per_name = 2
+        while len(NAME_SYLLABLES) ** syllables_per_name * len(FIRST_NAMES) < 20 * number_of_authors:
+            syllables_per_name += 1
+        authors = []
+        author_names = set()
+        while len(authors) < number_of_authors:
+            first_name = FIRST_NAMES[random.integers(len(FIRST_NAMES))]
+            last_name = ''.join(NAME_SYLLABLES[i] for i in random.integers(len(NAME_SYLLABLES), size=syllables_per_name)) + 'ic'
+            middle_name = chr(ord('a') + random.integers(26)) if random.random() < 0.3 else None
+            if (first_name, middle_name, last_name) in author_names:
+                continue
+            author_names.add((first_name, middle_name, last_name))
+            department, faculty = departments[len(authors) % len(departments)]
+            authors.append((first_name, last_name, middle_name, department, faculty))
+        return authors
+
+    def _write_authors(self, file_path, authors):
+        """Writes authors roster to excel file, one sheet per faculty."""
+        workbook = openpyxl.Workbook(write_only=True)
+        for faculty_name in FACULTY_NAMES:
+            sheet = workbook.create_sheet(title=faculty_name)
+            sheet.append(AUTHORS_COLUMNS)
+            for author in authors:
+                if author[4] == faculty_name:
+                    sheet.append(list(author))
+        workbook.save(file_path)
+
+    def _draw_number_of_authors(self, random, size):
+        """Returns array with number of authors of each publication, drawn from coauthors distribution."""
+        if self.coauthors_distribution == 'poisson':
+            numbers_of_authors = 1 + random.poisson(max(self.mean_authors_per_publication - 1, 0), size=size)
+        elif self.coauthors_distribution == 'zipf':
+            numbers_of_authors = random.zipf(self.zipf_exponent, size=size)
+        else:
+            numbers_of_authors = np.full(size, self.mean_authors_per_publication)
+        return np.clip(numbers_of_authors, 1, self.max_authors_per_publication)
+
+    def _create_publication_rows(self, random, authors, number_of_records):
+        """Generator yielding publication rows (in PUBLICATIONS_COLUMNS order) until number of records is reached."""
+        authors_by_department = dict()
+        for author_index, author in enumerate(authors):
+            authors_by_department.setdefault(author[3], []).append(author_index)
+        if self.productivity_shape is None:
+            productivity = np.ones(len(authors))
+        else:
+            productivity = 1 + random.pareto(self.productivity_shape, size=len(authors))
+        # Authors are drawn by productivity with binary search over cumulative distribution, for whole batch of publications at once
+        cumulative_productivity = np.cumsum(productivity)
+        cumulative_productivity /= cumulative_productivity[-1]
+        article_names = [f'journal of {TOPIC_WORDS[i % len(TOPIC_WORDS)]} {TOPIC_WORDS[(i // len(TOPIC_WORDS)) % len(TOPIC_WORDS)]} {i}'.title()
+                         for i in range(max(number_of_records // 50, 10))]
+
+        records = 0
+        publication_id = 0
+        batch_size = 10000
+        while records < number_of_records:
+            numbers_of_authors = self._draw_number_of_authors(random, batch_size)
+            drawn_authors = np.searchsorted(cumulative_productivity, random.random(size=batch_size * 4), side='right').tolist()
+            drawn_author_position = 0
+            years = random.integers(SYNTHETIC_FIRST_YEAR, SYNTHETIC_LAST_YEAR + 1, size=batch_size).tolist()
+            articles = np.minimum(random.zipf(1.5, size=batch_size) - 1, len(article_names) - 1).tolist()
+            for i in range(batch_size):
+                if records >= number_of_records or drawn_author_position + self.max_authors_per_publication * 4 > len(drawn_authors):
+                    break
+                publication_id += 1
+                number_of_authors = int(numbers_of_authors[i])
+                number_of_roster_authors = min(max(1, random.binomial(number_of_authors, self.roster_author_share)), number_of_records - records)
+                roster_authors = [drawn_authors[drawn_author_position]]
+                drawn_author_position += 1
+                department_authors = authors_by_department[authors[roster_authors[0]][3]]
+                # Roster may be too small for number of authors, so each publication gets limited number of attempts
+                for _ in range(4 * (number_of_roster_authors - 1)):
+                    if len(roster_authors) == number_of_roster_authors:
+                        break
+                    if random.random() < self.department_affinity:
+                        author_index = department_authors[random.integers(len(department_authors))]
+                    else:
+                        author_index = drawn_authors[drawn_author_position]
+                        drawn_author_position += 1
+                    if author_index not in roster_authors:
+                        roster_authors.append(author_index)
+                all_authors = [SyntheticDatasetGenerator._get_author_citation_name(authors[author_index]) for author_index in roster_authors]
+                all_authors.extend(SyntheticDatasetGenerator._get_external_author_citation_name(random) for _ in range(number_of_authors - len(roster_authors)))
+                random.shuffle(all_authors)
+
+                if random.random() < self.invalid_type_share:
+                    publication_type = INVALID_PUBLICATION_TYPES[random.integers(len(INVALID_PUBLICATION_TYPES))]
+                else:
+                    publication_type = VALID_PUBLICATION_TYPES[random.integers(len(VALID_PUBLICATION_TYPES))]
+                title_words = [TOPIC_WORDS[j] for j in random.integers(len(TOPIC_WORDS), size=3)]
+                title = f'{title_words[0].title()} {title_words[1]} for {title_words[2]} {publication_id}'
+                publication_authors = ' and '.join(all_authors)
+                for author_index in roster_authors:
+                    yield [self._get_author_record_name(random, authors[author_index]), title, years[i], publication_authors, publication_type, article_names[articles[i]]]
+                    records += 1
+
+    def _get_author_record_name(self, random, author):
+        """Returns author name as in 'UB zaposleni' column ("LastName FirstName M"), with typo in some records."""
+        first_name, last_name, middle_name = author[0], author[1], author[2]
+        if random.random() < self.name_typo_share:
+            position = 1 + random.integers(len(last_name) - 1)
+            last_name = last_name[:position] + last_name[position + 1:]
+        name = f'{last_name.title()} {first_name.title()}'
+        return name + f' {middle_name.upper()}' if middle_name else name
+
+    @staticmethod
+    def _get_author_citation_name(author):
+        """Returns author name as in 'Autori' column ("LastName, F.")."""
+        return f'{author[1].title()}, {author[0][0].upper()}.'
+
+    @staticmethod
+    def _get_external_author_citation_name(random):
+        last_name = ''.join(NAME_SYLLABLES[i] for i in random.integers(len(NAME_SYLLABLES), size=3))
+        return f'{last_name.title()}, {chr(ord("A") + random.integers(26))}.'
+
+    @staticmethod
+    def _write_rows(file_path, columns, rows):
+        """Writes rows to .csv or .xlsx file (chosen by file extension) as they are generated."""
+        if file_path.lower().endswith('.csv'):
+            with open(file_path, 'w', encoding='utf8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                writer.writerows(rows)
+            return
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(columns)
+        for row in rows:
+            sheet.append(row)
+        workbook.save(file_path)
@@ -0,0 +1,176 @@
+# Standart libarry imports
+import os
+import json
+import hashlib
+import unicodedata
+
+# Local project imports
+from .settings import FUZZY_MATCH_THRESHOLD, FUZZY_MATCH_PREFIX_LENGTH
+
+# Remembered matches stored in different format version are ignored
+AUTHOR_MATCHES_FORMAT_VERSION = 2
+
+# Characters separating words of author name, besides whitespace
+NAME_SEPARATORS_TABLE = str.maketrans({'-': ' ', '.': ' ', ',': ' ', "'": ''})
+
+
+def fold_name(name):
+    """Returns list of name's words, in lower case, without diacritics and punctuation."""
+    name = unicodedata.normalize('NFKD', name.lower())
+    name = ''.join(character for character in name if not unicodedata.combining(character))
+    return name.translate(NAME_SEPARATORS_TABLE).split()
+
+
+def edit_distance(first, second):
+    """Returns Levenshtein distance between two strings."""
+    if len(first) < len(second):
+        first, second = second, first
+    previous_row = list(range(len(second) + 1))
+    for i, first_character in enumerate(first, 1):
+        current_row = [i]
+        for j, second_character in enumerate(second, 1):
+            current_row.append(min(previous_row[j] + 1, current_row[j - 1] + 1, previous_row[j - 1] + (first_character != second_character)))
+        previous_row = current_row
+    return previous_row[-1]
+
+
+def name_similarity(first, second):
+    """Returns similarity of two names between 0 and 1, based on edit distance."""
+    if first == second:
+        return 1.0
+    return 1 - edit_distance(first, second) / max(len(first), len(second))
+
+
+class FuzzyAuthorMatcher():
+    """
+    Resolves author names from publications that are not matched exactly (typos, missing diacritics, initials,
+    compound last names or names with more than 4 words) to authors from roster.
+    Names are compared only with authors in same blocks (authors whose last name starts with same letters as one of name's words,
+    and authors whose first name is one of name's words and whose last name is about as long as one of other words, so that typos
+    in first letters of last name are resolved too), so the number of string comparisons does not grow with roster size.
+    Names with typos both in first name and in first letters of last name are not resolved. Resolved names are remembered in memory and,
+    if cache file is given, on disk between runs (as long as roster of authors stays the same).
+    """
+
+    def __init__(self, authors, cache_file_path=None, threshold=FUZZY_MATCH_THRESHOLD, prefix_length=FUZZY_MATCH_PREFIX_LENGTH):
+        self.authors = authors
+        self.cache_file_path = cache_file_path
+        self.threshold = threshold
+        self.prefix_length = prefix_length
+        self.blocks = dict()
+        # (first name word, length of last name word) -> authors
+        self.first_name_blocks = dict()
+        self.folded_names = dict()
+        for author_name in authors:
+            first_name, _, last_name = author_name
+            first_name_words = fold_name(first_name)
+            last_name_words = fold_name(last_name)
+            self.folded_names[author_name] = (' '.join(first_name_words), last_name_words)
+            for word in last_name_words:
+                self.blocks.setdefault(word[:prefix_length], []).append(author_name)
+                for first_name_word in first_name_words:
+                    self.first_name_blocks.setdefault((first_name_word, len(word)), []).append(author_name)
+        self.roster_fingerprint = self._get_roster_fingerprint()
+        # raw name -> (author name tuple or None, confidence)
+        self.matches = self._load_matches()
+        self.match_stats = {'matched': 0, 'from cache': 0, 'unresolved': 0}
+
+    def find(self, raw_name):
+        """Returns author best matching raw name from publication, or None if no author is similar enough."""
+        if raw_name in self.matches:
+            self.match_stats['from cache'] += 1
+            author_name, confidence = self.matches[raw_name]
+        else:
+            author_name, confidence = self.resolve(raw_name)
+            self.matches[raw_name] = (author_name, confidence)
+            if author_name is not None:
+                print('FUZZY MATCHED USER', raw_name, '->', self.authors[author_name].get_author_full_name(), f'(confidence {confidence:.2f})')
+        if author_name is None:
+            self.match_stats['unresolved'] += 1
+            return None
+        self.match_stats['matched'] += 1
+        return self.authors[author_name]
+
+    def resolve(self, raw_name):
+        """
+        Returns tuple (author name tuple, confidence) of best matching author. Author name is None if best confidence
+        is below threshold or if two different authors match equally well.
+        """
+        words = fold_name(raw_name)
+        candidates = set()
+        for word in words:
+            candidates.update(self.blocks.get(word[:self.prefix_length], []))
+        for first_name_index, first_name_word in enumerate(words):
+            for last_name_index, word in enumerate(words):
+                if last_name_index == first_name_index:
+                    continue
+                # Typo changes length of last name by at most one character
+                for length in range(len(word) - 1, len(word) + 2):
+                    candidates.update(self.first_name_blocks.get((first_name_word, length), []))
+        scores = sorted(((self._score(words, author_name), author_name) for author_name in candidates), key=lambda score: score[0], reverse=True)
+        if not scores or scores[0][0] < self.threshold:
+            return (None, scores[0][0] if scores else 0.0)
+        if len(scores) > 1 and scores[1][0] == scores[0][0]:
+            return (None, scores[0][0])
+        return (scores[0][1], scores[0][0])
+
+    def _score(self, words, author_name):
+        """
+        Returns confidence that name words belong to author: last name is matched with best span of consecutive words,
+        first name with best remaining word (single letter words are matched as initials).
+        """
+        first_name, last_name_words = self.folded_names[author_name]
+        last_name = ' '.join(last_name_words)
+        best_score = 0.0
+        span_length = len(last_name_words)
+        for start in range(len(words) - span_length + 1):
+            last_name_similarity = name_similarity(' '.join(words[start:start + span_length]), last_name)
+            other_words = words[:start] + words[start + span_length:]
+            first_name_similarity = 0.0
+            for word in other_words:
+                if len(word) == 1:
+                    word_similarity = 0.9 if word == first_name[:1] else 0.0
+                else:
+                    word_similarity = name_similarity(word, first_name)
+                first_name_similarity = max(first_name_similarity, word_similarity)
+            best_score = max(best_score, 0.6 * last_name_similarity + 0.4 * first_name_similarity)
+        return best_score
+
+    def print_match_stats(self):
+        print('Fuzzy author matching: ' + ', '.join(f'{result} = {count}' for result, count in self.match_stats.items()))
+
+    def save(self):
+        """Saves remembered matches to cache file, if it is given."""
+        if self.cache_file_path is None:
+            return
+        os.makedirs(os.path.dirname(self.cache_file_path) or '.', exist_ok=True)
+        content = {
+            'version': AUTHOR_MATCHES_FORMAT_VERSION,
+            'roster': self.roster_fingerprint,
+            'matches': {raw_name: [author_name, confidence] for raw_name, (author_name, confidence) in self.matches.items()},
+        }
+        temporary_path = self.cache_file_path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf8') as f:
+            json.dump(content, f, ensure_ascii=False)
+        os.replace(temporary_path, self.cache_file_path)
+
+    def _load_matches(self):
+        """Returns matches remembered in cache file, if they were resolved against same roster and settings."""
+        if self.cache_file_path is None or not os.path.isfile(self.cache_file_path):
+            return dict()
+        try:
+            with open(self.cache_file_path, encoding='utf8') as f:
+                content = json.load(f)
+        except Exception as e:
+            print(e)
+            return dict()
+        if content.get('version') != AUTHOR_MATCHES_FORMAT_VERSION or content.get('roster') != self.roster_fingerprint:
+            return dict()
+        return {raw_name: (tuple(author_name) if author_name else None, confidence) for raw_name, (author_name, confidence) in content['matches'].items()}
+
+    def _get_roster_fingerprint(self):
+        roster_hash = hashlib.sha256()
+        roster_hash.update(f'{self.threshold}|{self.prefix_length}'.encode('utf-8'))
+        for author_name in sorted(self.authors, key=lambda name: tuple(part or '' for part in name)):
+            roster_hash.update(repr(author_name).encode('utf-8'))
+        return roster_hash.hexdigest()
@@ -6,7 +6,8 @@ import math
 import pandas as pd
 
 # Local project imports
-from .settings import AUTHORS_DEPARTMENT_NAME, AUTHORS_FACULTY_NAME, AUTHORS_FIRST_NAME, AUTHORS_LAST_NAME, AUTHORS_MIDDLE_NAME, FACULTY_NAMES
+from ..profiling import profile_stage
+from .settings import AUTHORS_DEPARTMENT_NAME, AUTHORS_FACULTY_NAME, AUTHORS_FIRST_NAME, AUTHORS_LAST_NAME, AUTHORS_MIDDLE_NAME, FACULTY_NAMES, LATIN_CHARACTERS_REPLACEMENTS
 
 class Author():
     """
@@ -76,23 +77,98 @@ class Author():
                 \n        department = {self.department} \
                 \n        faculty = {self.faculty}'
 
+class AuthorIndex():
+    """
+    Hashed index of authors by name, built once and reused for mapping all publication records.
+    Names are looked up by full name, then by first and last name (ignoring middle name)
+    and, for names written as "LastName F", by last name and first name initial.
+    """
+
+    def __init__(self, authors):
+        self.authors = authors
+        self.authors_no_middle = AuthorUtils.format_all_authors_by_first_and_last_name(authors)
+        self.authors_by_initial = dict()
+        ambiguous_keys = set()
+        for author_name in authors:
+            first_name, _, last_name = author_name
+            key = (last_name, first_name[:1])
+            if key in self.authors_by_initial and self.authors_by_initial[key] != author_name:
+                ambiguous_keys.add(key)
+            self.authors_by_initial[key] = author_name
+        # Initial lookup is used only when it identifies exactly one author
+        for key in ambiguous_keys:
+            del self.authors_by_initial[key]
+        self.lookup_stats = {'full name': 0, 'first and last name': 0, 'last name and initial': 0, 'not found': 0}
+
+    def find(self, author_name):
+        """Returns author for name tuple (first name, middle name, last name), or None if author is not found."""
+        if author_name in self.authors:
+            self.lookup_stats['full name'] += 1
+            return self.authors[author_name]
+        if author_name in self.authors_no_middle:
+            self.lookup_stats['first and last name'] += 1
+            return self.authors[self.authors_no_middle[author_name]]
+        if author_name is not None and not author_name[2] and author_name[1]:
+            # "LastName F" is parsed as first name = last name and middle name = initial
+            author_key = self.authors_by_initial.get((author_name[0], author_name[1]))
+            if author_key is not None:
+                self.lookup_stats['last name and initial'] += 1
+                return self.authors[author_key]
+        self.lookup_stats['not found'] += 1
+        return None
+
+    def print_lookup_stats(self):
+        print('Author lookups: ' + ', '.join(f'{lookup} = {count}' for lookup, count in self.lookup_stats.items()))
+
+
 class AuthorUtils():
     """
     Class containint various utility methods for dealing with authors as nodes of the scientific collaboration network graph. 
     """
+    latin_characters_table = str.maketrans(LATIN_CHARACTERS_REPLACEMENTS)
+
     @staticmethod
-    def read_all_authors(path, file_name):
-        """Reads authors data from input file, does necessary data cleaning and returns dictionary of authors as result."""
+    def read_all_authors(path, file_name, dataset_cache=None):
+        """
+        Reads authors data from input file, does necessary data cleaning and returns dictionary of authors as result.
+        If dataset cache is provided, sheets are loaded from cache instead of parsing excel file.
+        Data is cleaned on whole columns at once and Author objects are created only from cleaned values.
+        """
         print('Importing Authors dataset...')
         authors = dict()
-        for faculty_name in FACULTY_NAMES:
-            data = pd.read_excel(os.path.join(path, file_name), sheet_name=faculty_name)
-            for column, row in data.iterrows():
-                author = Author(row[AUTHORS_FIRST_NAME], row[AUTHORS_LAST_NAME], row[AUTHORS_MIDDLE_NAME], row[AUTHORS_DEPARTMENT_NAME], row[AUTHORS_FACULTY_NAME])
-                author.clean_data()
-                authors[author.get_author_full_name_tuple()]= author
+        with profile_stage('import authors'):
+            if dataset_cache:
+                sheets = dataset_cache.read_excel_sheets(path, file_name, FACULTY_NAMES)
+            else:
+                sheets = {faculty_name: pd.read_excel(os.path.join(path, file_name), sheet_name=faculty_name) for faculty_name in FACULTY_NAMES}
+        with profile_stage('clean authors'):
+            for faculty_name in FACULTY_NAMES:
+                data = AuthorUtils.clean_authors_data(sheets[faculty_name])
+                author_rows = zip(data[AUTHORS_FIRST_NAME], data[AUTHORS_LAST_NAME], data[AUTHORS_MIDDLE_NAME], data[AUTHORS_DEPARTMENT_NAME], data[AUTHORS_FACULTY_NAME])
+                for first_name, last_name, middle_name, department, faculty in author_rows:
+                    author = Author(first_name, last_name, middle_name, department, faculty)
+                    authors[author.get_author_full_name_tuple()]= author
         return authors
 
+    @staticmethod
+    def clean_authors_data(data):
+        """
+        Does the same cleaning as Author.clean_data, but on whole columns of authors data frame. 
+        Returns dictionary column name -> list of cleaned values (missing values are None).
+        """
+        columns = [AUTHORS_FIRST_NAME, AUTHORS_LAST_NAME, AUTHORS_MIDDLE_NAME, AUTHORS_DEPARTMENT_NAME, AUTHORS_FACULTY_NAME]
+        return {column: AuthorUtils.to_list(AuthorUtils.clean_text_column(data[column])) for column in columns}
+
+    @staticmethod
+    def clean_text_column(column):
+        """Returns column with all values changed to lower case and serbian latin characters replaced."""
+        return column.str.lower().str.translate(AuthorUtils.latin_characters_table)
+
+    @staticmethod
+    def to_list(column):
+        """Returns list of column values, where missing values (NaN) are None."""
+        return column.astype(object).where(column.notna(), None).tolist()
+
     @staticmethod
     def get_all_authors_names(authors):
         """Returns list of tuples representing author names: (first name, middle name, last name)"""
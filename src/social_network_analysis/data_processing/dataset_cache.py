@@ -0,0 +1,140 @@
+# Standart libarry imports
+import os
+import json
+import shutil
+import hashlib
+
+# Third party imports
+import numpy as np
+import pandas as pd
+
+# Local project imports
+from .string_table import StringTable
+
+# Cached sheets stored in different format version are ignored
+CACHE_FORMAT_VERSION = 1
+
+# Name of cache directory, created next to dataset files
+CACHE_DIRECTORY_NAME = '.cache'
+
+
+class DatasetCache():
+    """
+    Cache of imported excel sheets stored in binary columnar format, keyed by hash of source file.
+    Each column is stored as separate .npy file(s): numeric columns as typed arrays and text columns as string tables,
+    so loading from cache does not parse excel at all. Excel file is parsed only the first time, or when its content changes.
+    Layout: <path>/.cache/<file name>/<file hash>-v<CACHE_FORMAT_VERSION>/sheet-<sheet name hash>/
+    """
+
+    def __init__(self, path, cache_directory_name=CACHE_DIRECTORY_NAME):
+        self.cache_path = os.path.join(path, cache_directory_name)
+
+    @staticmethod
+    def get_file_hash(file_path):
+        """Returns sha256 hash of file content."""
+        file_hash = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                file_hash.update(block)
+        return file_hash.hexdigest()
+
+    def read_excel(self, path, file_name, sheet_name=0):
+        """Returns sheet of excel file as data frame, same as pd.read_excel. Sheet is parsed and cached if not already in cache."""
+        return self.read_excel_sheets(path, file_name, [sheet_name])[sheet_name]
+
+    def read_excel_sheets(self, path, file_name, sheet_names):
+        """
+        Returns dictionary sheet name -> data frame for given sheets.
+        All sheets missing from cache are parsed in one pass over excel file and stored in cache.
+        """
+        file_path = os.path.join(path, file_name)
+        file_cache_path = os.path.join(self.cache_path, file_name, f'{DatasetCache.get_file_hash(file_path)}-v{CACHE_FORMAT_VERSION}')
+        sheets = dict()
+        missing_sheet_names = []
+        for sheet_name in sheet_names:
+            sheet_cache_path = os.path.join(file_cache_path, DatasetCache._get_sheet_key(sheet_name))
+            if os.path.isdir(sheet_cache_path):
+                sheets[sheet_name] = DatasetCache._load_data_frame(sheet_cache_path)
+            else:
+                missing_sheet_names.append(sheet_name)
+
+        if missing_sheet_names:
+            print(f'Caching {file_name} sheets in binary format...')
+            DatasetCache._remove_stale_entries(os.path.dirname(file_cache_path), keep=file_cache_path)
+            parsed_sheets = pd.read_excel(file_path, sheet_name=missing_sheet_names)
+            for sheet_name in missing_sheet_names:
+                DatasetCache._save_data_frame(parsed_sheets[sheet_name], os.path.join(file_cache_path, DatasetCache._get_sheet_key(sheet_name)))
+                sheets[sheet_name] = parsed_sheets[sheet_name]
+        return sheets
+
+    @staticmethod
+    def load_columns(sheet_cache_path, mmap_mode='r'):
+        """Returns list of column names and dictionary column name -> memory-mapped array or string table of cached sheet."""
+        with open(os.path.join(sheet_cache_path, 'columns.json'), encoding='utf8') as f:
+            columns = json.load(f)
+        column_names = [column['name'] for column in columns]
+        column_values = dict()
+        for index, column in enumerate(columns):
+            if column['kind'] == 'string':
+                column_values[column['name']] = StringTable.load(sheet_cache_path, f'column_{index}', mmap_mode)
+            elif column['kind'] == 'numeric':
+                column_values[column['name']] = np.load(os.path.join(sheet_cache_path, f'column_{index}.npy'), mmap_mode=mmap_mode)
+            else:
+                column_values[column['name']] = np.load(os.path.join(sheet_cache_path, f'column_{index}.npy'), allow_pickle=True)
+        return column_names, column_values
+
+    @staticmethod
+    def _get_sheet_key(sheet_name):
+        return 'sheet-' + hashlib.sha1(str(sheet_name).encode('utf-8')).hexdigest()[:16]
+
+    @staticmethod
+    def _remove_stale_entries(file_cache_directory, keep):
+        """Removes cached versions of file with different content hash."""
+        if not os.path.isdir(file_cache_directory):
+            return
+        for entry in os.listdir(file_cache_directory):
+            entry_path = os.path.join(file_cache_directory, entry)
+            if entry_path != keep:
+                shutil.rmtree(entry_path, ignore_errors=True)
+
+    @staticmethod
+    def _save_data_frame(data_frame, sheet_cache_path):
+        """Saves columns of data frame into temporary directory, which is renamed to sheet cache directory once complete."""
+        temporary_path = sheet_cache_path + '.tmp'
+        shutil.rmtree(temporary_path, ignore_errors=True)
+        os.makedirs(temporary_path)
+        columns = []
+        for index, column_name in enumerate(data_frame.columns):
+            series = data_frame[column_name]
+            values = [None if DatasetCache._is_missing(value) else value for value in series.tolist()]
+            if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                kind = 'numeric'
+                np.save(os.path.join(temporary_path, f'column_{index}.npy'), series.to_numpy())
+            elif all(isinstance(value, str) for value in values if value is not None):
+                kind = 'string'
+                StringTable.from_strings(values).save(temporary_path, f'column_{index}')
+            else:
+                # Mixed value types are kept as python objects, so that cached data is the same as parsed data
+                kind = 'object'
+                np.save(os.path.join(temporary_path, f'column_{index}.npy'), series.to_numpy(dtype=object), allow_pickle=True)
+            columns.append({'name': str(column_name), 'kind': kind})
+        with open(os.path.join(temporary_path, 'columns.json'), 'w', encoding='utf8') as f:
+            json.dump(columns, f)
+        os.replace(temporary_path, sheet_cache_path)
+
+    @staticmethod
+    def _load_data_frame(sheet_cache_path):
+        column_names, column_values = DatasetCache.load_columns(sheet_cache_path)
+        data = dict()
+        for column_name in column_names:
+            values = column_values[column_name]
+            if isinstance(values, StringTable):
+                # Missing text values are NaN, same as in data frame returned by pd.read_excel
+                data[column_name] = pd.Series(values.to_list(), dtype=object).fillna(np.nan)
+            else:
+                data[column_name] = pd.Series(np.array(values))
+        return pd.DataFrame(data, columns=column_names)
+
+    @staticmethod
+    def _is_missing(value):
+        return value is None or (isinstance(value, float) and np.isnan(value))
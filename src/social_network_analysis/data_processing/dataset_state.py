@@ -0,0 +1,204 @@
+# Standart libarry imports
+import os
+import pickle
+
+# Local project imports
+from .authors_data_processing import Author, AuthorIndex, AuthorUtils
+from .publications_data_processing import Publication, PublicationRecord, PublicationUtils
+
+# Saved states stored in different format version are ignored
+DATASET_STATE_FORMAT_VERSION = 1
+
+
+class DatasetState():
+    """
+    Processed dataset (authors, publications and mapped publication records) persisted between runs, so that new or changed
+    publication rows (e.g. weekly deltas) can be applied without re-mapping every record and rebuilding info of every author.
+    It also remembers content digest of each created network, so that only changed networks are exported and analysed again.
+    State is saved as flat tables (authors and publications reference each other by author id) instead of object graph.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.authors = dict()
+        self.publications = dict()
+        # (unique publication id, raw author name) -> list of row values of publication records that were applied
+        self.record_rows = dict()
+        # author name tuple -> set of unique publication ids
+        self.author_publications = dict()
+        # network name -> content digest of network that was exported
+        self.network_digests = dict()
+
+    @staticmethod
+    def load(file_path):
+        """Returns state saved in given file, or empty state if file does not exist or was saved in different format."""
+        state = DatasetState(file_path)
+        if not os.path.isfile(file_path):
+            return state
+        print('Loading processed dataset state...')
+        try:
+            with open(file_path, 'rb') as f:
+                content = pickle.load(f)
+        except Exception as e:
+            print(e)
+            return state
+        if content.get('version') != DATASET_STATE_FORMAT_VERSION:
+            return state
+
+        authors_by_id = dict()
+        for author_id, first_name, last_name, middle_name, department, faculty, articles, papers in content['authors']:
+            author = Author(first_name, last_name, middle_name, department, faculty)
+            author.id = author_id
+            author.articles = articles
+            author.papers = papers
+            authors_by_id[author_id] = author
+            state.authors[author.get_author_full_name_tuple()] = author
+        for author_id, collaborator_ids in content['collaborators']:
+            authors_by_id[author_id].collaborators = {authors_by_id[collaborator_id] for collaborator_id in collaborator_ids}
+        # New authors get ids after the saved ones, so ids of existing authors (and their nodes) stay the same
+        Author.autoincrement = max(Author.autoincrement, content['author_autoincrement'])
+
+        for unique_publication_id, author_ids, record_rows in content['publications']:
+            publication = Publication()
+            for author_id in author_ids:
+                publication.add_mapped_author(authors_by_id[author_id])
+            for record_row in record_rows:
+                publication.add_publication_record(PublicationRecord(*record_row))
+            state.publications[unique_publication_id] = publication
+            for author in publication.authors:
+                state.author_publications.setdefault(author.get_author_full_name_tuple(), set()).add(unique_publication_id)
+        state.record_rows = content['record_rows']
+        state.network_digests = content['network_digests']
+        return state
+
+    def save(self):
+        print('Saving processed dataset state...')
+        content = {
+            'version': DATASET_STATE_FORMAT_VERSION,
+            'author_autoincrement': Author.autoincrement,
+            'authors': [(author.id, author.first_name, author.last_name, author.middle_name, author.department, author.faculty, author.articles, author.papers) for author in self.authors.values()],
+            'collaborators': [(author.id, [collaborator.id for collaborator in author.collaborators]) for author in self.authors.values()],
+            'publications': [(unique_publication_id, [author.id for author in publication.authors], [DatasetState._get_record_row(record) for record in publication.publication_records])
+                             for unique_publication_id, publication in self.publications.items()],
+            'record_rows': self.record_rows,
+            'network_digests': self.network_digests,
+        }
+        os.makedirs(os.path.dirname(self.file_path) or '.', exist_ok=True)
+        temporary_path = self.file_path + '.tmp'
+        with open(temporary_path, 'wb') as f:
+            pickle.dump(content, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, self.file_path)
+
+    def add_authors(self, authors):
+        """Adds authors from roster that are not already in state. Returns number of added authors."""
+        new_authors = {author_name: author for author_name, author in authors.items() if author_name not in self.authors}
+        self.authors.update(new_authors)
+        return len(new_authors)
+
+    def apply_publication_records(self, publication_records, fuzzy_matcher=None, retract_missing_records=True):
+        """
+        Applies publication records that are new or changed since last run. Records are identified by publication and author name,
+        if records with same identity differ from the ones applied before, they replace them.
+        With retracting missing records (publications file is full export), records applied before that are no longer in publications file
+        are retracted, so removed rows and rows whose title, authors or year changed do not leave stale publications.
+        Only authors of affected publications have their collaborators, articles and papers recalculated. Returns number of applied records.
+        """
+        records_by_key = dict()
+        for publication_record in publication_records:
+            record_key = (publication_record.get_unique_publication_id(), publication_record.author)
+            records_by_key.setdefault(record_key, []).append(publication_record)
+
+        retracted_record_keys = []
+        if retract_missing_records:
+            retracted_record_keys = [record_key for record_key in self.record_rows if record_key not in records_by_key]
+        new_records = []
+        for record_key, records in records_by_key.items():
+            record_rows = [DatasetState._get_record_row(record) for record in records]
+            previous_rows = self.record_rows.get(record_key)
+            if previous_rows == record_rows:
+                continue
+            if previous_rows is not None:
+                # Changed records, previous versions are removed from their publication
+                retracted_record_keys.append(record_key)
+            new_records.extend(records)
+        if not new_records and not retracted_record_keys:
+            return 0
+
+        author_index = AuthorIndex(self.authors)
+        affected_authors = self._retract_records(retracted_record_keys, author_index, fuzzy_matcher)
+        if retracted_record_keys:
+            print(f'Retracted {len(retracted_record_keys)} removed or changed publication records')
+        PublicationUtils.fold_publication_records(new_records, author_index, self.publications, fuzzy_matcher=fuzzy_matcher)
+        PublicationUtils.print_mapping_stats(author_index, fuzzy_matcher)
+        affected_publication_ids = {unique_publication_id for unique_publication_id, _ in retracted_record_keys if unique_publication_id in self.publications}
+        for record_key, records in records_by_key.items():
+            unique_publication_id = record_key[0]
+            if unique_publication_id in self.publications and any(record is records[0] for record in self.publications[unique_publication_id].publication_records):
+                # Only mapped records are remembered, unmapped ones are tried again in next run (e.g. after author is added to roster)
+                self.record_rows[record_key] = [DatasetState._get_record_row(record) for record in records]
+                affected_publication_ids.add(unique_publication_id)
+
+        # Records and publications are kept in order of rows in publications file, same as when dataset is processed from scratch
+        # (records kept from previous runs that are not in file stay before new ones)
+        record_positions = {record_key: position for position, record_key in enumerate(records_by_key)}
+        for unique_publication_id in affected_publication_ids:
+            self.publications[unique_publication_id].publication_records.sort(key=lambda record: record_positions.get((unique_publication_id, record.author), -1))
+        if retract_missing_records:
+            publication_positions = dict()
+            for position, (unique_publication_id, _) in enumerate(records_by_key):
+                publication_positions.setdefault(unique_publication_id, position)
+            self.publications = dict(sorted(self.publications.items(), key=lambda item: publication_positions.get(item[0], len(record_positions))))
+        self._update_authors_of_publications(affected_publication_ids, affected_authors)
+        return len(new_records)
+
+    def _retract_records(self, record_keys, author_index, fuzzy_matcher=None):
+        """
+        Removes records applied before with given keys from their publications. Authors of changed publications are mapped again
+        from remaining records, and publications without records are removed. Returns authors that were in changed publications.
+        """
+        retracted_publication_ids = set()
+        for unique_publication_id, author_name in record_keys:
+            del self.record_rows[(unique_publication_id, author_name)]
+            publication = self.publications[unique_publication_id]
+            publication.publication_records = [record for record in publication.publication_records if record.author != author_name]
+            retracted_publication_ids.add(unique_publication_id)
+
+        affected_authors = set()
+        for unique_publication_id in retracted_publication_ids:
+            publication = self.publications[unique_publication_id]
+            for author in publication.authors:
+                affected_authors.add(author)
+                self.author_publications[author.get_author_full_name_tuple()].discard(unique_publication_id)
+            # Remaining records were mapped before, so they are mapped to same authors again (publication keeps its position in dataset)
+            remapped_publications = PublicationUtils.fold_publication_records(publication.publication_records, author_index, dict(), fuzzy_matcher=fuzzy_matcher)
+            if unique_publication_id in remapped_publications:
+                self.publications[unique_publication_id] = remapped_publications[unique_publication_id]
+            else:
+                del self.publications[unique_publication_id]
+        return affected_authors
+
+    def _update_authors_of_publications(self, unique_publication_ids, affected_authors=None):
+        """
+        Recalculates collaborators, articles and papers of all authors of given publications (and of other given affected authors,
+        e.g. authors of retracted records), from all of their publications.
+        """
+        affected_authors = set(affected_authors or ())
+        for unique_publication_id in unique_publication_ids:
+            for author in self.publications[unique_publication_id].authors:
+                affected_authors.add(author)
+                self.author_publications.setdefault(author.get_author_full_name_tuple(), set()).add(unique_publication_id)
+        affected_publications = dict()
+        for author in affected_authors:
+            author.collaborators = set()
+            author.articles = set()
+            author.papers = set()
+            for unique_publication_id in self.author_publications[author.get_author_full_name_tuple()]:
+                affected_publications[unique_publication_id] = self.publications[unique_publication_id]
+        # Other authors of affected publications already contain their info, so adding it again does not change them
+        AuthorUtils.update_author_collaborators_and_publications_info(affected_publications)
+        print(f'Updated {len(affected_publications)} publications and {len(affected_authors)} authors')
+
+    @staticmethod
+    def _get_record_row(publication_record):
+        return (publication_record.author, publication_record.publication_title, publication_record.publication_authors,
+                publication_record.publication_year, publication_record.publication_type, publication_record.article_name)
@@ -4,11 +4,14 @@ import math
 from collections import namedtuple
 
 # Third party imports
+import openpyxl
 import pandas as pd
+from pandas.io.parsers import TextParser
 
 # Local project imports
-from .authors_data_processing import AuthorUtils
-from .settings import PUBLICATIONS_ARTICLE_NAME, PUBLICATIONS_AUTHOR, PUBLICATIONS_AUTHORS, PUBLICATIONS_PAPER_TITLE, PUBLICATIONS_TYPE, PUBLICATIONS_YEAR, VALID_PUBLICATION_TYPES
+from ..profiling import profile_stage
+from .authors_data_processing import AuthorIndex, AuthorUtils
+from .settings import PUBLICATIONS_ARTICLE_NAME, PUBLICATIONS_AUTHOR, PUBLICATIONS_AUTHORS, PUBLICATIONS_PAPER_TITLE, PUBLICATIONS_TYPE, PUBLICATIONS_YEAR, VALID_PUBLICATION_TYPES, PUBLICATIONS_CHUNK_SIZE
                       
 
 # Each publication is uniquely identified by following fields: title, authors and year
@@ -116,60 +119,150 @@ class PublicationUtils:
     """
 
     @staticmethod
-    def read_all_publications(path, file_name):
+    def read_all_publications(path, file_name, dataset_cache=None):
         """
         Reads publication records and keeps orginal raw format from dataset. 
+        If dataset cache is provided, publications are loaded from cache instead of parsing excel file (.csv files are always parsed directly).
+        Data is filtered and cleaned on whole columns at once and PublicationRecord objects are created only from cleaned values.
         """
         print('Importing Publications (authors published reasearch papaers) dataset...')
-        publications = []
-        data = pd.read_excel(os.path.join(path, file_name))
-        for column, row in data.iterrows():
-            if row[PUBLICATIONS_TYPE] not in VALID_PUBLICATION_TYPES:
-                continue
-            publication = PublicationRecord(author=row[PUBLICATIONS_AUTHOR],
-                                      publication_title=row[PUBLICATIONS_PAPER_TITLE],
-                                      publication_authors=row[PUBLICATIONS_AUTHORS],
-                                      publication_year=row[PUBLICATIONS_YEAR],
-                                      publication_type=row[PUBLICATIONS_TYPE],
-                                      article_name=row[PUBLICATIONS_ARTICLE_NAME])
-            publication.clean_data()
-            publications.append(publication)
+        with profile_stage('import publications'):
+            if file_name.lower().endswith('.csv'):
+                data = pd.read_csv(os.path.join(path, file_name))
+            elif dataset_cache:
+                data = dataset_cache.read_excel(path, file_name)
+            else:
+                data = pd.read_excel(os.path.join(path, file_name))
+        with profile_stage('clean publications'):
+            return PublicationUtils.create_publication_records(PublicationUtils.clean_publications_data(data))
+
+    @staticmethod
+    def clean_publications_data(data):
+        """
+        Keeps only valid publication types and does the same cleaning as PublicationRecord.clean_data, but on whole columns of publications data frame.
+        Returns dictionary column name -> list of cleaned values (missing values are None).
+        """
+        data = data[data[PUBLICATIONS_TYPE].isin(VALID_PUBLICATION_TYPES)]
+        return {
+            PUBLICATIONS_AUTHOR: AuthorUtils.to_list(AuthorUtils.clean_text_column(data[PUBLICATIONS_AUTHOR].str.replace('N/A', '', regex=False))),
+            PUBLICATIONS_PAPER_TITLE: AuthorUtils.to_list(AuthorUtils.clean_text_column(data[PUBLICATIONS_PAPER_TITLE])),
+            PUBLICATIONS_AUTHORS: AuthorUtils.to_list(AuthorUtils.clean_text_column(data[PUBLICATIONS_AUTHORS])),
+            PUBLICATIONS_YEAR: AuthorUtils.to_list(data[PUBLICATIONS_YEAR]),
+            PUBLICATIONS_TYPE: AuthorUtils.to_list(AuthorUtils.clean_text_column(data[PUBLICATIONS_TYPE])),
+            PUBLICATIONS_ARTICLE_NAME: AuthorUtils.to_list(AuthorUtils.clean_text_column(data[PUBLICATIONS_ARTICLE_NAME])),
+        }
+
+    @staticmethod
+    def create_publication_records(data):
+        """Creates publication records from cleaned publications data (dictionary column name -> list of values)."""
+        publication_rows = zip(data[PUBLICATIONS_AUTHOR], data[PUBLICATIONS_PAPER_TITLE], data[PUBLICATIONS_AUTHORS], 
+                               data[PUBLICATIONS_YEAR], data[PUBLICATIONS_TYPE], data[PUBLICATIONS_ARTICLE_NAME])
+        return [PublicationRecord(author=author,
+                                  publication_title=publication_title,
+                                  publication_authors=publication_authors,
+                                  publication_year=publication_year,
+                                  publication_type=publication_type,
+                                  article_name=article_name) for author, publication_title, publication_authors, publication_year, publication_type, article_name in publication_rows]
+
+    @staticmethod
+    def read_publications_in_chunks(path, file_name, chunk_size=PUBLICATIONS_CHUNK_SIZE):
+        """
+        Generator that reads publications file (.csv or .xlsx) chunk_size rows at a time and yields lists of cleaned publication records.
+        Only one chunk of input rows is kept in memory: csv is read with pandas chunks and xlsx with openpyxl read-only row batches.
+        """
+        print('Streaming Publications (authors published reasearch papaers) dataset...')
+        file_path = os.path.join(path, file_name)
+        if file_name.lower().endswith('.csv'):
+            data_chunks = pd.read_csv(file_path, chunksize=chunk_size)
+        else:
+            data_chunks = PublicationUtils._read_excel_in_chunks(file_path, chunk_size)
+        for data in data_chunks:
+            yield PublicationUtils.create_publication_records(PublicationUtils.clean_publications_data(data))
+
+    @staticmethod
+    def _read_excel_in_chunks(file_path, chunk_size):
+        """
+        Generator yielding data frames with chunk_size rows of first sheet of excel file.
+        Rows are parsed with pandas TextParser, same as in pd.read_excel, so that values get the same types (e.g. years stored as text become integers).
+        """
+        workbook = openpyxl.load_workbook(file_path, read_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = list(next(rows))
+            chunk = []
+            for row in rows:
+                chunk.append(list(row))
+                if len(chunk) == chunk_size:
+                    yield TextParser([header] + chunk, header=0).read()
+                    chunk = []
+            if chunk:
+                yield TextParser([header] + chunk, header=0).read()
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def map_publications_in_chunks(publication_record_chunks, authors, fuzzy_matcher=None):
+        """
+        Maps streamed chunks of publication records with authors and folds them into dictionary of publications, chunk by chunk.
+        Only the first record of each publication is kept, so memory grows with number of unique publications, not with number of input rows.
+        """
+        publications = dict()
+        author_index = AuthorIndex(authors)
+        for publication_records in publication_record_chunks:
+            PublicationUtils.fold_publication_records(publication_records, author_index, publications, keep_duplicate_records=False, fuzzy_matcher=fuzzy_matcher)
+        PublicationUtils.print_mapping_stats(author_index, fuzzy_matcher)
         return publications
 
     @staticmethod
-    def map_publications_with_users(publication_records, authors):
+    def map_publications_with_users(publication_records, authors, fuzzy_matcher=None):
         """
         Keeps only one main record per publication (in dataset if there are e.g. 3 authors for one publication there will be 3 rows for same publication, 
         for each author separately). One publication is identified by: list of authors, year and title of paper. 
+        Author names that are not matched exactly are resolved with fuzzy matcher, if it is given.
         Returns dictionary of publications. 
         """
-        publications = dict()
-        author_names = AuthorUtils.get_all_authors_names(authors)
-        author_names_no_middle = AuthorUtils.format_all_authors_by_first_and_last_name(authors)
+        author_index = AuthorIndex(authors)
+        publications = PublicationUtils.fold_publication_records(publication_records, author_index, dict(), fuzzy_matcher=fuzzy_matcher)
+        PublicationUtils.print_mapping_stats(author_index, fuzzy_matcher)
+        return publications
+
+    @staticmethod
+    def fold_publication_records(publication_records, author_index, publications, keep_duplicate_records=True, fuzzy_matcher=None):
+        """
+        Maps publication records with authors (using AuthorIndex) and adds them into given dictionary of publications, which is returned.
+        Without keeping duplicate records, only the first record of each publication is stored (other records only add mapped authors).
+        """
         for publication_record in publication_records:
-            mapped_author = PublicationUtils._map_publication_author_name_with_author_entry(publication_record.author, authors, author_names, author_names_no_middle)
+            mapped_author = PublicationUtils._map_publication_author_name_with_author_entry(publication_record.author, author_index, fuzzy_matcher)
             if mapped_author is None:
                 print("NON EXISTING USER", publication_record.author)
             else:
                 unique_publication_id = publication_record.get_unique_publication_id()
                 if unique_publication_id not in publications:
                     publications[unique_publication_id] = Publication()                                        
-                publications[unique_publication_id].add_mapped_author(mapped_author)
-                publications[unique_publication_id].add_publication_record(publication_record)
+                publication = publications[unique_publication_id]
+                publication.add_mapped_author(mapped_author)
+                if keep_duplicate_records or not publication.publication_records:
+                    publication.add_publication_record(publication_record)
         return publications
 
     @staticmethod
-    def _map_publication_author_name_with_author_entry(publication_author_name, authors, author_names, author_names_no_middle):
+    def _map_publication_author_name_with_author_entry(publication_author_name, author_index, fuzzy_matcher=None):
         """Returns mapped author if found."""
         full_author_name = PublicationUtils._format_publication_author_name(publication_author_name)
-        if full_author_name in author_names:
-            # match by full name: first, middle and last name
-            return authors[full_author_name]
-        elif full_author_name in author_names_no_middle:
-            return authors[author_names_no_middle[full_author_name]]
-        else:
-            # TODO: log non-existing authors
-            return None
+        mapped_author = author_index.find(full_author_name)
+        if mapped_author is None and fuzzy_matcher is not None:
+            mapped_author = fuzzy_matcher.find(publication_author_name)
+        # TODO: log non-existing authors
+        return mapped_author
+
+    @staticmethod
+    def print_mapping_stats(author_index, fuzzy_matcher=None):
+        """Prints how authors of publication records were found and saves names resolved by fuzzy matcher."""
+        author_index.print_lookup_stats()
+        if fuzzy_matcher is not None:
+            fuzzy_matcher.print_match_stats()
+            fuzzy_matcher.save()
         
     @staticmethod
     def _format_publication_author_name(publication_author_name):
@@ -178,8 +271,8 @@ class PublicationUtils:
         middle_name = None
         last_name = None
         partial_names = publication_author_name.split()
-        if len(partial_names) > 4:
-            # maximum allowed format is: "LastName1 LastName2 FirstName MN"
+        if not partial_names or len(partial_names) > 4:
+            # maximum allowed format is: "LastName1 LastName2 FirstName MN", other names can be resolved only by fuzzy matching
             # TODO: log wrong author name format
             return None
         if len(partial_names[-1]) == 1:
@@ -16,6 +16,30 @@ PUBLICATIONS_TYPE = 'Tip rada'
 PUBLICATIONS_ARTICLE_NAME = 'Ime dokumenta'
 
 
+# Serbian latin characters and their replacements used in cleaned data
+LATIN_CHARACTERS_REPLACEMENTS = {
+    'ć': 'c',
+    'č': 'c',
+    'š': 's',
+    'đ': 'dj',
+    'ž': 'z',
+}
+
+# Number of publication rows read at once when publications are streamed in chunks
+PUBLICATIONS_CHUNK_SIZE = 10000
+
+# Minimum confidence (0 - 1) of fuzzy match between author name from publication and author from roster
+FUZZY_MATCH_THRESHOLD = 0.85
+
+# Authors are compared only with authors whose last name starts with same letters as one of name's words (blocking)
+FUZZY_MATCH_PREFIX_LENGTH = 3
+
+# Name of file (in dataset cache directory) where fuzzy matched author names are remembered between runs
+AUTHOR_MATCHES_FILE_NAME = 'author_matches.json'
+
+# Name of file (in dataset cache directory) where processed dataset is kept between runs in incremental update mode
+DATASET_STATE_FILE_NAME = 'dataset_state.pkl'
+
 # Sheet names
 FACULTY_NAMES = [
     'matematicki fakultet',
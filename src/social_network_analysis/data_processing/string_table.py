@@ -0,0 +1,65 @@
+# Standart libarry imports
+import os
+
+# Third party imports
+import numpy as np
+
+
+class StringTable():
+    """
+    Stores list of strings (or None values) as flat arrays: utf-8 encoded bytes of all strings, offsets of each string
+    and mask of missing values. Arrays can be saved with numpy and memory-mapped, strings are decoded only when accessed.
+    """
+
+    def __init__(self, data, offsets, missing):
+        self.data = data
+        self.offsets = offsets
+        self.missing = missing
+
+    @staticmethod
+    def from_strings(strings):
+        """Creates string table from iterable of strings, None values are stored as missing."""
+        encoded_strings = []
+        missing = []
+        for string in strings:
+            if string is None:
+                encoded_strings.append(b'')
+                missing.append(True)
+            else:
+                encoded_strings.append(string.encode('utf-8'))
+                missing.append(False)
+        offsets = np.zeros(len(encoded_strings) + 1, dtype=np.int64)
+        np.cumsum([len(encoded_string) for encoded_string in encoded_strings], out=offsets[1:])
+        data = np.frombuffer(b''.join(encoded_strings), dtype=np.uint8)
+        return StringTable(data, offsets, np.array(missing, dtype=bool))
+
+    def save(self, path, name):
+        np.save(os.path.join(path, f'{name}.data.npy'), self.data)
+        np.save(os.path.join(path, f'{name}.offsets.npy'), self.offsets)
+        np.save(os.path.join(path, f'{name}.missing.npy'), self.missing)
+
+    @staticmethod
+    def load(path, name, mmap_mode='r'):
+        return StringTable(np.load(os.path.join(path, f'{name}.data.npy'), mmap_mode=mmap_mode),
+                           np.load(os.path.join(path, f'{name}.offsets.npy'), mmap_mode=mmap_mode),
+                           np.load(os.path.join(path, f'{name}.missing.npy'), mmap_mode=mmap_mode))
+
+    def __len__(self):
+        return len(self.missing)
+
+    def __getitem__(self, index):
+        if self.missing[index]:
+            return None
+        return bytes(self.data[self.offsets[index]:self.offsets[index + 1]]).decode('utf-8')
+
+    def to_list(self, start=0, stop=None):
+        """Decodes strings in given range (all strings by default) at once."""
+        if stop is None:
+            stop = len(self)
+        offsets = self.offsets[start:stop + 1].tolist()
+        data = bytes(self.data[offsets[0]:offsets[-1]])
+        base = offsets[0]
+        strings = [data[offsets[i] - base:offsets[i + 1] - base].decode('utf-8') for i in range(stop - start)]
+        for index in np.flatnonzero(self.missing[start:stop]):
+            strings[index] = None
+        return strings
@@ -0,0 +1,111 @@
+# Standart libarry imports
+import csv
+import json
+import numbers
+
+# Local project imports
+from .csv_export import CsvExportUtils
+
+# Number of report lines (nodes) formatted and written to file at once
+REPORT_BLOCK_SIZE = 4096
+
+# Formats of per-node metrics files that can be exported next to analytics report, with their file name suffixes
+NODE_METRICS_FILE_SUFFIXES = {
+    'csv': ' - Node Metrics.csv',
+    'json': ' - Node Metrics.json',
+}
+
+
+class AnalyticsReportUtils():
+    """
+    Streaming writers of network analytics: text report (general info, calculated metrics and every node with its attributes and centralities)
+    and structured per-node metrics (csv or json). Rows are produced one node at a time and written in blocks,
+    so writing report takes linear time and memory does not grow with size of report.
+    """
+
+    @staticmethod
+    def get_node_metrics_file_name(network_name, node_metrics_format):
+        if node_metrics_format not in NODE_METRICS_FILE_SUFFIXES:
+            raise ValueError(f'Unsupported node metrics format: {node_metrics_format}, supported are {list(NODE_METRICS_FILE_SUFFIXES)}')
+        return network_name + NODE_METRICS_FILE_SUFFIXES[node_metrics_format]
+
+    @staticmethod
+    def iter_nodes(nodes, graph):
+        """
+        Yields (node id, node attributes, node metrics) for every node of analysed graph, in order of graph.
+        Attributes are read from network's nodes store one node at a time (for duplicated node ids, last node's attributes are used).
+        """
+        node_indices = {node_id: index for index, node_id in enumerate(nodes.ids)} if nodes is not None else dict()
+        for node_id, node_metrics in graph.nodes.data():
+            index = node_indices.get(node_id)
+            yield node_id, nodes.get_attributes(index) if index is not None else dict(), node_metrics
+
+    @staticmethod
+    def write_report(f, metrics, node_rows):
+        """Writes analytics report to text file f, node rows are (node id, node attributes, node metrics)."""
+        for metric, value in metrics.items():
+            if metric == 'Info':
+                # Network general info
+                f.write('--------- NETWORK GENERAL DATA -----------\n')
+                f.write(f'{value} \n')
+                f.write('--------- NETWORK ANALYSIS DATA -----------\n')
+            else:
+                # Network's calculated metrics
+                f.write(f'{metric}: {value} \n')
+
+        # Printing each separate node and its attributes and metrics
+        f.write('--------- NETWORK NODES -----------\n')
+        f.write('Node Id, Column dicitonary\n')
+        lines = []
+        for node_id, attributes, node_metrics in node_rows:
+            # Non-empty sets are printed as sorted strings and empty ones as set(), same as when nodes stored them that way
+            node_data = {'attributes': {name: (CsvExportUtils.format_set(value) if value else set()) if isinstance(value, frozenset) else value for name, value in attributes.items()}}
+            node_data.update(node_metrics)
+            lines.append(f'{node_id},{node_data}\n')
+            if len(lines) == REPORT_BLOCK_SIZE:
+                f.write(''.join(lines))
+                lines = []
+        f.write(''.join(lines))
+
+    @staticmethod
+    def write_node_metrics_csv(f, attribute_names, metric_names, node_rows):
+        """Writes one row per node (id, attributes and metrics) to csv file f, opened with newline=''."""
+        writer = csv.writer(f)
+        writer.writerow(['Id'] + list(attribute_names) + list(metric_names))
+        rows = []
+        for node_id, attributes, node_metrics in node_rows:
+            row = [node_id]
+            row += [CsvExportUtils.format_set(attributes.get(name)) if isinstance(attributes.get(name), (set, frozenset)) else attributes.get(name) for name in attribute_names]
+            row += [node_metrics.get(name) for name in metric_names]
+            rows.append(row)
+            if len(rows) == REPORT_BLOCK_SIZE:
+                writer.writerows(rows)
+                rows = []
+        writer.writerows(rows)
+
+    @staticmethod
+    def write_node_metrics_json(f, node_rows):
+        """Writes json array of nodes ({'id', 'attributes', 'metrics'}) to file f, one node per line. Sets are written as sorted lists."""
+        f.write('[')
+        lines = []
+        separator = '\n'
+        for node_id, attributes, node_metrics in node_rows:
+            node = {'id': node_id, 'attributes': attributes, 'metrics': node_metrics}
+            lines.append(separator + json.dumps(node, ensure_ascii=False, default=AnalyticsReportUtils._to_json_value))
+            separator = ',\n'
+            if len(lines) == REPORT_BLOCK_SIZE:
+                f.write(''.join(lines))
+                lines = []
+        f.write(''.join(lines))
+        f.write('\n]\n')
+
+    @staticmethod
+    def _to_json_value(value):
+        """Converts values that json module can not write (sets, NumPy numbers)."""
+        if isinstance(value, (set, frozenset)):
+            return sorted(value, key=str)
+        if isinstance(value, numbers.Integral):
+            return int(value)
+        if isinstance(value, numbers.Real):
+            return float(value)
+        raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
@@ -1,61 +1,58 @@
+import numpy as np
+
 from ..data_processing.authors_data_processing import Author
-from .network_base import Node, Edge, EdgeType, Network
+from .network_base import NodeStore, EdgeStore, EdgeType, Network
+from .sparse_projection import ProjectionUtils
 
 PUBLICATION_TYPE_TO_EXCLUDE = 'conference paper'
 
 class ArticleNetwork(Network):
     """Class responsible for parsing inputed data, creating nodes and edges for Article graph and exporting to csv."""
 
-    def __init__(self, publicaions):
+    def __init__(self, dataset_index):
         super().__init__()
-        self.article = None
-        self.publications = publicaions
-        self.create_nodes()
-        self.create_edges()
+        self.articles = None
+        self.dataset_index = dataset_index
 
     def create_nodes(self):
         """Creates Articles."""        
         try:
+            index = self.dataset_index
             articles = dict()
-            for publication_name in self.publications:
-                publication_article_name = self.publications[publication_name].get_article_name()
-                publication_type = self.publications[publication_name].get_publication_type()
-                if publication_article_name not in articles and publication_type != PUBLICATION_TYPE_TO_EXCLUDE:
-                    attributes = {'name': publication_article_name}
-                    node = Node(attributes)
-                    articles[publication_article_name] = node
-            # Saving article dictionary for node creation
+            nodes = NodeStore(['name'])
+            for article_index, publication_type in zip(index.publication_article_indices, index.publication_types):
+                if article_index not in articles and publication_type != PUBLICATION_TYPE_TO_EXCLUDE:
+                    attributes = {'name': index.articles[article_index]}
+                    articles[article_index] = nodes.add(attributes)
+            # Saving article dictionary (article index -> node id) for edge creation
             self.articles = articles
-            self.nodes = [articles[article_name] for article_name in articles]
+            self.nodes = nodes
         except Exception as e:
             print(e)
             return None
 
     def create_edges(self):
-        """Creates edges (connecting two articles if at least one author exists who published papers in both articles)."""
+        """
+        Creates edges (connecting two articles if at least one author exists who published papers in both articles).
+        Edges are projection of author x article incidence matrix on articles, weight of edge is number of authors that articles share.
+        """
         try:
-            edges = dict()
-            for publication_name in self.publications:
-                publication_article_name = self.publications[publication_name].get_article_name()
-                publication_authors = self.publications[publication_name].authors
-                publication_type = self.publications[publication_name].get_publication_type()
+            index = self.dataset_index
+            authors = []
+            articles = []
+            for publication_index, publication_type in enumerate(index.publication_types):
                 if publication_type != PUBLICATION_TYPE_TO_EXCLUDE:
-                    for author in publication_authors:
-                        # For current article, where this paper was published,
-                        # we look at other artiles where authors for this paper were publishing as well.
-                        # For those article pairs, we create new link.
-                        for article in author.articles:
-                            article_name = article[0] 
-                            if article_name == publication_article_name:
-                                continue
-                            if article[1] == PUBLICATION_TYPE_TO_EXCLUDE:
-                                continue
-                            if (article_name, publication_article_name) not in edges and (publication_article_name, article_name) not in edges: 
-                                article_id = self.articles[article_name].id
-                                publication_article_id = self.articles[publication_article_name].id
-                                edges[(publication_article_name, article_name)] = Edge(source=article_id, target=publication_article_id, edge_type=EdgeType.UNDIRRECTED.value)
-            self.edges = [edges[key] for key in edges]
+                    article_index = index.publication_article_indices[publication_index]
+                    for author_index in index.publication_author_indices[publication_index]:
+                        authors.append(author_index)
+                        articles.append(article_index)
+            first_articles, second_articles, shared_authors = ProjectionUtils.project(authors, articles, len(index.articles))
+            self.edges = EdgeStore()
+            self.edges.extend(sources=[self.articles[article_index] for article_index in first_articles.tolist()],
+                              targets=[self.articles[article_index] for article_index in second_articles.tolist()],
+                              edge_type=EdgeType.UNDIRRECTED.value,
+                              weights=shared_authors.astype(np.int64).tolist())
             return self.edges
         except Exception as e:
             print(e)
-            return None
\ No newline at end of file
+            return None
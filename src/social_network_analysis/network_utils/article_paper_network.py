@@ -1,14 +1,12 @@
 from ..data_processing.authors_data_processing import Author
-from .network_base import Node, Edge, EdgeType, Network
+from .network_base import NodeStore, EdgeStore, EdgeType, Network
 
 class ArticlePaperNetwork(Network):
     """Class for creating Article Paper graph, connecting research papers with articles where they were published."""
 
-    def __init__(self, publications):
+    def __init__(self, dataset_index):
         super().__init__()
-        self.publications = publications
-        self.create_nodes()
-        self.create_edges()
+        self.dataset_index = dataset_index
 
     def create_node_attribute_template(self):
         return {
@@ -19,28 +17,23 @@ class ArticlePaperNetwork(Network):
     def create_nodes(self):
         """Creates nodes for network - articles and research papers (publications)."""        
         try:
-            self.nodes = []
+            index = self.dataset_index
+            self.nodes = NodeStore(self.create_node_attribute_template())
             self.articles = dict()
             self.papers = dict()
-            for unique_publication_id in self.publications:
-                article_name = self.publications[unique_publication_id].get_article_name()
-                publication_name = self.publications[unique_publication_id].get_publication_title()
-                if article_name not in self.articles:
+            for article_index, title_index in zip(index.publication_article_indices, index.publication_title_indices):
+                if article_index not in self.articles:
                     # Adding article node
                     attributes = self.create_node_attribute_template()
-                    attributes['name'] = article_name
+                    attributes['name'] = index.articles[article_index]
                     attributes['node_type'] = 'article'
-                    node = Node(attributes)
-                    self.articles[article_name] = node 
-                    self.nodes.append(node)
-                if publication_name not in self.papers:
+                    self.articles[article_index] = self.nodes.add(attributes)
+                if title_index not in self.papers:
                     # Adding research paper node
                     attributes = self.create_node_attribute_template()
-                    attributes['name'] = publication_name
+                    attributes['name'] = index.titles[title_index]
                     attributes['node_type'] = 'publication'
-                    node = Node(attributes)
-                    self.papers[publication_name] = node 
-                    self.nodes.append(node)
+                    self.papers[title_index] = self.nodes.add(attributes)
         except Exception as e:
             print(e)
             return None
@@ -48,11 +41,10 @@ class ArticlePaperNetwork(Network):
     def create_edges(self):
         """Creates edges (connecting publications with articles if they were published in that article)."""
         try:
-            self.edges = []
-            for unique_publication_id in self.publications:
-                article_name = self.publications[unique_publication_id].get_article_name()
-                publication_name = self.publications[unique_publication_id].get_publication_title()       
-                self.edges.append(Edge(source=self.papers[publication_name].id, target=self.articles[article_name].id, edge_type=EdgeType.DIRECTED.value))
+            index = self.dataset_index
+            self.edges = EdgeStore()
+            for article_index, title_index in zip(index.publication_article_indices, index.publication_title_indices):
+                self.edges.add(source=self.papers[title_index], target=self.articles[article_index], edge_type=EdgeType.DIRECTED.value)
         except Exception as e:
             print(e)
-            return None
\ No newline at end of file
+            return None
@@ -1,14 +1,12 @@
 from ..data_processing.authors_data_processing import Author
-from .network_base import Node, Edge, EdgeType, Network
+from .network_base import NodeStore, EdgeStore, EdgeType, Network
 
 class AuthorPublicationsNetwork(Network):
     """Class for creating network conncting Author with their Publications."""
 
-    def __init__(self, authors):
+    def __init__(self, dataset_index):
         super().__init__()
-        self.authors = authors
-        self.create_nodes()
-        self.create_edges()
+        self.dataset_index = dataset_index
 
     def create_node_attribute_template(self):
         return {
@@ -20,27 +18,24 @@ class AuthorPublicationsNetwork(Network):
     def create_nodes(self):
         """Creates nodes for network - authors and papers that they published."""        
         try:
-            self.nodes = []
+            index = self.dataset_index
+            self.nodes = NodeStore(self.create_node_attribute_template())
             self.papers = dict()
             self.author_nodes = dict()
-            for author_name in self.authors:
+            for author_index in range(index.number_of_authors()):
                 # Creating Author nodes
-                author = self.authors[author_name]
                 attributes = self.create_node_attribute_template()
-                attributes['author_name'] = self.authors[author_name].get_author_full_name()
+                attributes['author_name'] = index.author_names[author_index]
                 attributes['node_type'] = 'author'
-                node = Node(attributes)
-                self.author_nodes[self.authors[author_name].get_author_full_name()] = node
-                self.nodes.append(node)
+                self.author_nodes[index.author_names[author_index]] = self.nodes.add(attributes)
                  # Creating publication paper nodes
-                for published_paper in self.authors[author_name].papers:
-                    if published_paper not in self.papers:
+                for paper_index in index.author_paper_indices[author_index]:
+                    if paper_index not in self.papers:
+                        published_paper = index.papers[paper_index]
                         attributes = self.create_node_attribute_template()
                         attributes['paper_name'] = published_paper[0]  
                         attributes['node_type'] = published_paper[1]    # publication type
-                        node = Node(attributes)
-                        self.papers[published_paper] = node
-                        self.nodes.append(node)
+                        self.papers[paper_index] = self.nodes.add(attributes)
         except Exception as e:
             print(e)
             return None
@@ -48,14 +43,13 @@ class AuthorPublicationsNetwork(Network):
     def create_edges(self):
         """Creates edges (connecting authors and papers if author published that paper)."""
         try:
-            self.edges = []         
-            for author_name in self.authors:
-                author = self.authors[author_name]
-                for published_paper in self.authors[author_name].papers:
-                    paper = self.papers[published_paper] 
-                    author_node = self.author_nodes[self.authors[author_name].get_author_full_name()]
-                    self.edges.append(Edge(source=author_node.id, target=paper.id, edge_type=EdgeType.DIRECTED.value))
+            index = self.dataset_index
+            self.edges = EdgeStore()
+            for author_index in range(index.number_of_authors()):
+                author_node = self.author_nodes[index.author_names[author_index]]
+                for paper_index in index.author_paper_indices[author_index]:
+                    self.edges.add(source=author_node, target=self.papers[paper_index], edge_type=EdgeType.DIRECTED.value)
 
         except Exception as e:
             print(e)
-            return None
\ No newline at end of file
+            return None
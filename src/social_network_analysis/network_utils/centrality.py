@@ -0,0 +1,272 @@
+import os
+import math
+import random
+import networkx as nx
+from itertools import repeat
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+# Result of eigenvector centrality power iteration: centrality dictionary, number of iterations used, whether iteration converged 
+# and number of connected components calculated separately (0 if whole graph was calculated at once)
+EigenvectorResult = namedtuple('EigenvectorResult', ['centrality', 'iterations', 'converged', 'components'])
+
+# Graph of pool worker process, set by worker initializer
+_worker_graph = None
+
+
+def _init_centrality_worker(G):
+    global _worker_graph
+    _worker_graph = G
+
+
+def _run_on_worker_graph(function, nodes):
+    return function(_worker_graph, nodes)
+
+
+def _betweenness_from_sources(G, sources):
+    """Returns unnormalized betweenness accumulated only from shortest paths that start in given source nodes."""
+    return nx.betweenness_centrality_subset(G, sources, list(G), normalized=False)
+
+
+def _closeness_of_nodes(G, nodes):
+    return {node: nx.closeness_centrality(G, u=node) for node in nodes}
+
+
+def _distances_from_pivots(G, pivots):
+    """Returns sums and counts of distances from given pivots to every reachable node, and each pivot's own distance sum."""
+    distance_sums = dict()
+    distance_counts = dict()
+    pivot_distance_sums = dict()
+    for pivot in pivots:
+        distances = nx.single_source_shortest_path_length(G, pivot)
+        for node, distance in distances.items():
+            distance_sums[node] = distance_sums.get(node, 0) + distance
+            distance_counts[node] = distance_counts.get(node, 0) + 1
+        pivot_distance_sums[pivot] = sum(distances.values())
+    return distance_sums, distance_counts, pivot_distance_sums
+
+
+def _normalized_start_vector(G, nstart):
+    """Returns starting vector of power iteration for nodes of G, normalized to sum 1 (uniform if nstart is not given or is all zero)."""
+    if nstart is not None:
+        start_sum = sum(nstart[node] for node in G)
+        if start_sum:
+            return {node: nstart[node] / start_sum for node in G}
+    number_of_nodes = len(G)
+    return {node: 1 / number_of_nodes for node in G}
+
+
+def _power_iteration(G, x, max_iter, tol):
+    """
+    Same power iteration as nx.eigenvector_centrality (iterating with A + I, unweighted), starting from vector x.
+    Returns last vector, number of iterations used and whether iteration converged, instead of raising exception.
+    """
+    number_of_nodes = len(x)
+    for iteration in range(1, max_iter + 1):
+        x_last = x
+        x = x_last.copy()
+        for node in x:
+            for neighbor in G[node]:
+                x[neighbor] += x_last[node]
+        norm = math.sqrt(sum(value ** 2 for value in x.values())) or 1
+        x = {node: value / norm for node, value in x.items()}
+        if sum(abs(x[node] - x_last[node]) for node in x) < number_of_nodes * tol:
+            return x, iteration, True
+    return x, max_iter, False
+
+
+class CentralityUtils():
+    """
+    Class containing utility methods for calculating centrality metrics on large networks.
+    Approximations are based on pivot sampling: shortest paths are computed only from a random subset of source nodes
+    and the contributions are scaled up to the whole network.
+    Shortest path computations are independent for each source node, so they can be split across worker processes.
+    """
+
+    @staticmethod
+    def map_over_nodes(G, function, nodes, workers=1):
+        """
+        Applies function(G, nodes_chunk) to chunks of given nodes and returns list of partial results.
+        With more than one worker (None uses all available cores), chunks are processed in pool of processes.
+        """
+        nodes = list(nodes)
+        if workers is None:
+            workers = os.cpu_count()
+        if workers == 1 or len(nodes) < 2:
+            return [function(G, nodes)]
+        # Few chunks per worker, so that workers finishing early can take over remaining work
+        number_of_chunks = min(len(nodes), workers * 4)
+        chunks = [nodes[i::number_of_chunks] for i in range(number_of_chunks)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_centrality_worker, initargs=(G,)) as executor:
+            return list(executor.map(_run_on_worker_graph, repeat(function), chunks))
+
+    @staticmethod
+    def eigenvector_centrality(G, max_iter=100, tol=1.0e-6, nstart=None, per_component=False):
+        """
+        Returns EigenvectorResult with eigenvector centrality, never raises exception on convergence failure.
+        Whole graph is calculated first with same power iteration as nx.eigenvector_centrality (starting from nstart if provided).
+        If it does not converge (slow on graphs with many components), or if per_component is set, each connected component 
+        is calculated separately and its unit vector is scaled by sqrt(component size / number of nodes), 
+        so that the whole vector still has unit length. Components that do not converge keep their last iteration vector.
+        """
+        if len(G) == 0:
+            return EigenvectorResult(dict(), 0, True, 0)
+        if not per_component:
+            centrality, iterations, converged = _power_iteration(G, _normalized_start_vector(G, nstart), max_iter, tol)
+            if converged:
+                return EigenvectorResult(centrality, iterations, True, 0)
+
+        number_of_nodes = len(G)
+        centrality = dict()
+        iterations = 0
+        converged = True
+        components = list(nx.connected_components(G))
+        for component in components:
+            subgraph = G.subgraph(component)
+            component_centrality, component_iterations, component_converged = _power_iteration(subgraph, _normalized_start_vector(subgraph, nstart), max_iter, tol)
+            scale = math.sqrt(len(component) / number_of_nodes)
+            for node, value in component_centrality.items():
+                centrality[node] = value * scale
+            iterations = max(iterations, component_iterations)
+            converged = converged and component_converged
+        return EigenvectorResult({node: centrality[node] for node in G}, iterations, converged, len(components))
+
+    @staticmethod
+    def describe_eigenvector_result(result, max_iter, tol):
+        """Returns description of eigenvector centrality calculation for analytics report."""
+        if result.components:
+            description = f'calculated per component ({result.components} components), up to {result.iterations} iterations'
+        else:
+            description = f'{result.iterations} iterations'
+        if not result.converged:
+            description += f', did not converge in {max_iter} iterations'
+        return description + f' (tol={tol})'
+
+    @staticmethod
+    def sample_size_for_error_bound(number_of_nodes, error_bound, confidence):
+        """
+        Returns number of pivots needed so that every node's estimate is within error bound with given confidence.
+        Per-pivot contributions are bounded, so the Hoeffding inequality with union bound over all nodes applies.
+        """
+        if number_of_nodes < 2:
+            return number_of_nodes
+        value_range = number_of_nodes / (number_of_nodes - 1)
+        sample_size = math.ceil(value_range ** 2 * math.log(2 * number_of_nodes / (1 - confidence)) / (2 * error_bound ** 2))
+        return min(sample_size, number_of_nodes)
+
+    @staticmethod
+    def error_bound_for_sample_size(number_of_nodes, sample_size, confidence):
+        """Returns error bound that holds for all node estimates with given confidence when using given number of pivots."""
+        if sample_size >= number_of_nodes:
+            return 0.0
+        value_range = number_of_nodes / (number_of_nodes - 1)
+        return value_range * math.sqrt(math.log(2 * number_of_nodes / (1 - confidence)) / (2 * sample_size))
+
+    @staticmethod
+    def betweenness_centrality(G, workers=1):
+        """Returns normalized betweenness centrality, same as nx.betweenness_centrality, with source nodes split across workers."""
+        return CentralityUtils._betweenness_centrality_from_sources(G, list(G), workers)
+
+    @staticmethod
+    def closeness_centrality(G, workers=1):
+        """Returns closeness centrality, same as nx.closeness_centrality, with nodes split across workers."""
+        closeness_centrality = dict()
+        for partial_closeness in CentralityUtils.map_over_nodes(G, _closeness_of_nodes, G, workers):
+            closeness_centrality.update(partial_closeness)
+        return closeness_centrality
+
+    @staticmethod
+    def closeness_centrality_of_nodes(G, nodes, workers=1):
+        """Returns closeness centrality (same as nx.closeness_centrality) of given nodes only."""
+        closeness_centrality = dict()
+        for partial_closeness in CentralityUtils.map_over_nodes(G, _closeness_of_nodes, nodes, workers):
+            closeness_centrality.update(partial_closeness)
+        return closeness_centrality
+
+    @staticmethod
+    def component_betweenness_centrality(G, component_nodes, workers=1):
+        """
+        Returns normalized betweenness centrality (same as nx.betweenness_centrality) of nodes in given connected components.
+        Shortest paths never leave component, so only component's nodes are used as sources, but values are normalized by size of the whole graph.
+        """
+        component_nodes = list(component_nodes)
+        betweenness_centrality = dict.fromkeys(component_nodes, 0.0)
+        for partial_betweenness in CentralityUtils.map_over_nodes(G, _betweenness_from_sources, component_nodes, workers):
+            for node in component_nodes:
+                betweenness_centrality[node] += partial_betweenness[node]
+        number_of_nodes = len(G)
+        if number_of_nodes <= 2:
+            return betweenness_centrality
+        scale = 2 / ((number_of_nodes - 1) * (number_of_nodes - 2))
+        for node in betweenness_centrality:
+            betweenness_centrality[node] *= scale
+        return betweenness_centrality
+
+    @staticmethod
+    def sampled_betweenness_centrality(G, sample_size, seed, workers=1):
+        """Returns normalized betweenness centrality estimated from sample_size random pivots (same pivots as nx.betweenness_centrality with k and seed)."""
+        pivots = random.Random(seed).sample(list(G), sample_size)
+        return CentralityUtils._betweenness_centrality_from_sources(G, pivots, workers)
+
+    @staticmethod
+    def sampled_closeness_centrality(G, sample_size, seed, workers=1):
+        """
+        Returns closeness centrality estimated from sample_size random pivots (Eppstein-Wang) and number of pivots actually used.
+        Pivots are spread over connected components proportionally to their size, so the result uses the same
+        Wasserman-Faust scaling as nx.closeness_centrality. Components that get as many pivots as they have nodes are computed exactly.
+        Every component gets at least one pivot, so on graphs with many small components more than sample_size pivots are used.
+        """
+        number_of_nodes = len(G)
+        closeness_centrality = dict.fromkeys(G, 0.0)
+        if number_of_nodes < 2:
+            return closeness_centrality, 0
+        generator = random.Random(seed)
+        # Nodes of each component are listed in order of graph's nodes instead of set order (which depends on values of node ids),
+        # so the same seed always picks the same pivots
+        node_positions = {node: position for position, node in enumerate(G)}
+        components = [sorted(component, key=node_positions.__getitem__) for component in nx.connected_components(G) if len(component) > 1]
+        pivots = []
+        for component_nodes in components:
+            component_sample_size = math.ceil(sample_size * len(component_nodes) / number_of_nodes)
+            if component_sample_size >= len(component_nodes):
+                pivots.extend(component_nodes)
+            else:
+                pivots.extend(generator.sample(component_nodes, component_sample_size))
+
+        distance_sums = dict()
+        distance_counts = dict()
+        pivot_distance_sums = dict()
+        for partial_distances in CentralityUtils.map_over_nodes(G, _distances_from_pivots, pivots, workers):
+            for node, distance_sum in partial_distances[0].items():
+                distance_sums[node] = distance_sums.get(node, 0) + distance_sum
+            for node, distance_count in partial_distances[1].items():
+                distance_counts[node] = distance_counts.get(node, 0) + distance_count
+            pivot_distance_sums.update(partial_distances[2])
+
+        for component_nodes in components:
+            component_size = len(component_nodes)
+            scale = (component_size - 1) / (number_of_nodes - 1)
+            for node in component_nodes:
+                if node in pivot_distance_sums:
+                    # Pivot's own distances are complete, so its closeness is exact
+                    average_distance = pivot_distance_sums[node] / (component_size - 1)
+                else:
+                    average_distance = distance_sums[node] / distance_counts[node]
+                closeness_centrality[node] = scale / average_distance
+        return closeness_centrality, len(pivots)
+
+    @staticmethod
+    def _betweenness_centrality_from_sources(G, sources, workers):
+        """Sums partial betweenness of given sources and rescales it the way nx.betweenness_centrality does (including n/k for sampled sources)."""
+        betweenness_centrality = dict.fromkeys(G, 0.0)
+        for partial_betweenness in CentralityUtils.map_over_nodes(G, _betweenness_from_sources, sources, workers):
+            for node, value in partial_betweenness.items():
+                betweenness_centrality[node] += value
+        number_of_nodes = len(G)
+        if number_of_nodes <= 2:
+            return betweenness_centrality
+        # Partial results are halved for undirected graphs, normalization counts both directions of each pair
+        scale = 2 / ((number_of_nodes - 1) * (number_of_nodes - 2)) * number_of_nodes / len(sources)
+        for node in betweenness_centrality:
+            betweenness_centrality[node] *= scale
+        return betweenness_centrality
@@ -1,35 +1,42 @@
-from itertools import combinations
+import numpy as np
 
 from ..data_processing.authors_data_processing import Author
-from .network_base import Node, Edge, EdgeType, Network
+from .network_base import NodeStore, EdgeStore, EdgeType, Network
+from .sparse_projection import ProjectionUtils
+from .settings import COAUTHOR_FRACTIONAL_WEIGHTS
 
 
 class CoAuthorNetwork(Network):
     """Class responsible for parsing inputed data, creating nodes and edges for CoAuthor graph and exporting to csv."""
 
-    def __init__(self, all_authors, publications):
+    # Number of papers grows between runs, so author is identified only by name, faculty and department
+    node_key_attributes = ['name', 'faculty', 'department']
+
+    def __init__(self, dataset_index, fractional_weights=COAUTHOR_FRACTIONAL_WEIGHTS):
         super().__init__()
-        self.all_authors = all_authors
-        self.publications = publications
-        self.create_nodes()
-        self.create_edges()
+        self.dataset_index = dataset_index
+        self.fractional_weights = fractional_weights
   
     def create_nodes(self):
         """Creating nodes - Authors with their attributes."""
         try:
-            nodes = []
-            for author_name in self.all_authors:
-                author = self.all_authors[author_name]
-                if len(author.collaborators) > 0:
+            index = self.dataset_index
+            # Authors that collaborated on at least one (indexed) publication
+            collaborating_authors = set()
+            for author_indices in index.publication_author_indices:
+                if len(author_indices) > 1:
+                    collaborating_authors.update(author_indices)
+            nodes = NodeStore(['name', 'faculty', 'department', 'number_of_papers'])
+            for author_index, author_id in enumerate(index.author_ids):
+                if author_index in collaborating_authors:
                     # We are exporting only authors from UoB that have collaborationg with each other. 
                     attributes = {
-                        'name': author.get_author_full_name().title(), 
-                        'faculty':author.faculty.title(), 
-                        'department':author.department.title(),
-                        'number_of_papers':len(author.papers)
+                        'name': index.author_names[author_index].title(), 
+                        'faculty':index.faculties[index.author_faculty_indices[author_index]].title(), 
+                        'department':index.departments[index.author_department_indices[author_index]].title(),
+                        'number_of_papers':len(index.author_paper_indices[author_index])
                         }
-                    node = Node(attributes, id=author.id)
-                    nodes.append(node)
+                    nodes.add(attributes, id=author_id)
             self.nodes = nodes
             return nodes
         except Exception as e:
@@ -37,31 +44,32 @@ class CoAuthorNetwork(Network):
             return None
 
     def create_edges(self):
-        """Creating edges (connecting two authors based on publication collaboration)."""
+        """
+        Creating edges (connecting two authors based on publication collaboration).
+        Edges are projection of publication x author incidence matrix on authors, weight of edge is number of papers two authors share
+        or, with fractional weights, sum of 1/(n-1) over shared papers with n authors.
+        """
         try:
-            edges = dict()
-            for key in self.publications:
-                authors = self.publications[key].authors
-                if len(authors) > 1:
-                    # We create edge only if we have more that 2 authors workig on paper (creating combinations from list of authors)
-                    links = combinations(authors, 2)
-                    for link in links:
-                        # Key in dictionary of edges is tuple of two authors (position matters)
-                        # Weight of edge between two authors is increased each time we find new collaboration on publication
-                        if (link[0].id, link[1].id) in edges:
-                            edges[link[0].id, link[1].id] += 1
-                        elif (link[1].id, link[0].id) in edges:
-                            edges[link[1].id, link[0].id] += 1
-                        else:
-                            edges[link[0].id, link[1].id] = 1
+            index = self.dataset_index
+            publications = []
+            authors = []
+            publication_weights = []
+            for author_indices in index.publication_author_indices:
+                if len(author_indices) > 1:
+                    # We create edge only if we have more that 2 authors workig on paper
+                    publications.extend([len(publication_weights)] * len(author_indices))
+                    authors.extend(author_indices)
+                    publication_weights.append(1 / (len(author_indices) - 1))
+            first_authors, second_authors, weights = ProjectionUtils.project(publications, authors, index.number_of_authors(),
+                                                                             row_weights=publication_weights if self.fractional_weights else None)
 
-            coauthors_edges = [] 
-            for coauthors in edges:
-                edge = Edge(source=coauthors[0], target=coauthors[1], edge_type=EdgeType.UNDIRRECTED.value, weight=edges[coauthors])
-                coauthors_edges.append(edge)
+            coauthors_edges = EdgeStore('d') if self.fractional_weights else EdgeStore()
+            coauthors_edges.extend(sources=[index.author_ids[author_index] for author_index in first_authors.tolist()],
+                                   targets=[index.author_ids[author_index] for author_index in second_authors.tolist()],
+                                   edge_type=EdgeType.UNDIRRECTED.value,
+                                   weights=weights.tolist() if self.fractional_weights else np.rint(weights).astype(np.int64).tolist())
             self.edges = coauthors_edges
             return coauthors_edges
         except Exception as e:
             print(e)
             return None
-   
\ No newline at end of file
@@ -0,0 +1,103 @@
+# Standart libarry imports
+import io
+import csv
+import gzip
+
+# Third party imports (optional)
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Number of nodes or edges formatted and written to file at once
+EXPORT_BLOCK_SIZE = 65536
+
+# Extensions of exported files for each supported compression (None writes plain .csv)
+COMPRESSION_EXTENSIONS = {
+    None: '.csv',
+    'gzip': '.csv.gz',
+    'zstd': '.csv.zst',
+}
+
+# Compression level of gzip files (gzip module defaults to slowest level 9)
+GZIP_COMPRESSION_LEVEL = 6
+
+# Same line terminator as csv.writer, so exported files do not change
+LINE_TERMINATOR = '\r\n'
+
+
+class CsvExportUtils():
+    """
+    Bulk export of columnar nodes (NodeStore) and edges (EdgeStore) to .csv files, in format of Node.export_to_csv and Edge.export_to_csv.
+    Interned attribute values are formatted as csv fields only once, and rows are joined and written in blocks of EXPORT_BLOCK_SIZE
+    instead of one writerow call per node or edge. Files can be compressed with gzip or zstd (requires zstandard package),
+    and nodes and edges files can be written concurrently (see Network.export_network_to_csv), since writing and compression release GIL.
+    """
+
+    @staticmethod
+    def get_file_name(file_name, compression=None):
+        if compression not in COMPRESSION_EXTENSIONS:
+            raise ValueError(f'Unsupported export compression: {compression}, supported are {list(COMPRESSION_EXTENSIONS)}')
+        return file_name + COMPRESSION_EXTENSIONS[compression]
+
+    @staticmethod
+    def export_nodes(nodes, file_path, compression=None, block_size=EXPORT_BLOCK_SIZE):
+        """Writes header (Id and attribute names) and one row per node."""
+        with CsvExportUtils.open_file(file_path, compression) as f:
+            f.write(CsvExportUtils.format_row(['Id'] + nodes.attribute_names))
+            # Each distinct attribute value is formatted once, rows only look up formatted fields by code
+            column_fields = [[CsvExportUtils.format_field(value) for value in values] for values in nodes.values]
+            for start in range(0, len(nodes), block_size):
+                end = start + block_size
+                ids = map(str, nodes.ids[start:end])
+                columns = [map(fields.__getitem__, column[start:end]) for fields, column in zip(column_fields, nodes.columns)]
+                f.write(''.join([','.join(row) + LINE_TERMINATOR for row in zip(ids, *columns)]))
+        return file_path
+
+    @staticmethod
+    def export_edges(edges, file_path, compression=None, block_size=EXPORT_BLOCK_SIZE):
+        """Writes header (Edge.header) and one row per edge, fields are not quoted (same as csv.QUOTE_NONE)."""
+        row_format = '{},{},{},{},{}' + LINE_TERMINATOR
+        with CsvExportUtils.open_file(file_path, compression) as f:
+            f.write(','.join(edges.header) + LINE_TERMINATOR)
+            for start in range(0, len(edges), block_size):
+                end = start + block_size
+                types = map(edges.types.__getitem__, edges.type_codes[start:end])
+                f.write(''.join(map(row_format.format, edges.ids[start:end], edges.sources[start:end], edges.targets[start:end], types, edges.weights[start:end])))
+        return file_path
+
+    @staticmethod
+    def open_file(file_path, compression=None):
+        """Opens text file for writing, compressed with given compression."""
+        if compression is None:
+            return open(file_path, 'w', encoding='utf8', newline='')
+        elif compression == 'gzip':
+            return gzip.open(file_path, 'wt', compresslevel=GZIP_COMPRESSION_LEVEL, encoding='utf8', newline='')
+        elif compression == 'zstd':
+            if zstandard is None:
+                raise ImportError('zstd compression of exported files requires zstandard package (pip install zstandard)')
+            return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(open(file_path, 'wb'), closefd=True), encoding='utf8', newline='')
+        raise ValueError(f'Unsupported export compression: {compression}, supported are {list(COMPRESSION_EXTENSIONS)}')
+
+    @staticmethod
+    def format_row(values):
+        """Formats values as csv row, same as csv.writer with default dialect."""
+        row = io.StringIO()
+        csv.writer(row, lineterminator=LINE_TERMINATOR).writerow(values)
+        return row.getvalue()
+
+    @staticmethod
+    def format_set(values):
+        """Returns same string as str(set), but with values in sorted order."""
+        if not values:
+            return str(set())
+        return '{' + ', '.join(repr(value) for value in sorted(values)) + '}'
+
+    @staticmethod
+    def format_field(value):
+        """Formats single value as csv field (quoted if needed), same as csv.writer with default dialect."""
+        if isinstance(value, (set, frozenset)):
+            # Sets are written in sorted order, so that output is same in every run
+            value = CsvExportUtils.format_set(value)
+        # Field is formatted after dummy one, since row with single empty field is written quoted
+        return CsvExportUtils.format_row([0, value])[2:-len(LINE_TERMINATOR)]
@@ -0,0 +1,132 @@
+from collections import namedtuple
+
+# Subset of dataset that networks are created from: publication years (inclusive range), faculties of authors and publication types.
+# Fields that are None do not filter.
+DatasetFilter = namedtuple('DatasetFilter', ['first_year', 'last_year', 'faculties', 'publication_types'], defaults=(None, None, None, None))
+
+
+class DatasetIndex():
+    """
+    Tables derived from processed dataset that are shared by all network builders, built in one pass over authors and one pass over publications.
+    Values (titles, article names, years, departments, faculties, papers) are stored once in tables, in order of first occurrence,
+    and authors and publications reference them by position, so builders work with integer indices instead of repeating
+    getter calls and tuple lookups on every author and publication.
+    With dataset filter, only authors, papers and publications matching the filter are indexed, so every network
+    created from the index is created only from that subset of dataset.
+    """
+
+    def __init__(self, authors, publications, dataset_filter=None):
+        self.dataset_filter = dataset_filter or DatasetFilter()
+        # Filter values are compared in lower case, same as cleaned dataset
+        self._faculties = {faculty.lower() for faculty in self.dataset_filter.faculties} if self.dataset_filter.faculties is not None else None
+        self._publication_types = {publication_type.lower() for publication_type in self.dataset_filter.publication_types} if self.dataset_filter.publication_types is not None else None
+
+        # Author table, in order of authors dictionary (Author objects are not kept in index attached to dataset snapshot)
+        self.authors = []
+        self.author_ids = []
+        self.author_names = []
+        self.author_department_indices = []
+        self.author_faculty_indices = []
+        # List of paper indices of each author, in order of author's papers
+        self.author_paper_indices = []
+
+        # Tables of distinct values, with value -> index dictionaries
+        self.departments = []
+        self.department_faculty_indices = []
+        self.faculties = []
+        self.papers = []
+        self.titles = []
+        self.articles = []
+        self.years = []
+        self.department_indices = dict()
+        self.faculty_indices = dict()
+        self.paper_indices = dict()
+        self.title_indices = dict()
+        self.article_indices = dict()
+        self.year_indices = dict()
+
+        # Publication table, in order of publications dictionary
+        self.publication_title_indices = []
+        self.publication_article_indices = []
+        self.publication_year_indices = []
+        self.publication_types = []
+        # List of author indices of each publication (publication x author incidence lists)
+        self.publication_author_indices = []
+
+        self._author_indices = dict()
+        for author in authors.values():
+            if self._includes_author(author):
+                self._add_author(author)
+        for publication in publications.values():
+            first_record = publication.publication_records[0]
+            if self._includes_paper(first_record.publication_year, first_record.publication_type):
+                self._add_publication(publication)
+        del self._author_indices
+
+    def number_of_authors(self):
+        return len(self.author_ids)
+
+    def number_of_publications(self):
+        return len(self.publication_title_indices)
+
+    def _add_author(self, author):
+        author_index = len(self.authors)
+        self._author_indices[author] = author_index
+        self.authors.append(author)
+        self.author_ids.append(author.id)
+        self.author_names.append(author.get_author_full_name())
+        faculty_index = DatasetIndex._get_index(author.faculty, self.faculty_indices, self.faculties)
+        if author.department not in self.department_indices:
+            # Department belongs to faculty of its first author
+            self.department_faculty_indices.append(faculty_index)
+        self.author_department_indices.append(DatasetIndex._get_index(author.department, self.department_indices, self.departments))
+        self.author_faculty_indices.append(faculty_index)
+        paper_indices = []
+        for published_paper in author.papers:
+            if not self._includes_paper(published_paper[2], published_paper[1]):
+                continue
+            paper_index = DatasetIndex._get_index(published_paper, self.paper_indices, self.papers)
+            DatasetIndex._get_index(published_paper[2], self.year_indices, self.years)
+            paper_indices.append(paper_index)
+        self.author_paper_indices.append(paper_indices)
+        return author_index
+
+    def _add_publication(self, publication):
+        author_indices = []
+        for author in publication.authors:
+            if not self._includes_author(author):
+                continue
+            author_index = self._author_indices.get(author)
+            if author_index is None:
+                # Author of publication that is not in authors dictionary
+                author_index = self._add_author(author)
+            author_indices.append(author_index)
+        if not author_indices and self._faculties is not None:
+            # Publication has no authors from filtered faculties
+            return
+        first_record = publication.publication_records[0]
+        self.publication_title_indices.append(DatasetIndex._get_index(first_record.publication_title, self.title_indices, self.titles))
+        self.publication_article_indices.append(DatasetIndex._get_index(first_record.article_name, self.article_indices, self.articles))
+        self.publication_year_indices.append(DatasetIndex._get_index(first_record.publication_year, self.year_indices, self.years))
+        self.publication_types.append(first_record.publication_type)
+        self.publication_author_indices.append(author_indices)
+
+    def _includes_author(self, author):
+        return self._faculties is None or author.faculty in self._faculties
+
+    def _includes_paper(self, year, publication_type):
+        if self.dataset_filter.first_year is not None and (year is None or year < self.dataset_filter.first_year):
+            return False
+        if self.dataset_filter.last_year is not None and (year is None or year > self.dataset_filter.last_year):
+            return False
+        return self._publication_types is None or publication_type in self._publication_types
+
+    @staticmethod
+    def _get_index(value, indices, values):
+        """Returns index of value in table, adding value to the end of table if it is not there."""
+        index = indices.get(value)
+        if index is None:
+            index = len(values)
+            indices[value] = index
+            values.append(value)
+        return index
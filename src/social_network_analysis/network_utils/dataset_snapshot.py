@@ -0,0 +1,144 @@
+# Standart libarry imports
+import os
+import json
+import shutil
+
+# Third party imports
+import numpy as np
+
+# Local project imports
+from ..data_processing.string_table import StringTable
+from .dataset_index import DatasetIndex, DatasetFilter
+
+# Snapshots stored in different format version are ignored
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Name of snapshots directory, created in dataset cache directory
+SNAPSHOT_DIRECTORY_NAME = 'snapshots'
+
+# Tables of dataset index whose values are strings (None values are allowed), stored as positions in interned string table
+STRING_TABLES = ['author_names', 'departments', 'faculties', 'titles', 'articles', 'publication_types']
+
+# Tables of dataset index whose values are integers (positions in other tables, or ids)
+INTEGER_TABLES = {
+    'author_ids': np.int64,
+    'author_department_indices': np.int32,
+    'author_faculty_indices': np.int32,
+    'department_faculty_indices': np.int32,
+    'publication_title_indices': np.int32,
+    'publication_article_indices': np.int32,
+    'publication_year_indices': np.int32,
+}
+
+# Tables of dataset index whose values are lists of positions (incidence lists), stored as flat values and offsets of each list
+INCIDENCE_TABLES = ['author_paper_indices', 'publication_author_indices']
+
+
+class DatasetSnapshot():
+    """
+    Processed dataset (tables of dataset index) stored as memory-mappable .npy arrays, so that networks can be created
+    without importing, cleaning and processing excel files, and pool workers can attach to the same files instead of
+    receiving a copy of authors and publications.
+    All strings (names, titles, departments, publication types...) are stored once in interned string table, tables store their positions,
+    and incidence lists (papers of authors, authors of publications) are stored as flat arrays with offsets.
+    Layout: <path>/snapshot.json, strings.*.npy, <table>.npy, <incidence table>.values.npy and <incidence table>.offsets.npy
+    """
+
+    @staticmethod
+    def exists(path):
+        return os.path.isfile(os.path.join(path, 'snapshot.json'))
+
+    @staticmethod
+    def save(dataset_index, path):
+        """
+        Saves tables of dataset index into temporary directory, which is renamed to snapshot directory once complete.
+        Other snapshots in same directory (of previous versions of dataset) are removed.
+        """
+        temporary_path = path + '.tmp'
+        shutil.rmtree(temporary_path, ignore_errors=True)
+        os.makedirs(temporary_path)
+
+        strings = []
+        string_indices = dict()
+        def intern(value):
+            index = string_indices.get(value)
+            if index is None:
+                index = len(strings)
+                string_indices[value] = index
+                strings.append(value)
+            return index
+
+        for table_name in STRING_TABLES:
+            DatasetSnapshot._save_array(temporary_path, table_name, [intern(value) for value in getattr(dataset_index, table_name)], np.int32)
+        # Papers are (title, publication type, year) tuples, years are stored as positions in years table
+        DatasetSnapshot._save_array(temporary_path, 'paper_titles', [intern(paper[0]) for paper in dataset_index.papers], np.int32)
+        DatasetSnapshot._save_array(temporary_path, 'paper_types', [intern(paper[1]) for paper in dataset_index.papers], np.int32)
+        DatasetSnapshot._save_array(temporary_path, 'paper_year_indices', [dataset_index.year_indices[paper[2]] for paper in dataset_index.papers], np.int32)
+        DatasetSnapshot._save_array(temporary_path, 'years', [year if year is not None else 0 for year in dataset_index.years], np.int64)
+        DatasetSnapshot._save_array(temporary_path, 'years_missing', [year is None for year in dataset_index.years], bool)
+        for table_name, dtype in INTEGER_TABLES.items():
+            DatasetSnapshot._save_array(temporary_path, table_name, getattr(dataset_index, table_name), dtype)
+        for table_name in INCIDENCE_TABLES:
+            lists = getattr(dataset_index, table_name)
+            offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+            np.cumsum([len(values) for values in lists], out=offsets[1:])
+            np.save(os.path.join(temporary_path, f'{table_name}.offsets.npy'), offsets)
+            DatasetSnapshot._save_array(temporary_path, f'{table_name}.values', [value for values in lists for value in values], np.int32)
+        StringTable.from_strings(strings).save(temporary_path, 'strings')
+
+        with open(os.path.join(temporary_path, 'snapshot.json'), 'w', encoding='utf8') as f:
+            json.dump({'version': SNAPSHOT_FORMAT_VERSION, 'dataset_filter': dataset_index.dataset_filter._asdict()}, f)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(temporary_path, path)
+        snapshots_path = os.path.dirname(path)
+        for entry in os.listdir(snapshots_path):
+            if os.path.join(snapshots_path, entry) != path:
+                shutil.rmtree(os.path.join(snapshots_path, entry), ignore_errors=True)
+        return path
+
+    @staticmethod
+    def attach(path, mmap_mode='r'):
+        """Returns dictionary table name -> memory-mapped array (or string table) of snapshot, nothing is read until arrays are accessed."""
+        arrays = {'strings': StringTable.load(path, 'strings', mmap_mode)}
+        for file_name in os.listdir(path):
+            if file_name.endswith('.npy') and not file_name.startswith('strings.'):
+                arrays[file_name[:-len('.npy')]] = np.load(os.path.join(path, file_name), mmap_mode=mmap_mode)
+        return arrays
+
+    @staticmethod
+    def load_dataset_index(path):
+        """Returns dataset index with tables read from snapshot (Author objects are not part of snapshot, so authors table is None)."""
+        with open(os.path.join(path, 'snapshot.json'), encoding='utf8') as f:
+            snapshot = json.load(f)
+        if snapshot['version'] != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f'Dataset snapshot {path} has format version {snapshot["version"]}, expected {SNAPSHOT_FORMAT_VERSION}')
+        arrays = DatasetSnapshot.attach(path)
+        # Each distinct string is decoded only once
+        strings = arrays['strings'].to_list()
+
+        dataset_index = DatasetIndex(dict(), dict(), DatasetFilter(**snapshot['dataset_filter']))
+        dataset_index.authors = None
+        for table_name in STRING_TABLES:
+            setattr(dataset_index, table_name, [strings[index] for index in arrays[table_name].tolist()])
+        for table_name in INTEGER_TABLES:
+            setattr(dataset_index, table_name, arrays[table_name].tolist())
+        for table_name in INCIDENCE_TABLES:
+            values = arrays[f'{table_name}.values'].tolist()
+            offsets = arrays[f'{table_name}.offsets'].tolist()
+            setattr(dataset_index, table_name, [values[offsets[index]:offsets[index + 1]] for index in range(len(offsets) - 1)])
+        dataset_index.years = [year if not missing else None for year, missing in zip(arrays['years'].tolist(), arrays['years_missing'].tolist())]
+        dataset_index.papers = [(strings[title], strings[publication_type], dataset_index.years[year_index])
+                                for title, publication_type, year_index in zip(arrays['paper_titles'].tolist(), arrays['paper_types'].tolist(), arrays['paper_year_indices'].tolist())]
+
+        # Value -> position dictionaries of tables
+        dataset_index.department_indices = {value: index for index, value in enumerate(dataset_index.departments)}
+        dataset_index.faculty_indices = {value: index for index, value in enumerate(dataset_index.faculties)}
+        dataset_index.paper_indices = {value: index for index, value in enumerate(dataset_index.papers)}
+        dataset_index.title_indices = {value: index for index, value in enumerate(dataset_index.titles)}
+        dataset_index.article_indices = {value: index for index, value in enumerate(dataset_index.articles)}
+        dataset_index.year_indices = {value: index for index, value in enumerate(dataset_index.years)}
+        return dataset_index
+
+    @staticmethod
+    def _save_array(path, name, values, dtype):
+        np.save(os.path.join(path, f'{name}.npy'), np.array(values, dtype=dtype))
@@ -1,16 +1,17 @@
 from ..data_processing.authors_data_processing import Author
-from .network_base import Node, Edge, EdgeType, Network
+from .network_base import NodeStore, EdgeStore, EdgeType, Network
 
 PUBLICATION_TYPE_TO_EXCLUDE = 'conference paper'
 
 class DepartmentNetwork(Network):
     """Class for creating Department graph, connecting faculty departments with published papers."""
 
-    def __init__(self, authors):
+    # Publication type of paper node can change between runs, so it does not identify node
+    node_key_attributes = ['department', 'faculty', 'publication', 'node_type']
+
+    def __init__(self, dataset_index):
         super().__init__()
-        self.authors = authors
-        self.create_nodes()
-        self.create_edges()
+        self.dataset_index = dataset_index
 
     def create_node_attribute_template(self):
         return {
@@ -24,43 +25,50 @@ class DepartmentNetwork(Network):
     def create_nodes(self):
         """Creates nodes for network - departments and published papers by professors from taht department."""        
         try:
-            self.nodes = []
+            index = self.dataset_index
+            self.nodes = NodeStore(self.create_node_attribute_template())
             self.departments = dict()
             self.papers = dict()
-            for author_name in self.authors:
-                if self.authors[author_name].department not in self.departments:
+            paper_names = dict()
+            for author_index in range(index.number_of_authors()):
+                department_index = index.author_department_indices[author_index]
+                if department_index not in self.departments:
                     # Creating department nodes
                     attributes = self.create_node_attribute_template()
-                    attributes['department'] = self.authors[author_name].department
-                    attributes['faculty'] = self.authors[author_name].faculty
+                    attributes['department'] = index.departments[department_index]
+                    attributes['faculty'] = index.faculties[index.department_faculty_indices[department_index]]
                     attributes['node_type'] = 'department'
-                    node = Node(attributes)
-                    self.departments[self.authors[author_name].department] = node 
-                    self.nodes.append(node)
+                    self.departments[department_index] = self.nodes.add(attributes)
                 # Creating published papers nodes
-                for published_paper in self.authors[author_name].papers:
-                    attributes = self.create_node_attribute_template()
-                    attributes['publication'] = published_paper[0]  
-                    attributes['publication_type'] = published_paper[1]  
-                    attributes['node_type'] = 'paper'
-                    node = Node(attributes)
-                    self.papers[published_paper[0]] = node
+                for paper_index in index.author_paper_indices[author_index]:
+                    published_paper = index.papers[paper_index]
+                    paper_names.setdefault(published_paper[0], published_paper[1])
 
-            for paper_name in self.papers:
-                self.nodes.append(self.papers[paper_name])
+            # Paper can be recorded with more than one publication type, type of last publication in dataset order is used,
+            # so that node does not depend on order in which author's papers are iterated (and network digest is same in every run)
+            publication_types = dict()
+            for title_index, publication_type in zip(index.publication_title_indices, index.publication_types):
+                publication_types[index.titles[title_index]] = publication_type
+            for paper_name in paper_names:
+                attributes = self.create_node_attribute_template()
+                attributes['publication'] = paper_name
+                attributes['publication_type'] = publication_types.get(paper_name, paper_names[paper_name])
+                attributes['node_type'] = 'paper'
+                self.papers[paper_name] = self.nodes.add(attributes)
         except Exception as e:
             print(e)
             return None
 
     def create_edges(self):
-        """Creates edges (connecting two articles if at least one author exists who published papers in both articles)."""
+        """Creates edges (connecting departments with papers published by professors from that department)."""
         try:
-            self.edges = []
-            for author_name in self.authors:
-                department = self.departments[self.authors[author_name].department]
-                for published_paper in self.authors[author_name].papers:
-                    paper = self.papers[published_paper[0]]
-                    self.edges.append(Edge(source=department.id, target=paper.id, edge_type=EdgeType.DIRECTED.value))
+            index = self.dataset_index
+            self.edges = EdgeStore()
+            for author_index in range(index.number_of_authors()):
+                department = self.departments[index.author_department_indices[author_index]]
+                for paper_index in index.author_paper_indices[author_index]:
+                    paper = self.papers[index.papers[paper_index][0]]
+                    self.edges.add(source=department, target=paper, edge_type=EdgeType.DIRECTED.value)
         except Exception as e:
             print(e)
-            return None
\ No newline at end of file
+            return None
@@ -1,16 +1,14 @@
 from ..data_processing.authors_data_processing import Author
-from .network_base import Node, Edge, EdgeType, Network
+from .network_base import NodeStore, EdgeStore, EdgeType, Network
 
 PUBLICATION_TYPE_TO_EXCLUDE = 'conference paper'
 
 class DepartmentYearlyNetwork(Network):
     """Class for creating Department Yearly graph, connecting faculty/departments with years when there were published papers."""
 
-    def __init__(self, authors):
+    def __init__(self, dataset_index):
         super().__init__()
-        self.authors = authors
-        self.create_nodes()
-        self.create_edges()
+        self.dataset_index = dataset_index
 
     def create_node_attribute_template(self):
         return {
@@ -21,36 +19,34 @@ class DepartmentYearlyNetwork(Network):
     def create_nodes(self):
         """Creates nodes for network - departments/faculties and years in which papers were published."""        
         try:
-            self.nodes = []
+            index = self.dataset_index
+            self.nodes = NodeStore(self.create_node_attribute_template())
             self.departments = dict()
             self.faculties = dict()
             self.years = dict()
-            for author_name in self.authors:
-                if self.authors[author_name].department not in self.departments:
+            for author_index in range(index.number_of_authors()):
+                department_index = index.author_department_indices[author_index]
+                faculty_index = index.author_faculty_indices[author_index]
+                if department_index not in self.departments:
                     # Creating department nodes
                     attributes = self.create_node_attribute_template()
-                    attributes['name'] = self.authors[author_name].department
+                    attributes['name'] = index.departments[department_index]
                     attributes['node_type'] = 'department'
-                    node = Node(attributes)
-                    self.departments[self.authors[author_name].department] = node 
-                    self.nodes.append(node)
-                if self.authors[author_name].faculty not in self.faculties:
+                    self.departments[department_index] = self.nodes.add(attributes)
+                if faculty_index not in self.faculties:
                     # Creating faculty nodes
                     attributes = self.create_node_attribute_template()
-                    attributes['name'] = self.authors[author_name].faculty
+                    attributes['name'] = index.faculties[faculty_index]
                     attributes['node_type'] = 'faculty'
-                    node = Node(attributes)
-                    self.faculties[self.authors[author_name].faculty] = node 
-                    self.nodes.append(node)
+                    self.faculties[faculty_index] = self.nodes.add(attributes)
                 # Creating years nodes (year in which paper was published)
-                for published_paper in self.authors[author_name].papers:
-                    if published_paper[2] not in self.years:
+                for paper_index in index.author_paper_indices[author_index]:
+                    paper_year = index.papers[paper_index][2]
+                    if paper_year not in self.years:
                         attributes = self.create_node_attribute_template()
-                        attributes['name'] = published_paper[2]  
+                        attributes['name'] = paper_year
                         attributes['node_type'] = 'year_of_publishing'
-                        node = Node(attributes)
-                        self.years[published_paper[2]] = node
-                        self.nodes.append(node)
+                        self.years[paper_year] = self.nodes.add(attributes)
         except Exception as e:
             print(e)
             return None
@@ -58,38 +54,32 @@ class DepartmentYearlyNetwork(Network):
     def create_edges(self):
         """Creates edges (connecting department/faculty with year if there was author from that organization who published in that year)."""
         try:
+            index = self.dataset_index
             # For excluding double entry for paper 
             # e.g. tho authors from same faculty/department published paper together (only one egde should be added).
             added_papers = set() 
             edges = dict()
-            for author_name in self.authors:
-                department = self.departments[self.authors[author_name].department]
-                faculty = self.faculties[self.authors[author_name].faculty]
-                for published_paper in self.authors[author_name].papers:
-                    paper_name = published_paper[0] 
-                    paper_type = published_paper[1]
-                    paper_year = published_paper[2]
-
-                    year = self.years[published_paper[2]]
+            self.edges = EdgeStore()
+            for author_index in range(index.number_of_authors()):
+                department = self.departments[index.author_department_indices[author_index]]
+                faculty = self.faculties[index.author_faculty_indices[author_index]]
+                for paper_index in index.author_paper_indices[author_index]:
+                    year = self.years[index.papers[paper_index][2]]
                     
-                    if (paper_name, paper_type, paper_year, faculty.id) not in added_papers:
+                    if (paper_index, faculty) not in added_papers:
                         # Adding edge for faculty
-                        if (faculty.id, year.id) in edges:
-                            edges[(faculty.id, year.id)].weight += 1
+                        if (faculty, year) in edges:
+                            self.edges.increment_weight(edges[(faculty, year)])
                         else:
-                            edges[(faculty.id, year.id)] = Edge(source=faculty.id, target=year.id, edge_type=EdgeType.DIRECTED.value) 
-                        added_papers.add((paper_name, paper_type, paper_year, faculty.id))
-                    if (paper_name, paper_type, paper_year, department.id) not in added_papers:
+                            edges[(faculty, year)] = self.edges.add(source=faculty, target=year, edge_type=EdgeType.DIRECTED.value) 
+                        added_papers.add((paper_index, faculty))
+                    if (paper_index, department) not in added_papers:
                         # Adding edge for department
-                        if (department.id, year.id) in edges:
-                            edges[(department.id, year.id)].weight += 1
+                        if (department, year) in edges:
+                            self.edges.increment_weight(edges[(department, year)])
                         else:
-                            edges[(department.id, year.id)] = Edge(source=department.id, target=year.id, edge_type=EdgeType.DIRECTED.value)
-                        added_papers.add((paper_name, paper_type, paper_year, department.id))
-
-            self.edges = []
-            for edge_id_pair in edges:
-                self.edges.append(edges[edge_id_pair])            
+                            edges[(department, year)] = self.edges.add(source=department, target=year, edge_type=EdgeType.DIRECTED.value)
+                        added_papers.add((paper_index, department))
         except Exception as e:
             print(e)
-            return None
\ No newline at end of file
+            return None
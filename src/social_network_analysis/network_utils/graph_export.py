@@ -0,0 +1,195 @@
+# Standart libarry imports
+import numbers
+from xml.sax.saxutils import quoteattr
+
+# Third party imports
+import numpy as np
+
+# Third party imports (optional)
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Local project imports
+from .csv_export import CsvExportUtils
+
+# Formats networks can be exported to:
+# 'csv' - nodes and edges .csv files (Gephi spreadsheet import)
+# 'gexf' - GEXF graph file with typed node attributes (Gephi)
+# 'parquet' - nodes and edges Parquet tables with typed columns (requires pyarrow)
+# 'edgelist' - memory-mappable .npy arrays of edge sources and targets (int32, n x 2) and edge weights
+EXPORT_FORMATS = ['csv', 'gexf', 'parquet', 'edgelist']
+
+# Number of nodes or edges written to GEXF file at once
+GEXF_BLOCK_SIZE = 65536
+
+# Node attributes used as node label in GEXF file, first non-empty one is used (node id if none of them is set)
+GEXF_LABEL_ATTRIBUTES = ['name', 'author_name', 'paper_name', 'department']
+
+# Separator of list values (sets) in GEXF liststring attributes
+GEXF_LIST_SEPARATOR = '|'
+
+
+class GraphExportUtils():
+    """
+    Exports columnar nodes (NodeStore) and edges (EdgeStore) to formats other than csv, keeping types of node attributes
+    (integers, floats, strings and sets, which are written as lists instead of their string representation).
+    GEXF files are written incrementally in blocks, Parquet and edge list files are written from typed arrays of stores.
+    """
+
+    @staticmethod
+    def get_file_names(file_name, export_format, compression=None):
+        """Returns names of files network is exported to in given format (compression applies only to csv)."""
+        if export_format == 'csv':
+            return [CsvExportUtils.get_file_name(file_name + ' - Nodes', compression), CsvExportUtils.get_file_name(file_name + ' - Edges', compression)]
+        elif export_format == 'gexf':
+            return [file_name + '.gexf']
+        elif export_format == 'parquet':
+            return [file_name + ' - Nodes.parquet', file_name + ' - Edges.parquet']
+        elif export_format == 'edgelist':
+            return [file_name + ' - Edge List.npy', file_name + ' - Edge Weights.npy']
+        raise ValueError(f'Unsupported export format: {export_format}, supported are {EXPORT_FORMATS}')
+
+    @staticmethod
+    def get_attribute_type(values):
+        """Returns GEXF type of node attribute with given (distinct) values: long, double, boolean, liststring or string."""
+        value_types = {type(value) for value in values if value is not None}
+        if not value_types:
+            return 'string'
+        if any(issubclass(value_type, (set, frozenset)) for value_type in value_types) and all(issubclass(value_type, (set, frozenset, str)) for value_type in value_types):
+            # Single strings in set attributes (e.g. department of year nodes) are one-element lists
+            return 'liststring'
+        if all(issubclass(value_type, (bool, np.bool_)) for value_type in value_types):
+            return 'boolean'
+        if any(issubclass(value_type, (bool, np.bool_)) for value_type in value_types):
+            return 'string'
+        if all(issubclass(value_type, numbers.Integral) for value_type in value_types):
+            return 'long'
+        if all(issubclass(value_type, numbers.Real) for value_type in value_types):
+            return 'double'
+        return 'string'
+
+    @staticmethod
+    def to_list(value):
+        """Returns sorted list of set attribute value (string is one-element list, empty string or None empty list)."""
+        if isinstance(value, (set, frozenset)):
+            return sorted(str(item) for item in value)
+        return [value] if value else []
+
+    @staticmethod
+    def export_gexf(nodes, edges, file_path):
+        """Writes network to GEXF 1.2 file, nodes and edges are written in blocks as they are formatted."""
+        attribute_types = [GraphExportUtils.get_attribute_type(values) for values in nodes.values]
+        edge_types = set(edges.types)
+        default_edge_type = edges.types[0] if len(edge_types) == 1 else 'undirected'
+
+        with open(file_path, 'w', encoding='utf8') as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            f.write('<gexf xmlns="http://www.gexf.net/1.2draft" version="1.2">\n')
+            f.write(f'  <graph mode="static" defaultedgetype={quoteattr(default_edge_type)}>\n')
+            f.write('    <attributes class="node">\n')
+            for attribute_index, (attribute_name, attribute_type) in enumerate(zip(nodes.attribute_names, attribute_types)):
+                f.write(f'      <attribute id="{attribute_index}" title={quoteattr(attribute_name)} type="{attribute_type}"/>\n')
+            f.write('    </attributes>\n')
+
+            # Each distinct attribute value is formatted once, nodes only look up formatted values by code
+            column_attvalues = [[GraphExportUtils._format_attvalue(attribute_index, value, attribute_type) for value in values]
+                                for attribute_index, (values, attribute_type) in enumerate(zip(nodes.values, attribute_types))]
+            label_columns = [nodes.attribute_names.index(attribute_name) for attribute_name in GEXF_LABEL_ATTRIBUTES if attribute_name in nodes.attribute_names]
+            f.write('    <nodes>\n')
+            for start in range(0, len(nodes), GEXF_BLOCK_SIZE):
+                rows = []
+                for index in range(start, min(start + GEXF_BLOCK_SIZE, len(nodes))):
+                    node_id = nodes.ids[index]
+                    label = next((nodes.values[column_index][nodes.columns[column_index][index]] for column_index in label_columns
+                                  if nodes.values[column_index][nodes.columns[column_index][index]]), node_id)
+                    attvalues = ''.join([attvalues[column[index]] for attvalues, column in zip(column_attvalues, nodes.columns)])
+                    rows.append(f'      <node id="{node_id}" label={quoteattr(str(label))}><attvalues>{attvalues}</attvalues></node>\n')
+                f.write(''.join(rows))
+            f.write('    </nodes>\n')
+
+            f.write('    <edges>\n')
+            if len(edge_types) > 1:
+                edge_format = '      <edge id="{}" source="{}" target="{}" type="{}" weight="{}"/>\n'
+                for start in range(0, len(edges), GEXF_BLOCK_SIZE):
+                    end = start + GEXF_BLOCK_SIZE
+                    types = map(edges.types.__getitem__, edges.type_codes[start:end])
+                    f.write(''.join(map(edge_format.format, edges.ids[start:end], edges.sources[start:end], edges.targets[start:end], types, edges.weights[start:end])))
+            else:
+                edge_format = '      <edge id="{}" source="{}" target="{}" weight="{}"/>\n'
+                for start in range(0, len(edges), GEXF_BLOCK_SIZE):
+                    end = start + GEXF_BLOCK_SIZE
+                    f.write(''.join(map(edge_format.format, edges.ids[start:end], edges.sources[start:end], edges.targets[start:end], edges.weights[start:end])))
+            f.write('    </edges>\n')
+            f.write('  </graph>\n')
+            f.write('</gexf>\n')
+        return file_path
+
+    @staticmethod
+    def export_parquet(nodes, edges, nodes_file_path, edges_file_path):
+        """Writes nodes and edges to Parquet tables, with same column names as csv export."""
+        if pyarrow is None:
+            raise ImportError('Parquet export requires pyarrow package (pip install pyarrow)')
+        node_columns = [pyarrow.array(np.frombuffer(nodes.ids, dtype=np.int64))]
+        for values, column in zip(nodes.values, nodes.columns):
+            # Distinct values are converted once and expanded to all nodes by their codes
+            distinct_values = GraphExportUtils._to_parquet_values(values)
+            node_columns.append(distinct_values.take(pyarrow.array(np.frombuffer(column, dtype=np.int32))))
+        pyarrow.parquet.write_table(pyarrow.Table.from_arrays(node_columns, names=['Id'] + nodes.attribute_names), nodes_file_path)
+
+        edge_columns = [
+            pyarrow.array(np.frombuffer(edges.ids, dtype=np.int64)),
+            pyarrow.array(np.frombuffer(edges.sources, dtype=np.int64)),
+            pyarrow.array(np.frombuffer(edges.targets, dtype=np.int64)),
+            pyarrow.DictionaryArray.from_arrays(pyarrow.array(np.frombuffer(edges.type_codes, dtype=np.int8)), pyarrow.array(edges.types, type=pyarrow.string())),
+            pyarrow.array(np.frombuffer(edges.weights, dtype=np.float64 if edges.weights.typecode == 'd' else np.int64)),
+        ]
+        pyarrow.parquet.write_table(pyarrow.Table.from_arrays(edge_columns, names=edges.header), edges_file_path)
+        return nodes_file_path, edges_file_path
+
+    @staticmethod
+    def export_edge_list(edges, edges_file_path, weights_file_path):
+        """
+        Writes edges as .npy arrays that can be loaded with np.load(file_path, mmap_mode='r'): n x 2 int32 array of sources and targets
+        (node ids, same as in nodes export) and array of weights (int32, or float64 for fractional weights).
+        """
+        sources = np.frombuffer(edges.sources, dtype=np.int64)
+        targets = np.frombuffer(edges.targets, dtype=np.int64)
+        if len(sources) and max(sources.max(), targets.max()) > np.iinfo(np.int32).max:
+            raise ValueError('Node ids do not fit into int32 edge list')
+        edge_list = np.empty((len(sources), 2), dtype=np.int32)
+        edge_list[:, 0] = sources
+        edge_list[:, 1] = targets
+        np.save(edges_file_path, edge_list)
+        if edges.weights.typecode == 'd':
+            np.save(weights_file_path, np.frombuffer(edges.weights, dtype=np.float64))
+        else:
+            np.save(weights_file_path, np.frombuffer(edges.weights, dtype=np.int64).astype(np.int32))
+        return edges_file_path, weights_file_path
+
+    @staticmethod
+    def _format_attvalue(attribute_index, value, attribute_type):
+        """Returns GEXF attvalue element of value (empty for missing values)."""
+        if attribute_type == 'liststring':
+            value = GEXF_LIST_SEPARATOR.join(GraphExportUtils.to_list(value))
+        elif value is None or (attribute_type != 'string' and value == ''):
+            return ''
+        elif attribute_type == 'boolean':
+            value = 'true' if value else 'false'
+        return f'<attvalue for="{attribute_index}" value={quoteattr(str(value))}/>'
+
+    @staticmethod
+    def _to_parquet_values(values):
+        """Returns typed pyarrow array of distinct attribute values."""
+        attribute_type = GraphExportUtils.get_attribute_type(values)
+        if attribute_type == 'liststring':
+            return pyarrow.array([GraphExportUtils.to_list(value) for value in values], type=pyarrow.list_(pyarrow.string()))
+        elif attribute_type == 'long':
+            return pyarrow.array([int(value) if value is not None else None for value in values], type=pyarrow.int64())
+        elif attribute_type == 'double':
+            return pyarrow.array([float(value) if value is not None else None for value in values], type=pyarrow.float64())
+        elif attribute_type == 'boolean':
+            return pyarrow.array([bool(value) if value is not None else None for value in values], type=pyarrow.bool_())
+        return pyarrow.array([str(value) if value is not None else None for value in values], type=pyarrow.string())
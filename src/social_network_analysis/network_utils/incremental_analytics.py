@@ -0,0 +1,83 @@
+import os
+import pickle
+
+# Saved states stored in different format version are ignored
+ANALYTICS_STATE_FORMAT_VERSION = 1
+
+# Centralities kept in analytics state
+CENTRALITY_NAMES = ['degree_centrality', 'closeness_centrality', 'betweenness_centrality', 'eigenvector_centrality']
+
+
+class AnalyticsState():
+    """
+    Graph (node keys and edges between them) and centralities of analysed network, kept between runs for incremental analysis.
+    Nodes are identified by keys built from node attributes, because node ids can change between runs.
+    Comparing state of previous run with current network gives nodes whose shortest paths could have changed:
+    nodes of connected components that contain added nodes or end nodes of added/removed edges.
+    """
+
+    def __init__(self, node_keys, edges, centralities=None):
+        # node id -> node key, in current network
+        self.node_keys = node_keys
+        # set of edges as (node key, node key) tuples, with smaller key first
+        self.edges = edges
+        # centrality name -> dictionary node key -> value
+        self.centralities = centralities or dict()
+
+    @staticmethod
+    def from_network(network, network_arrays):
+        """Creates state of network's graph, without centralities. Returns None if node keys are not unique."""
+        node_keys = network.get_node_keys()
+        if len(set(node_keys.values())) != len(node_keys):
+            return None
+        edges = set()
+        for source, target in zip(network_arrays.sources.tolist(), network_arrays.targets.tolist()):
+            source_key, target_key = node_keys[source], node_keys[target]
+            edges.add((source_key, target_key) if source_key <= target_key else (target_key, source_key))
+        return AnalyticsState(node_keys, edges)
+
+    @staticmethod
+    def load(file_path):
+        """Returns state saved in given file, or None if there is no valid saved state."""
+        if not os.path.isfile(file_path):
+            return None
+        try:
+            with open(file_path, 'rb') as f:
+                content = pickle.load(f)
+        except Exception as e:
+            print(e)
+            return None
+        if content.get('version') != ANALYTICS_STATE_FORMAT_VERSION:
+            return None
+        return AnalyticsState(dict(enumerate(content['node_keys'])), content['edges'], content['centralities'])
+
+    def save(self, file_path):
+        os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+        content = {
+            'version': ANALYTICS_STATE_FORMAT_VERSION,
+            'node_keys': list(self.node_keys.values()),
+            'edges': self.edges,
+            'centralities': self.centralities,
+        }
+        temporary_path = file_path + '.tmp'
+        with open(temporary_path, 'wb') as f:
+            pickle.dump(content, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, file_path)
+
+    def set_centralities(self, centralities):
+        """Stores centralities given as dictionary centrality name -> dictionary node id -> value."""
+        self.centralities = {name: {self.node_keys[node]: value for node, value in values.items()} for name, values in centralities.items()}
+
+    def get_centrality(self, name, node_key, default=None):
+        return self.centralities[name].get(node_key, default)
+
+    def number_of_nodes(self):
+        return len(self.node_keys)
+
+    def get_changed_nodes(self, previous_state):
+        """Returns set of node ids (of current network) that were added or are end nodes of edges added or removed since previous state."""
+        previous_node_keys = set(previous_state.node_keys.values())
+        changed_keys = set()
+        for edge in self.edges.symmetric_difference(previous_state.edges):
+            changed_keys.update(edge)
+        return {node for node, node_key in self.node_keys.items() if node_key in changed_keys or node_key not in previous_node_keys}
@@ -1,15 +1,29 @@
 import csv
 import os
 import io
+import hashlib
+import numpy as np
+from array import array
 import networkx as nx
 from enum import Enum
 from abc import ABC, abstractmethod
-from collections import OrderedDict 
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .centrality import CentralityUtils
+from .sparse_analytics import SparseGraph
+from .incremental_analytics import AnalyticsState
+from .csv_export import CsvExportUtils
+from .graph_export import GraphExportUtils
+from .analytics_report import AnalyticsReportUtils
+from ..profiling import profile_stage
+from .settings import ANALYSIS_MODE, SAMPLE_SIZE, ERROR_BOUND, CONFIDENCE, RANDOM_SEED, CENTRALITY_WORKERS, ANALYTICS_BACKEND, EIGENVECTOR_MAX_ITER, EIGENVECTOR_TOLERANCE, EIGENVECTOR_PER_COMPONENT
 
 class Node():
     """
     Class representing node in a graph. Node can have many attributes (storred in a dictionary).
     """
+    __slots__ = ('id', 'attributes')
     autoincrement = 1
 
     def __init__(self, attributes, id = None):
@@ -47,16 +61,31 @@ class EdgeType(Enum):
     DIRECTED = 'directed'
 
 
+class AnalysisMode(Enum):
+    EXACT = 'exact'
+    SAMPLED = 'sampled'
+    ADAPTIVE = 'adaptive'
+
+
+class AnalyticsBackend(Enum):
+    NETWORKX = 'networkx'
+    SPARSE = 'sparse'
+
+
 class Edge():
     """
     Class representing link between two nodes in a graph.
     """
+    __slots__ = ('id', 'source', 'target', 'type', 'weight')
     autoincrement = 1
     header = ['Id',	'Source', 'Target', 'Type',	'Weight']
     
-    def __init__(self, source, target, edge_type, weight=1):
-        self.id = Node.autoincrement
-        Node.autoincrement += 1
+    def __init__(self, source, target, edge_type, weight=1, id=None):
+        if id:
+            self.id = id
+        else:
+            self.id = Node.autoincrement
+            Node.autoincrement += 1
         self.source = source
         self.target = target
         self.type = edge_type
@@ -78,13 +107,142 @@ class Edge():
             return full_file_path
 
 
+class NodeStore():
+    """
+    Columnar storage of network's nodes: typed array of node ids and one column per attribute.
+    Attribute values are interned - each distinct (hashable) value is stored once and columns keep only integer codes of values.
+    Nodes are added as attribute dictionaries and read back as Node objects, so store can be used in place of list of nodes.
+    """
+
+    def __init__(self, attribute_names):
+        self.attribute_names = list(attribute_names)
+        self.ids = array('q')
+        self.columns = [array('i') for _ in self.attribute_names]
+        self.values = [[] for _ in self.attribute_names]
+        self.codes = [dict() for _ in self.attribute_names]
+
+    def add(self, attributes, id=None):
+        """Adds node with given attributes (hashable values) and returns its id. Id is generated if not provided."""
+        if not id:
+            id = Node.autoincrement
+            Node.autoincrement += 1
+        self.ids.append(id)
+        for column_index, attribute_name in enumerate(self.attribute_names):
+            self.columns[column_index].append(self._intern(column_index, attributes[attribute_name]))
+        return id
+
+    def set_attributes(self, index, attributes):
+        """Replaces attributes of node at given position in store."""
+        for column_index, attribute_name in enumerate(self.attribute_names):
+            self.columns[column_index][index] = self._intern(column_index, attributes[attribute_name])
+
+    def get_attributes(self, index):
+        return {attribute_name: self.values[column_index][self.columns[column_index][index]] for column_index, attribute_name in enumerate(self.attribute_names)}
+
+    def get_column(self, attribute_name):
+        """Returns list of given attribute's values for all nodes."""
+        column_index = self.attribute_names.index(attribute_name)
+        values = self.values[column_index]
+        return [values[code] for code in self.columns[column_index]]
+
+    def _intern(self, column_index, value):
+        codes = self.codes[column_index]
+        try:
+            code = codes.get(value)
+        except TypeError:
+            # Unhashable values (e.g. sets) are stored without interning
+            self.values[column_index].append(value)
+            return len(self.values[column_index]) - 1
+        if code is None:
+            code = len(self.values[column_index])
+            codes[value] = code
+            self.values[column_index].append(value)
+        return code
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        return Node(self.get_attributes(index), id=self.ids[index])
+
+    def __iter__(self):
+        for index in range(len(self.ids)):
+            yield self[index]
+
+
+class EdgeStore():
+    """
+    Columnar storage of network's edges: typed arrays of edge ids, sources, targets and weights, and interned edge types.
+    Weights are integers by default, 'd' weight typecode stores fractional weights.
+    """
+    header = Edge.header
+
+    def __init__(self, weight_typecode='q'):
+        self.ids = array('q')
+        self.sources = array('q')
+        self.targets = array('q')
+        self.weights = array(weight_typecode)
+        self.type_codes = array('b')
+        self.types = []
+
+    def add(self, source, target, edge_type, weight=1):
+        """Adds edge and returns its position in store (used for updating weight)."""
+        self.ids.append(Node.autoincrement)
+        Node.autoincrement += 1
+        self.sources.append(source)
+        self.targets.append(target)
+        self.weights.append(weight)
+        if edge_type not in self.types:
+            self.types.append(edge_type)
+        self.type_codes.append(self.types.index(edge_type))
+        return len(self.ids) - 1
+
+    def extend(self, sources, targets, edge_type, weights=None):
+        """Adds many edges of same type at once (e.g. from sparse projection). Weights are 1 if not given."""
+        number_of_edges = len(sources)
+        self.ids.extend(range(Node.autoincrement, Node.autoincrement + number_of_edges))
+        Node.autoincrement += number_of_edges
+        self.sources.extend(sources)
+        self.targets.extend(targets)
+        self.weights.extend(weights if weights is not None else [1] * number_of_edges)
+        if edge_type not in self.types:
+            self.types.append(edge_type)
+        self.type_codes.extend([self.types.index(edge_type)] * number_of_edges)
+
+    def increment_weight(self, index, amount=1):
+        self.weights[index] += amount
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        return Edge(self.sources[index], self.targets[index], self.types[self.type_codes[index]], self.weights[index], id=self.ids[index])
+
+    def __iter__(self):
+        for index in range(len(self.ids)):
+            yield self[index]
+
+
+# Compact representation of network: integer arrays of node ids, edge sources and targets, and edge weights
+NetworkArrays = namedtuple('NetworkArrays', ['node_ids', 'sources', 'targets', 'weights'])
+
+
 class Network(ABC):
-    """Class representing social network that consists of nodes and edges connecting those nodes."""
+    """
+    Class representing social network that consists of nodes and edges connecting those nodes.
+    Network is lazy: nodes are created on first access to nodes and edges on first access to edges (e.g. by export or analysis),
+    so creating network object is cheap and callers that need only nodes (e.g. number of nodes) never create edges.
+    """
+
+    # Node attributes that identify node between runs, when node ids can change (None uses all attributes)
+    node_key_attributes = None
     
     @abstractmethod
     def __init__(self):
-        self.nodes = None
-        self.edges = None
+        self._nodes = None
+        self._edges = None
+        self._nodes_created = False
+        self._edges_created = False
 
     @abstractmethod
     def create_nodes(self):
@@ -94,64 +252,281 @@ class Network(ABC):
     def create_edges(self):
         pass
 
-    def export_network_to_csv(self, path, file_name):
-        """Exports notwork's nodes and grapsh to separate csv files."""
+    @property
+    def nodes(self):
+        if not self._nodes_created:
+            self._nodes_created = True
+            with profile_stage('create nodes'):
+                self.create_nodes()
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, nodes):
+        self._nodes = nodes
+
+    @property
+    def edges(self):
+        if not self._edges_created:
+            # Edges reference nodes created by create_nodes
+            self.nodes
+            self._edges_created = True
+            with profile_stage('create edges'):
+                self.create_edges()
+        return self._edges
+
+    @edges.setter
+    def edges(self, edges):
+        self._edges = edges
+
+    def materialize(self):
+        """Creates nodes and edges of network, if they are not already created."""
+        self.edges
+        return self
+
+    def number_of_nodes(self):
+        return len(self.nodes) if self.nodes is not None else 0
+
+    def number_of_edges(self):
+        return len(self.edges) if self.edges is not None else 0
+
+    def iter_nodes(self):
+        """Iterates over nodes, Node objects are created one at a time from columnar store."""
+        return iter(self.nodes or [])
+
+    def iter_edges(self):
+        """Iterates over edges, Edge objects are created one at a time from columnar store."""
+        return iter(self.edges or [])
+
+    def to_arrays(self):
+        """Returns compact representation of network (NetworkArrays), that can be ingested in bulk by analytics."""
+        return NetworkArrays(
+            node_ids=np.array(self.nodes.ids, dtype=np.int64),
+            sources=np.array(self.edges.sources, dtype=np.int64),
+            targets=np.array(self.edges.targets, dtype=np.int64),
+            weights=np.array(self.edges.weights, dtype=np.float64))
+
+    def get_node_attributes(self):
+        """Returns dictionary node id -> node's attributes dictionary."""
+        return {node_id: self.nodes.get_attributes(index) for index, node_id in enumerate(self.nodes.ids)}
+
+    def get_node_keys(self):
+        """Returns dictionary node id -> key (string built from node key attributes) that identifies node between runs."""
+        node_keys = dict()
+        for node_id, attributes in self.get_node_attributes().items():
+            if self.node_key_attributes is not None:
+                attributes = {name: attributes[name] for name in self.node_key_attributes}
+            node_keys[node_id] = Network._get_attributes_key(attributes)
+        return node_keys
+
+    def get_digest(self):
+        """
+        Returns hash of network's content (node attributes and edges between them), which does not depend on node and edge ids
+        or on order in which nodes and edges were created, so it can be compared between runs.
+        """
+        node_keys = {node_id: Network._get_attributes_key(attributes) for node_id, attributes in self.get_node_attributes().items()}
+        edge_keys = []
+        for edge in self.edges:
+            source, target = node_keys[edge.source], node_keys[edge.target]
+            if edge.type == EdgeType.UNDIRRECTED.value and target < source:
+                source, target = target, source
+            edge_keys.append(repr((source, target, edge.type, edge.weight)))
+        digest = hashlib.sha256()
+        for key in sorted(node_keys.values()) + sorted(edge_keys):
+            digest.update(key.encode('utf-8'))
+            digest.update(b'\n')
+        return digest.hexdigest()
+
+    @staticmethod
+    def _get_attributes_key(attributes):
+        return repr([(name, sorted(value, key=repr) if isinstance(value, (set, frozenset)) else value) for name, value in attributes.items()])
+
+    def export_network(self, path, file_name, export_format='csv', compression=None, parallel_writers=True):
+        """
+        Exports network in given format (see graph_export.EXPORT_FORMATS), compression and parallel writers apply to csv export.
+        Other formats are exported from columnar nodes and edges (NodeStore and EdgeStore).
+        """
+        if export_format == 'csv':
+            self.export_network_to_csv(path, file_name, compression, parallel_writers)
+            return
+        print(f'Exporting network {file_name} to {export_format}...')
+        try:
+            file_paths = [os.path.join(path, export_file_name) for export_file_name in GraphExportUtils.get_file_names(file_name, export_format)]
+            if export_format == 'gexf':
+                GraphExportUtils.export_gexf(self.nodes, self.edges, *file_paths)
+            elif export_format == 'parquet':
+                GraphExportUtils.export_parquet(self.nodes, self.edges, *file_paths)
+            elif export_format == 'edgelist':
+                GraphExportUtils.export_edge_list(self.edges, *file_paths)
+        except Exception as e:
+            print(e)
+
+    def export_network_to_csv(self, path, file_name, compression=None, parallel_writers=True):
+        """
+        Exports notwork's nodes and grapsh to separate csv files, optionally compressed ('gzip' or 'zstd').
+        With parallel writers, nodes and edges files are written concurrently.
+        """
         print(f'Exporting network {file_name}(nodes and edges) to csv...')
-        self._export_nodes_to_csv(path, file_name + ' - Nodes')
-        self._export_edges_to_csv(path, file_name + ' - Edges')
+        # Nodes and edges are created before writers are started, since lazy network is not thread safe
+        self.materialize()
+        if not parallel_writers:
+            self._export_nodes_to_csv(path, file_name + ' - Nodes', compression)
+            self._export_edges_to_csv(path, file_name + ' - Edges', compression)
+            return
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            executor.submit(self._export_nodes_to_csv, path, file_name + ' - Nodes', compression)
+            executor.submit(self._export_edges_to_csv, path, file_name + ' - Edges', compression)
 
-    def _export_nodes_to_csv(self, path, file_name):
+    def _export_nodes_to_csv(self, path, file_name, compression=None):
         try:
-            Node.export_to_csv(self.nodes, path, file_name)
+            if isinstance(self.nodes, NodeStore):
+                CsvExportUtils.export_nodes(self.nodes, os.path.join(path, CsvExportUtils.get_file_name(file_name, compression)), compression)
+            else:
+                Node.export_to_csv(self.nodes, path, file_name)
             return True
         except Exception as e:
             print(e)
             return False
 
-    def _export_edges_to_csv(self, path, file_name):
+    def _export_edges_to_csv(self, path, file_name, compression=None):
         try:
-            Edge.export_to_csv(self.edges, path, file_name)
+            if isinstance(self.edges, EdgeStore):
+                CsvExportUtils.export_edges(self.edges, os.path.join(path, CsvExportUtils.get_file_name(file_name, compression)), compression)
+            else:
+                Edge.export_to_csv(self.edges, path, file_name)
             return True
         except Exception as e:
             print(e)
             return False
 
 
+class StoredNetwork(Network):
+    """Network restored from its node and edge stores (e.g. from result cache), without dataset it was created from."""
+
+    def __init__(self, nodes, edges, node_key_attributes=None):
+        super().__init__()
+        self.nodes = nodes
+        self.edges = edges
+        self.node_key_attributes = node_key_attributes
+        self._nodes_created = True
+        self._edges_created = True
+
+    def create_nodes(self):
+        pass
+
+    def create_edges(self):
+        pass
+
+
 class NetworkAnalytics():
     """Class that calculates various network's metrics using networx module."""
 
     def __init__(self, network, network_name=""):
         self.network_name = network_name
+        self.network = network
         self.metrics = OrderedDict()
+        # Graph is created in bulk from network's compact representation, node attributes stay in network and are only read for report
+        self.network_arrays = network.to_arrays()
         self.G = nx.Graph(name=network_name)
-        for node in network.nodes:
-            self.G.add_node(node.id, attributes=node.attributes)
-        for edge in network.edges:
-            self.G.add_edge(edge.source, edge.target, weight=edge.weight)
+        self.G.add_nodes_from(self.network_arrays.node_ids.tolist())
+        self.G.add_weighted_edges_from(zip(self.network_arrays.sources.tolist(), self.network_arrays.targets.tolist(), self.network_arrays.weights.tolist()))
 
-    def export_metrics_to_file(self, path):
-        """Exports Network Analysis calculated metrics and data to file."""
+    def export_metrics_to_file(self, path, node_metrics_formats=()):
+        """
+        Exports Network Analysis calculated metrics and data to file, report is written to file as it is generated.
+        With node metrics formats ('csv', 'json'), attributes and centralities of every node are also exported to structured files.
+        """
         print(f'Exporting analysis for {self.network_name}...')
         full_file_path = os.path.join(path, self.network_name + ' - Analytics') + '.txt'
         with io.open(full_file_path, 'w', encoding="utf8") as f:
-            f.write(self.__repr__())
+            AnalyticsReportUtils.write_report(f, self.metrics, AnalyticsReportUtils.iter_nodes(self.network.nodes, self.G))
+        for node_metrics_format in node_metrics_formats:
+            self.export_node_metrics(path, node_metrics_format)
+        return full_file_path
+
+    def export_node_metrics(self, path, node_metrics_format='csv'):
+        """Exports attributes and calculated metrics of every node to csv or json file."""
+        full_file_path = os.path.join(path, AnalyticsReportUtils.get_node_metrics_file_name(self.network_name, node_metrics_format))
+        node_rows = AnalyticsReportUtils.iter_nodes(self.network.nodes, self.G)
+        if node_metrics_format == 'csv':
+            attribute_names = self.network.nodes.attribute_names if self.network.nodes is not None else []
+            # Metrics in order of their first occurrence (nodes that were not analysed have no metrics)
+            metric_names = list(OrderedDict.fromkeys(name for _, node_metrics in self.G.nodes.data() for name in node_metrics))
+            with io.open(full_file_path, 'w', encoding="utf8", newline='') as f:
+                AnalyticsReportUtils.write_node_metrics_csv(f, attribute_names, metric_names, node_rows)
+        else:
+            with io.open(full_file_path, 'w', encoding="utf8") as f:
+                AnalyticsReportUtils.write_node_metrics_json(f, node_rows)
         return full_file_path
 
-    def run_analysis(self):
-        """Calculates various network's metrics and saves it into metrics dicitonary. Returns dictionary with calculated metrics."""
+    def get_results(self):
+        """Returns calculated metrics and dictionary node id -> node's calculated centralities, e.g. for storing results in cache."""
+        return self.metrics, {node: dict(node_metrics) for node, node_metrics in self.G.nodes.data()}
+
+    def set_results(self, metrics, node_metrics):
+        """Sets results returned by get_results (e.g. from cache) instead of running analysis."""
+        self.metrics = OrderedDict(metrics)
+        nx.set_node_attributes(self.G, node_metrics)
+
+    def run_analysis(self, mode=ANALYSIS_MODE, sample_size=SAMPLE_SIZE, error_bound=ERROR_BOUND, confidence=CONFIDENCE, seed=RANDOM_SEED, workers=CENTRALITY_WORKERS, backend=ANALYTICS_BACKEND, state_path=None,
+                     eigenvector_max_iter=EIGENVECTOR_MAX_ITER, eigenvector_tol=EIGENVECTOR_TOLERANCE, eigenvector_per_component=EIGENVECTOR_PER_COMPONENT):
+        """
+        Calculates various network's metrics and saves it into metrics dicitonary. Returns dictionary with calculated metrics.
+        Betweenness and closeness centralities are calculated according to analysis mode:
+        exact, sampled (sample_size pivots) or adaptive (pivots derived from error_bound and confidence).
+        With more than one worker, their source nodes are split across worker processes.
+        Sparse backend calculates density, components, degree, closeness and eigenvector centrality on CSR adjacency matrix 
+        with vectorized NumPy/SciPy routines instead of networkx.
+        Eigenvector centrality never aborts analysis: if power iteration does not converge, connected components are calculated separately
+        and number of iterations is recorded in metrics.
+        With state path in exact mode, graph and centralities are saved for next run, and if state of previous run exists, 
+        closeness and betweenness are recalculated only in connected components that changed since then 
+        and eigenvector centrality iteration starts from previous vector.
+        """
 
         print(f'Running network analysis for {self.network_name}...')
 
+        backend = AnalyticsBackend(backend)
+        sparse_graph = SparseGraph.from_arrays(self.network_arrays) if backend == AnalyticsBackend.SPARSE else None
+
         self.metrics['Info'] = nx.info(self.G)
+        self.metrics['Analytics backend'] = backend.value
+
+        with profile_stage('density and components'):
+            if sparse_graph:
+                self.metrics["Network density"] = sparse_graph.density()
+                self.metrics["Network components"] = sparse_graph.number_of_components()
+            else:
+                self.metrics["Network density"] = nx.density(self.G)
+                self.metrics["Network components"] = len(list(nx.connected_components(self.G)))
 
-        self.metrics["Network density"] = nx.density(self.G)
-        self.metrics["Network components"] = len(list(nx.connected_components(self.G)))
+        # State of previous run, for incremental analysis
+        current_state = None
+        previous_state = None
+        if state_path and AnalysisMode(mode) == AnalysisMode.EXACT:
+            current_state = AnalyticsState.from_network(self.network, self.network_arrays)
+            if current_state and len(self.G) > 2:
+                previous_state = AnalyticsState.load(state_path)
+            if previous_state and previous_state.number_of_nodes() <= 2:
+                previous_state = None
 
         # Calculating centrality metrics
-        degree_centrality_dict = nx.degree_centrality(self.G) 
-        closeness_centrality_dict = nx.closeness_centrality(self.G)
-        betweenness_centrality_dict = nx.betweenness_centrality(self.G)
-        eigenvector_centrality_dict = nx.eigenvector_centrality(self.G)
+        with profile_stage('degree centrality'):
+            if sparse_graph:
+                degree_centrality_dict = sparse_graph.degree_centrality()
+            else:
+                degree_centrality_dict = nx.degree_centrality(self.G) 
+        if previous_state:
+            closeness_centrality_dict, betweenness_centrality_dict = self._update_path_centralities(current_state, previous_state, workers)
+        else:
+            closeness_centrality_dict, betweenness_centrality_dict = self._calculate_path_centralities(mode, sample_size, error_bound, confidence, seed, workers, sparse_graph)
+        eigenvector_start = self._get_eigenvector_start(current_state, previous_state) if previous_state else None
+        with profile_stage('eigenvector centrality'):
+            if sparse_graph:
+                eigenvector_result = sparse_graph.eigenvector_centrality(eigenvector_max_iter, eigenvector_tol, eigenvector_start, eigenvector_per_component)
+            else:
+                eigenvector_result = CentralityUtils.eigenvector_centrality(self.G, eigenvector_max_iter, eigenvector_tol, eigenvector_start, eigenvector_per_component)
+        eigenvector_centrality_dict = eigenvector_result.centrality
+        self.metrics['Eigenvector centrality'] = CentralityUtils.describe_eigenvector_result(eigenvector_result, eigenvector_max_iter, eigenvector_tol)
 
         # Assigning centralities to nodes
         nx.set_node_attributes(self.G, degree_centrality_dict, 'degree_centrality')
@@ -165,30 +540,102 @@ class NetworkAnalytics():
         self.metrics['Average Closeness Centrality'] = sum(closeness_centrality_dict.values()) / number_of_nodes
         self.metrics['Average Betweenness Centrality'] = sum(betweenness_centrality_dict.values()) / number_of_nodes
         self.metrics['Average Eigenvector Centrality'] = sum(eigenvector_centrality_dict.values()) / number_of_nodes
+
+        if current_state:
+            current_state.set_centralities({
+                'degree_centrality': degree_centrality_dict,
+                'closeness_centrality': closeness_centrality_dict,
+                'betweenness_centrality': betweenness_centrality_dict,
+                'eigenvector_centrality': eigenvector_centrality_dict,
+            })
+            current_state.save(state_path)
         
         return self.metrics
 
+    def _update_path_centralities(self, current_state, previous_state, workers):
+        """
+        Recalculates closeness and betweenness centralities only for nodes in connected components that changed since previous state.
+        Shortest paths in other components are the same, so their previous values are only rescaled to the current number of nodes.
+        """
+        self.metrics['Centrality mode'] = AnalysisMode.EXACT.value
+        affected_nodes = set()
+        for node in current_state.get_changed_nodes(previous_state):
+            if node not in affected_nodes:
+                affected_nodes.update(nx.node_connected_component(self.G, node))
+
+        number_of_nodes = len(self.G)
+        previous_number_of_nodes = previous_state.number_of_nodes()
+        closeness_scale = (previous_number_of_nodes - 1) / (number_of_nodes - 1)
+        betweenness_scale = (previous_number_of_nodes - 1) * (previous_number_of_nodes - 2) / ((number_of_nodes - 1) * (number_of_nodes - 2))
+        closeness_centrality_dict = dict()
+        betweenness_centrality_dict = dict()
+        for node, node_key in current_state.node_keys.items():
+            if node not in affected_nodes:
+                closeness_centrality_dict[node] = previous_state.get_centrality('closeness_centrality', node_key) * closeness_scale
+                betweenness_centrality_dict[node] = previous_state.get_centrality('betweenness_centrality', node_key) * betweenness_scale
+        if affected_nodes:
+            with profile_stage('closeness centrality'):
+                closeness_centrality_dict.update(CentralityUtils.closeness_centrality_of_nodes(self.G, affected_nodes, workers))
+            with profile_stage('betweenness centrality'):
+                betweenness_centrality_dict.update(CentralityUtils.component_betweenness_centrality(self.G, affected_nodes, workers))
+        self.metrics['Incremental analysis'] = f'closeness and betweenness recalculated for {len(affected_nodes)} of {number_of_nodes} nodes (changed components)'
+        return closeness_centrality_dict, betweenness_centrality_dict
+
+    def _get_eigenvector_start(self, current_state, previous_state):
+        """Returns previous eigenvector centrality of nodes as starting vector, new nodes start from average previous value."""
+        previous_values = previous_state.centralities['eigenvector_centrality']
+        average_value = sum(previous_values.values()) / len(previous_values)
+        return {node: previous_state.get_centrality('eigenvector_centrality', node_key, average_value) for node, node_key in current_state.node_keys.items()}
+
+    def _calculate_path_centralities(self, mode, sample_size, error_bound, confidence, seed, workers, sparse_graph=None):
+        """
+        Calculates closeness and betweenness centralities in given analysis mode and records mode and error estimate into metrics.
+        Closeness is calculated on sparse graph if provided, betweenness is always calculated with networkx.
+        """
+        mode = AnalysisMode(mode)
+        number_of_nodes = len(self.G)
+        if mode == AnalysisMode.ADAPTIVE:
+            sample_size = CentralityUtils.sample_size_for_error_bound(number_of_nodes, error_bound, confidence)
+
+        if mode == AnalysisMode.EXACT or sample_size >= number_of_nodes:
+            if mode == AnalysisMode.EXACT:
+                self.metrics['Centrality mode'] = mode.value
+            else:
+                self.metrics['Centrality mode'] = f'{mode.value} (sample size covers all {number_of_nodes} nodes, calculated exactly)'
+            with profile_stage('closeness centrality'):
+                if sparse_graph:
+                    closeness_centrality_dict = sparse_graph.closeness_centrality()
+                elif workers == 1:
+                    closeness_centrality_dict = nx.closeness_centrality(self.G)
+                else:
+                    closeness_centrality_dict = CentralityUtils.closeness_centrality(self.G, workers)
+            with profile_stage('betweenness centrality'):
+                if workers == 1:
+                    betweenness_centrality_dict = nx.betweenness_centrality(self.G)
+                else:
+                    betweenness_centrality_dict = CentralityUtils.betweenness_centrality(self.G, workers)
+            return closeness_centrality_dict, betweenness_centrality_dict
+
+        with profile_stage('closeness centrality'):
+            if sparse_graph:
+                closeness_centrality_dict, closeness_pivots = sparse_graph.sampled_closeness_centrality(sample_size, seed)
+            else:
+                closeness_centrality_dict, closeness_pivots = CentralityUtils.sampled_closeness_centrality(self.G, sample_size, seed, workers)
+        # Closeness uses at least one pivot per component, so its error bound is based on number of pivots it actually used
+        # (no pivots are used only when there are no edges, then closeness of every node is exactly 0)
+        betweenness_error = CentralityUtils.error_bound_for_sample_size(number_of_nodes, sample_size, confidence)
+        closeness_error = CentralityUtils.error_bound_for_sample_size(number_of_nodes, closeness_pivots, confidence) if closeness_pivots else 0.0
+        self.metrics['Centrality mode'] = f'{mode.value} (pivots={sample_size}, closeness pivots={closeness_pivots}, seed={seed})'
+        self.metrics['Betweenness centrality error bound'] = f'+/-{betweenness_error} (confidence {confidence})'
+        self.metrics['Closeness centrality error bound'] = f'+/-{closeness_error} x component diameter on average distance (confidence {confidence})'
+        with profile_stage('betweenness centrality'):
+            betweenness_centrality_dict = CentralityUtils.sampled_betweenness_centrality(self.G, sample_size, seed, workers)
+        return closeness_centrality_dict, betweenness_centrality_dict
+
     def __repr__(self):
         """String data format of Network Analysis. Contains general network info, calculated metrics and list of nodes and their attributes."""
         if len(self.metrics) == 0:
-            return self.__class__
-        analytics = ''
-        for metric in self.metrics:
-            if metric == 'Info':
-                # Network general info
-                analytics += '--------- NETWORK GENERAL DATA -----------\n'
-                analytics += f'{self.metrics[metric]} \n'
-                analytics += '--------- NETWORK ANALYSIS DATA -----------\n'
-            else:
-                # Network's calculated metrics
-                analytics += f'{metric}: {self.metrics[metric]} \n'  
-
-        # Printing each separate node and its attributes and metrics
-        analytics += '--------- NETWORK NODES -----------\n'
-        analytics += 'Node Id, Column dicitonary\n'
-        for node in self.G.nodes.data():
-            analytics += str(node[0]) 
-            analytics += ','
-            analytics += str(node[1]) 
-            analytics += '\n'
-        return analytics
\ No newline at end of file
+            return super().__repr__()
+        analytics = io.StringIO()
+        AnalyticsReportUtils.write_report(analytics, self.metrics, AnalyticsReportUtils.iter_nodes(self.network.nodes, self.G))
+        return analytics.getvalue()
@@ -5,27 +5,67 @@ from .department_yearly_network import  DepartmentYearlyNetwork
 from .author_publications_network import AuthorPublicationsNetwork
 from .article_paper_network import ArticlePaperNetwork
 from .publications_yearly_network import PublicationsYearlyNetwork
+from .dataset_index import DatasetIndex
+from .dataset_snapshot import DatasetSnapshot
+from ..profiling import profile_stage
 
 class NetworkFabric:
-    """Produces various social networks for analysis."""
+    """
+    Produces various social networks for analysis.
+    Dataset index (tables of papers, articles, years, departments and faculties) is built once and shared by all networks.
+    With dataset filter (years, faculties, publication types) only matching part of dataset is indexed, so filter is applied
+    before any node or edge is created.
+    Network fabric can be attached to dataset snapshot instead of authors and publications, then it is transferred to other
+    processes (pool workers) only as path of snapshot, and each process attaches to snapshot files itself.
+    """
     
-    def __init__(self, authors, publications):
+    def __init__(self, authors, publications, dataset_filter=None, dataset_index=None):
         self.authors = authors
         self.publications = publications
+        self.snapshot_path = None
+        if dataset_index is not None:
+            self.dataset_index = dataset_index
+        else:
+            with profile_stage('create dataset index'):
+                self.dataset_index = DatasetIndex(authors, publications, dataset_filter)
+
+    @staticmethod
+    def from_snapshot(snapshot_path):
+        """Returns network fabric attached to dataset snapshot (see DatasetSnapshot), without authors and publications."""
+        with profile_stage('attach dataset snapshot'):
+            network_fabric = NetworkFabric(None, None, dataset_index=DatasetSnapshot.load_dataset_index(snapshot_path))
+        network_fabric.snapshot_path = snapshot_path
+        return network_fabric
+
+    def save_snapshot(self, snapshot_path):
+        """Saves dataset index as dataset snapshot, from now on network fabric is transferred to other processes as path of snapshot."""
+        with profile_stage('save dataset snapshot'):
+            DatasetSnapshot.save(self.dataset_index, snapshot_path)
+        self.snapshot_path = snapshot_path
+
+    def __getstate__(self):
+        if self.snapshot_path is not None:
+            return {'snapshot_path': self.snapshot_path}
+        return self.__dict__
+
+    def __setstate__(self, state):
+        if 'dataset_index' not in state:
+            state = NetworkFabric.from_snapshot(state['snapshot_path']).__dict__
+        self.__dict__.update(state)
 
     def get_network(self, network_type):
-        """Creates new network based on provided network type."""
+        """Returns new lazy network of provided network type, its nodes and edges are created when they are first needed."""
         if network_type == 'CoAuthor Network':
-            return CoAuthorNetwork(self.authors, self.publications)
+            return CoAuthorNetwork(self.dataset_index)
         elif network_type == 'Article Network':
-            return ArticleNetwork(self.publications)
+            return ArticleNetwork(self.dataset_index)
         elif network_type == 'Department Network':
-            return DepartmentNetwork(self.authors)
+            return DepartmentNetwork(self.dataset_index)
         elif network_type == 'Department Yearly Network':
-            return DepartmentYearlyNetwork(self.authors)
+            return DepartmentYearlyNetwork(self.dataset_index)
         elif network_type == 'Author Publications Network':
-            return AuthorPublicationsNetwork(self.authors)
+            return AuthorPublicationsNetwork(self.dataset_index)
         elif network_type == 'Article Paper Network':
-            return ArticlePaperNetwork(self.publications)
+            return ArticlePaperNetwork(self.dataset_index)
         elif network_type == 'Publications Yearly Network':
-            return PublicationsYearlyNetwork(self.publications)
\ No newline at end of file
+            return PublicationsYearlyNetwork(self.dataset_index)
\ No newline at end of file
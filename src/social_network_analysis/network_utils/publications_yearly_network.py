@@ -1,66 +1,58 @@
 from ..data_processing.authors_data_processing import Author
-from .network_base import Node, Edge, EdgeType, Network
+from .network_base import NodeStore, EdgeStore, EdgeType, Network
 
 class PublicationsYearlyNetwork(Network):
     """Class for creating Publications Yearly graph, connecting research papers with years when they were published."""
 
-    def __init__(self, publications):
+    def __init__(self, dataset_index):
         super().__init__()
-        self.publications = publications
-        self.create_nodes()
-        self.create_edges()
+        self.dataset_index = dataset_index
 
     def create_node_attribute_template(self):
         return {
             'name': '',
             'node_type': '',
-            'department': set(),
-            'faculty': set()
+            'department': frozenset(),
+            'faculty': frozenset()
         }
 
     def create_nodes(self):
         """Creates nodes for network - research papers (publications) and years."""        
         try:
-            self.nodes = []
+            index = self.dataset_index
+            self.nodes = NodeStore(self.create_node_attribute_template())
             self.years = dict()
             self.papers = dict()
-            for unique_publication_id in self.publications:
-                publication_name = self.publications[unique_publication_id].get_publication_title()
-                year_of_publishing = self.publications[unique_publication_id].get_publication_year()
-                if year_of_publishing not in self.years:
+            for publication_index in range(index.number_of_publications()):
+                title_index = index.publication_title_indices[publication_index]
+                year_index = index.publication_year_indices[publication_index]
+                if year_index not in self.years:
                     # Adding year node
                     attributes = self.create_node_attribute_template()
-                    attributes['name'] = year_of_publishing
+                    attributes['name'] = index.years[year_index]
                     attributes['node_type'] = 'year'
-                    node = Node(attributes)
-                    self.years[year_of_publishing] = node 
-                    self.nodes.append(node)
-                if publication_name not in self.papers:
+                    self.years[year_index] = self.nodes.add(attributes)
+                if title_index not in self.papers:
                     # Adding research paper node (for each faculty and department where )
                     attributes = self.create_node_attribute_template()
-                    attributes['name'] = publication_name
+                    attributes['name'] = index.titles[title_index]
                     attributes['node_type'] = 'publication'
-                    for author in self.publications[unique_publication_id].authors:
-                        attributes['faculty'].add(author.faculty)
-                        attributes['department'].add(author.department)
-                    # Convering set of faculties and departments into string for analysis in Gephi
-                    attributes['faculty'] = str(attributes['faculty'])
-                    attributes['department'] = str(attributes['department'])                    
-                    node = Node(attributes)
-                    self.papers[publication_name] = node 
-                    self.nodes.append(node)
+                    author_indices = index.publication_author_indices[publication_index]
+                    # Sets of faculties and departments are kept as (hashable) sets, exporters write them as sorted lists
+                    attributes['faculty'] = frozenset(index.faculties[index.author_faculty_indices[author_index]] for author_index in author_indices)
+                    attributes['department'] = frozenset(index.departments[index.author_department_indices[author_index]] for author_index in author_indices)
+                    self.papers[title_index] = self.nodes.add(attributes)
         except Exception as e:
             print(e)
             return None
 
     def create_edges(self):
-        """Creates edges (connecting publications with articles if they were published in that article)."""
+        """Creates edges (connecting publications with years when they were published)."""
         try:
-            self.edges = []
-            for unique_publication_id in self.publications:
-                publication_name = self.publications[unique_publication_id].get_publication_title()
-                year_of_publishing = self.publications[unique_publication_id].get_publication_year()    
-                self.edges.append(Edge(source=self.papers[publication_name].id, target=self.years[year_of_publishing].id, edge_type=EdgeType.DIRECTED.value))
+            index = self.dataset_index
+            self.edges = EdgeStore()
+            for title_index, year_index in zip(index.publication_title_indices, index.publication_year_indices):
+                self.edges.add(source=self.papers[title_index], target=self.years[year_index], edge_type=EdgeType.DIRECTED.value)
         except Exception as e:
             print(e)
-            return None
\ No newline at end of file
+            return None
@@ -0,0 +1,39 @@
+
+# Centrality analysis modes:
+#   'exact'    - all-pairs shortest paths (Brandes betweenness, BFS closeness from every node)
+#   'sampled'  - fixed number of pivot (source) nodes
+#   'adaptive' - number of pivots derived from requested error bound and confidence
+ANALYSIS_MODE = 'exact'
+
+# Number of pivots used in sampled mode
+SAMPLE_SIZE = 100
+
+# Maximum absolute error of normalized centrality estimates in adaptive mode
+ERROR_BOUND = 0.05
+
+# Probability that all node estimates are within error bound
+CONFIDENCE = 0.9
+
+# Seed for pivot sampling, so that approximate results are reproducible
+RANDOM_SEED = 42
+
+# Number of processes used for calculating closeness and betweenness centrality of one network (None uses all available cores)
+CENTRALITY_WORKERS = 1
+
+# Backend for density, components, degree, closeness and eigenvector centrality: 'networkx' or 'sparse' (NumPy/SciPy CSR matrix)
+ANALYTICS_BACKEND = 'networkx'
+
+# Maximum number of power iterations and convergence tolerance (per node, L1 norm) of eigenvector centrality
+EIGENVECTOR_MAX_ITER = 100
+EIGENVECTOR_TOLERANCE = 1.0e-6
+
+# Calculating eigenvector centrality of each connected component separately. If False, components are calculated 
+# separately only when iteration on the whole graph does not converge
+EIGENVECTOR_PER_COMPONENT = False
+
+# Name of directory (in output directory) where graphs and centralities of analysed networks are kept for incremental analysis
+ANALYTICS_STATE_DIRECTORY_NAME = '.analytics'
+
+# Weighting CoAuthor network edges by fractional counting: each paper with n authors adds 1/(n-1) to edges between its authors
+# (so that papers with large teams do not dominate), instead of adding 1 per paper
+COAUTHOR_FRACTIONAL_WEIGHTS = False
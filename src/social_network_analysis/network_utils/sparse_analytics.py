@@ -0,0 +1,192 @@
+import math
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+from .centrality import EigenvectorResult
+
+# Maximum number of distance matrix cells calculated at once (rows of BFS sources x number of nodes)
+DISTANCE_BLOCK_SIZE = 2 ** 24
+
+
+class SparseGraph():
+    """
+    Undirected, unweighted graph stored as CSR adjacency matrix.
+    Provides vectorized (NumPy/SciPy) implementations of network metrics, matching results of networkx functions.
+    """
+
+    def __init__(self, node_ids, sources, targets):
+        # Duplicated node ids are merged, keeping order of first occurrence (same as networkx)
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        _, first_occurrences = np.unique(node_ids, return_index=True)
+        node_ids = node_ids[np.sort(first_occurrences)]
+        self.node_ids = node_ids.tolist()
+        number_of_nodes = len(node_ids)
+
+        # Mapping node ids to matrix rows
+        order = np.argsort(node_ids)
+        rows = order[np.searchsorted(node_ids, sources, sorter=order)]
+        columns = order[np.searchsorted(node_ids, targets, sorter=order)]
+
+        # Both directions of every edge, duplicates are merged and only adjacency pattern is kept
+        adjacency = sparse.coo_matrix((np.ones(2 * len(rows)), (np.concatenate([rows, columns]), np.concatenate([columns, rows]))), shape=(number_of_nodes, number_of_nodes)).tocsr()
+        adjacency.sum_duplicates()
+        adjacency.data[:] = 1.0
+        self.adjacency = adjacency
+        self.self_loops = adjacency.diagonal() > 0
+
+    @staticmethod
+    def from_arrays(network_arrays):
+        """Creates sparse graph from network's compact representation (NetworkArrays)."""
+        return SparseGraph(network_arrays.node_ids, network_arrays.sources, network_arrays.targets)
+
+    def number_of_nodes(self):
+        return len(self.node_ids)
+
+    def number_of_edges(self):
+        number_of_self_loops = int(self.self_loops.sum())
+        return (self.adjacency.nnz - number_of_self_loops) // 2 + number_of_self_loops
+
+    def density(self):
+        """Same as nx.density for undirected graph."""
+        number_of_nodes = self.number_of_nodes()
+        if number_of_nodes <= 1:
+            return 0
+        return 2 * self.number_of_edges() / (number_of_nodes * (number_of_nodes - 1))
+
+    def number_of_components(self):
+        return csgraph.connected_components(self.adjacency, directed=False)[0]
+
+    def degree_centrality(self):
+        """Same as nx.degree_centrality, self loops are counted twice."""
+        number_of_nodes = self.number_of_nodes()
+        if number_of_nodes <= 1:
+            return dict.fromkeys(self.node_ids, 1)
+        degrees = np.diff(self.adjacency.indptr) + self.self_loops
+        return self._to_node_dictionary(degrees / (number_of_nodes - 1))
+
+    def eigenvector_centrality(self, max_iter=100, tol=1.0e-6, nstart=None, per_component=False):
+        """
+        Same as CentralityUtils.eigenvector_centrality (power iteration with A + I, as in nx.eigenvector_centrality), 
+        on the whole adjacency matrix at once. Returns EigenvectorResult, iteration starts from nstart (dictionary node id -> value) if provided.
+        Per component calculation iterates all components at once, normalizing each component's part of vector separately.
+        """
+        number_of_nodes = self.number_of_nodes()
+        if number_of_nodes == 0:
+            return EigenvectorResult(dict(), 0, True, 0)
+        start = np.ones(number_of_nodes) if nstart is None else np.array([nstart[node_id] for node_id in self.node_ids], dtype=np.float64)
+        if not per_component:
+            x, iterations, converged = self._power_iteration(start, max_iter, tol, np.zeros(number_of_nodes, dtype=np.int64))
+            if converged:
+                return EigenvectorResult(self._to_node_dictionary(x), iterations, True, 0)
+
+        number_of_components, labels = csgraph.connected_components(self.adjacency, directed=False)
+        x, iterations, converged = self._power_iteration(start, max_iter, tol, labels)
+        component_sizes = np.bincount(labels)
+        x = x * np.sqrt(component_sizes[labels] / number_of_nodes)
+        return EigenvectorResult(self._to_node_dictionary(x), iterations, converged, number_of_components)
+
+    def _power_iteration(self, start, max_iter, tol, labels):
+        """
+        Runs power iteration separately for each group of nodes with same label (connected component), starting from start vector.
+        Returns last vector, number of iterations until all groups converged and whether they converged.
+        """
+        component_sizes = np.bincount(labels)
+        start_sums = np.bincount(labels, weights=start, minlength=len(component_sizes))
+        # Groups with all zero start values start from uniform vector
+        start = np.where(start_sums[labels] != 0, start, 1.0)
+        start_sums = np.bincount(labels, weights=start, minlength=len(component_sizes))
+        x = start / start_sums[labels]
+        for iteration in range(1, max_iter + 1):
+            x_last = x
+            x = x_last + self.adjacency.dot(x_last)
+            norms = np.sqrt(np.bincount(labels, weights=x * x, minlength=len(component_sizes)))
+            norms[norms == 0] = 1
+            x = x / norms[labels]
+            if (np.bincount(labels, weights=np.abs(x - x_last), minlength=len(component_sizes)) < component_sizes * tol).all():
+                return x, iteration, True
+        return x, max_iter, False
+
+    def closeness_centrality(self):
+        """Same as nx.closeness_centrality (Wasserman-Faust improved formula), using BFS from every node in blocks of sources."""
+        return self._closeness_from_sources(np.arange(self.number_of_nodes()))
+
+    def sampled_closeness_centrality(self, sample_size, seed):
+        """
+        Returns closeness centrality estimated from sample_size random pivots (Eppstein-Wang) and number of pivots actually used.
+        Pivots are spread over connected components proportionally to their size (at least one per component), pivots themselves get exact closeness.
+        """
+        number_of_nodes = self.number_of_nodes()
+        closeness = np.zeros(number_of_nodes)
+        if number_of_nodes < 2:
+            return self._to_node_dictionary(closeness), 0
+        generator = np.random.RandomState(seed)
+        labels = csgraph.connected_components(self.adjacency, directed=False)[1]
+        component_sizes = np.bincount(labels)
+        pivots = []
+        for label, component_size in enumerate(component_sizes):
+            if component_size == 1:
+                continue
+            component_nodes = np.flatnonzero(labels == label)
+            component_sample_size = math.ceil(sample_size * component_size / number_of_nodes)
+            if component_sample_size >= component_size:
+                pivots.append(component_nodes)
+            else:
+                pivots.append(generator.choice(component_nodes, component_sample_size, replace=False))
+        if not pivots:
+            return self._to_node_dictionary(closeness), 0
+        pivots = np.concatenate(pivots)
+
+        distance_sums = np.zeros(number_of_nodes)
+        distance_counts = np.zeros(number_of_nodes)
+        pivot_closeness = np.zeros(len(pivots))
+        start = 0
+        for block in self._distance_blocks(pivots):
+            reachable = np.isfinite(block)
+            distances = np.where(reachable, block, 0)
+            distance_sums += distances.sum(axis=0)
+            distance_counts += reachable.sum(axis=0)
+            # Undirected graph, so pivot's distances to others are complete and its closeness is exact
+            pivot_closeness[start:start + len(block)] = self._closeness_of_rows(reachable, distances)
+            start += len(block)
+
+        # Every node is reached from itself when it is pivot, so only other pivots are counted
+        is_pivot = np.zeros(number_of_nodes, dtype=bool)
+        is_pivot[pivots] = True
+        distance_counts -= is_pivot
+        node_component_sizes = component_sizes[labels]
+        estimated = (~is_pivot) & (distance_counts > 0)
+        average_distance = distance_sums[estimated] / distance_counts[estimated]
+        closeness[estimated] = (node_component_sizes[estimated] - 1) / (number_of_nodes - 1) / average_distance
+        closeness[pivots] = pivot_closeness
+        return self._to_node_dictionary(closeness), len(pivots)
+
+    def _closeness_from_sources(self, sources):
+        number_of_nodes = self.number_of_nodes()
+        closeness = np.zeros(len(sources))
+        if number_of_nodes < 2:
+            return dict(zip((self.node_ids[source] for source in sources), closeness.tolist()))
+        start = 0
+        for block in self._distance_blocks(sources):
+            reachable = np.isfinite(block)
+            closeness[start:start + len(block)] = self._closeness_of_rows(reachable, np.where(reachable, block, 0))
+            start += len(block)
+        return dict(zip((self.node_ids[source] for source in sources), closeness.tolist()))
+
+    def _closeness_of_rows(self, reachable, distances):
+        """Returns closeness of BFS sources from their rows of distance matrix (reachable nodes and distances, 0 for unreachable nodes)."""
+        reachable_nodes = reachable.sum(axis=1) - 1
+        total_distance = distances.sum(axis=1)
+        closeness = np.zeros(len(distances))
+        connected = total_distance > 0
+        closeness[connected] = reachable_nodes[connected] ** 2 / total_distance[connected] / (self.number_of_nodes() - 1)
+        return closeness
+
+    def _distance_blocks(self, sources):
+        """Yields BFS distance matrices (unreachable nodes are inf) for consecutive blocks of source nodes."""
+        block_size = max(1, DISTANCE_BLOCK_SIZE // max(1, self.number_of_nodes()))
+        for start in range(0, len(sources), block_size):
+            yield csgraph.shortest_path(self.adjacency, method='D', directed=False, unweighted=True, indices=sources[start:start + block_size])
+
+    def _to_node_dictionary(self, values):
+        return dict(zip(self.node_ids, values.tolist()))
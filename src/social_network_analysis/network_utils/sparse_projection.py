@@ -0,0 +1,29 @@
+import numpy as np
+from scipy import sparse
+
+
+class ProjectionUtils():
+    """
+    Builds one-mode projections of bipartite graphs (e.g. authors and articles) as products of sparse incidence matrices,
+    so that pairs of nodes sharing a neighbour are found by sparse matrix multiplication instead of nested loops.
+    """
+
+    @staticmethod
+    def project(rows, columns, number_of_columns, row_weights=None, binary=True):
+        """
+        Projects incidence matrix M (given as row and column index of each incidence) on its columns, M^T * W * M,
+        where W is diagonal matrix of row weights (all 1 if not given). Duplicated incidences are counted once if matrix is binary.
+        Returns tuple (first columns, second columns, weights) of column pairs sharing at least one row, each pair once (first < second),
+        ordered by first and then by second column.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        columns = np.asarray(columns, dtype=np.int64)
+        number_of_rows = int(rows.max()) + 1 if len(rows) else 0
+        incidence = sparse.csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(number_of_rows, number_of_columns))
+        if binary:
+            incidence.data[:] = 1
+        weighted_incidence = incidence if row_weights is None else sparse.diags(np.asarray(row_weights, dtype=np.float64)) @ incidence
+        projection = sparse.triu(weighted_incidence.T.tocsr() @ incidence, k=1).tocoo()
+        order = np.lexsort((projection.col, projection.row))
+        return projection.row[order], projection.col[order], projection.data[order]
+
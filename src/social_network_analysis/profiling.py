@@ -0,0 +1,95 @@
+# Standart libarry imports
+import os
+import csv
+import sys
+import json
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # resource module is not available on Windows, peak memory is not recorded there
+    resource = None
+
+# Columns of profiling report
+PROFILING_REPORT_COLUMNS = ['stage', 'wall_time_s', 'cpu_time_s', 'peak_rss_mb', 'pid']
+
+
+class Profiler():
+    """
+    Records wall time, CPU time (including finished child processes, e.g. centrality workers) and peak memory (RSS) of pipeline stages.
+    Stages can be nested, nested stage is recorded under name "parent stage / stage". Peak RSS is process's peak at the end of stage.
+    Records from worker processes can be merged, so one report covers the whole run.
+    """
+
+    def __init__(self):
+        self.records = []
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        """Context manager recording one stage of pipeline."""
+        self.stages.append(name)
+        stage_name = ' / '.join(self.stages)
+        start_wall_time = time.perf_counter()
+        start_cpu_time = Profiler._get_cpu_time()
+        try:
+            yield
+        finally:
+            self.records.append({
+                'stage': stage_name,
+                'wall_time_s': time.perf_counter() - start_wall_time,
+                'cpu_time_s': Profiler._get_cpu_time() - start_cpu_time,
+                'peak_rss_mb': Profiler._get_peak_rss_mb(),
+                'pid': os.getpid(),
+            })
+            self.stages.pop()
+
+    def reset(self):
+        """Removes all records, e.g. between benchmark runs."""
+        self.records = []
+
+    def add_records(self, records):
+        """Merges records from other (e.g. worker) process."""
+        self.records.extend(records)
+
+    def export_report(self, path, file_name):
+        """Exports records to JSON and CSV file. Returns paths of both files."""
+        full_file_path = os.path.join(path, file_name)
+        with open(full_file_path + '.json', 'w', encoding='utf8') as f:
+            json.dump({'stages': self.records}, f, indent=2)
+        with open(full_file_path + '.csv', 'w', encoding='utf8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=PROFILING_REPORT_COLUMNS)
+            writer.writeheader()
+            writer.writerows(self.records)
+        return full_file_path + '.json', full_file_path + '.csv'
+
+    def print_report(self):
+        print('--------- PROFILING -----------')
+        for record in self.records:
+            print(f"{record['stage']}: wall {record['wall_time_s']:.3f}s, cpu {record['cpu_time_s']:.3f}s, peak rss {record['peak_rss_mb']} MB")
+
+    @staticmethod
+    def _get_cpu_time():
+        times = os.times()
+        return time.process_time() + times.children_user + times.children_system
+
+    @staticmethod
+    def _get_peak_rss_mb():
+        if resource is None:
+            return None
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+        if sys.platform == 'darwin':
+            return round(peak_rss / (1024 * 1024), 1)
+        return round(peak_rss / 1024, 1)
+
+
+# Profiler of current process, used by all pipeline stages
+profiler = Profiler()
+
+
+def profile_stage(name):
+    """Records stage with profiler of current process."""
+    return profiler.stage(name)
@@ -0,0 +1,89 @@
+# Standart libarry imports
+import os
+import pickle
+import hashlib
+
+# Cached results stored in different format version are ignored
+RESULT_CACHE_FORMAT_VERSION = 1
+
+# Name of result cache directory, created in output directory
+RESULT_CACHE_DIRECTORY_NAME = '.results'
+
+
+class ResultCache():
+    """
+    Content-addressed cache of pipeline results (e.g. created networks and their analytics) stored on disk.
+    Entries are keyed by hash of everything that determines the result (input file hashes, settings, network type),
+    so changed inputs simply produce different keys and stale entries are never read.
+    Total size of cache is bounded: when it is exceeded, least recently used entries are removed (entry's modification time is updated on every read).
+    Layout: <path>/<first 2 characters of key>/<key>.pkl
+    """
+
+    def __init__(self, path, max_size):
+        self.path = path
+        self.max_size = max_size
+
+    @staticmethod
+    def make_key(*parts):
+        """Returns key built from hash of given parts (any values with deterministic repr)."""
+        key_hash = hashlib.sha256(f'v{RESULT_CACHE_FORMAT_VERSION}'.encode('utf-8'))
+        for part in parts:
+            key_hash.update(repr(part).encode('utf-8'))
+            key_hash.update(b'\n')
+        return key_hash.hexdigest()
+
+    def contains(self, key):
+        return os.path.isfile(self._get_entry_path(key))
+
+    def get(self, key):
+        """Returns value stored under key, or None if there is no such entry."""
+        entry_path = self._get_entry_path(key)
+        try:
+            with open(entry_path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(entry_path)
+            return value
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(e)
+            return None
+
+    def put(self, key, value):
+        """Stores value under key and removes least recently used entries if cache is larger than its maximum size."""
+        entry_path = self._get_entry_path(key)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        temporary_path = f'{entry_path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, entry_path)
+        self.evict(keep_key=key)
+
+    def evict(self, keep_key=None):
+        """Removes least recently used entries until cache fits into its maximum size. Entry with keep_key is never removed."""
+        entries = []
+        for directory_path, _, file_names in os.walk(self.path):
+            for file_name in file_names:
+                if not file_name.endswith('.pkl'):
+                    continue
+                try:
+                    entry_stat = os.stat(os.path.join(directory_path, file_name))
+                except FileNotFoundError:
+                    # Removed by other process
+                    continue
+                entries.append((entry_stat.st_mtime, entry_stat.st_size, os.path.join(directory_path, file_name)))
+        total_size = sum(entry_size for _, entry_size, _ in entries)
+        keep_path = self._get_entry_path(keep_key) if keep_key else None
+        for _, entry_size, entry_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            if entry_path == keep_path:
+                continue
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                pass
+            total_size -= entry_size
+
+    def _get_entry_path(self, key):
+        return os.path.join(self.path, key[:2], key + '.pkl')
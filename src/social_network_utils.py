@@ -1,60 +1,244 @@
+# Standard library imports
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
 # Local package imports
 from social_network_analysis.data_processing.authors_data_processing import AuthorUtils
 from social_network_analysis.data_processing.publications_data_processing import PublicationUtils
-from social_network_analysis.network_utils.network_base import NetworkAnalytics
+from social_network_analysis.data_processing.dataset_cache import DatasetCache, CACHE_DIRECTORY_NAME
+from social_network_analysis.data_processing.author_matching import FuzzyAuthorMatcher
+from social_network_analysis.data_processing.dataset_state import DatasetState
+from social_network_analysis.data_processing.settings import AUTHOR_MATCHES_FILE_NAME, DATASET_STATE_FILE_NAME
+from social_network_analysis.data_processing import settings as data_processing_settings
+from social_network_analysis.network_utils.network_base import NetworkAnalytics, StoredNetwork
+from social_network_analysis.network_utils.graph_export import GraphExportUtils
+from social_network_analysis.network_utils.analytics_report import AnalyticsReportUtils
+from social_network_analysis.network_utils.dataset_snapshot import SNAPSHOT_DIRECTORY_NAME
+from social_network_analysis.network_utils.settings import ANALYTICS_STATE_DIRECTORY_NAME
+from social_network_analysis.network_utils import settings as network_settings
+from social_network_analysis.profiling import profiler, profile_stage
+from social_network_analysis.result_cache import ResultCache
+
+# Social networks created and analysed in each run
+SOCIAL_NETWORK_NAMES = [
+    'CoAuthor Network',
+    'Article Network',
+    'Department Network',
+    'Department Yearly Network',
+    'Author Publications Network',
+    'Article Paper Network',
+    'Publications Yearly Network',
+]
+
+# Formats networks are exported to, unless other formats are selected for network
+DEFAULT_EXPORT_FORMATS = ['csv']
 
+# Network fabric of pool worker process, set by worker initializer
+_worker_network_fabric = None
 
-def import_and_clean_dataset(path, authors_file_name, publications_file_name):
-    """Imports specified dataset from a given path, cleans it and returns cleaned set of authors and publications."""
-    all_authors = AuthorUtils.read_all_authors('dataset', authors_file_name)
-    all_publication_records = PublicationUtils.read_all_publications('dataset', publications_file_name)
+def import_and_clean_dataset(path, authors_file_name, publications_file_name, use_cache=False):
+    """
+    Imports specified dataset from a given path, cleans it and returns cleaned set of authors and publications.
+    With cache, excel files are converted once into binary columnar format and loaded from it on subsequent runs.
+    """
+    dataset_cache = DatasetCache(path) if use_cache else None
+    all_authors = AuthorUtils.read_all_authors(path, authors_file_name, dataset_cache)
+    all_publication_records = PublicationUtils.read_all_publications(path, publications_file_name, dataset_cache)
     return (all_authors, all_publication_records)
 
-def process_dataset(all_authors, all_publication_records):
-    """Processes dataset, matches published research papers with all of the coauthors associated with that paper.""" 
-    publications = PublicationUtils.map_publications_with_users(all_publication_records, all_authors)
-    AuthorUtils.update_author_collaborators_and_publications_info(publications)
+def create_fuzzy_author_matcher(path, all_authors):
+    """Creates fuzzy matcher for author names from publications, remembering resolved names in dataset cache directory."""
+    return FuzzyAuthorMatcher(all_authors, cache_file_path=os.path.join(path, CACHE_DIRECTORY_NAME, AUTHOR_MATCHES_FILE_NAME))
+
+def import_and_process_dataset_in_chunks(path, authors_file_name, publications_file_name, chunk_size, use_cache=False, fuzzy_matching=False):
+    """
+    Imports authors and streams publications file (.csv or .xlsx) in chunks, mapping each chunk with authors as it is read.
+    Peak memory is bounded by chunk size instead of size of the whole publications file. Returns authors and processed publications.
+    """
+    dataset_cache = DatasetCache(path) if use_cache else None
+    all_authors = AuthorUtils.read_all_authors(path, authors_file_name, dataset_cache)
+    fuzzy_matcher = create_fuzzy_author_matcher(path, all_authors) if fuzzy_matching else None
+    with profile_stage('import, clean and map publications in chunks'):
+        publication_record_chunks = PublicationUtils.read_publications_in_chunks(path, publications_file_name, chunk_size)
+        publications = PublicationUtils.map_publications_in_chunks(publication_record_chunks, all_authors, fuzzy_matcher)
+    with profile_stage('update collaborators'):
+        AuthorUtils.update_author_collaborators_and_publications_info(publications)
+    return (all_authors, publications)
+
+def import_and_update_dataset_state(path, authors_file_name, publications_file_name, use_cache=False, fuzzy_matching=False, publications_delta=False):
+    """
+    Incremental update mode: loads dataset processed in previous runs and applies only authors and publication rows that are new or changed.
+    Publications file can be either full export, where rows applied before that are no longer in file are retracted, or only new rows 
+    (publications delta, e.g. weekly delta), where rows applied before are kept. Returns dataset state, which should be saved once networks are processed.
+    """
+    dataset_state = DatasetState.load(os.path.join(path, CACHE_DIRECTORY_NAME, DATASET_STATE_FILE_NAME))
+    dataset_cache = DatasetCache(path) if use_cache else None
+    all_authors = AuthorUtils.read_all_authors(path, authors_file_name, dataset_cache)
+    print(f'Added {dataset_state.add_authors(all_authors)} new authors')
+    fuzzy_matcher = create_fuzzy_author_matcher(path, dataset_state.authors) if fuzzy_matching else None
+    all_publication_records = PublicationUtils.read_all_publications(path, publications_file_name, dataset_cache)
+    with profile_stage('apply new publication records'):
+        print(f'Applied {dataset_state.apply_publication_records(all_publication_records, fuzzy_matcher, retract_missing_records=not publications_delta)} new or changed publication records')
+    return dataset_state
+
+def process_dataset(all_authors, all_publication_records, fuzzy_matcher=None):
+    """
+    Processes dataset, matches published research papers with all of the coauthors associated with that paper.
+    Author names that are not matched exactly are resolved with fuzzy matcher, if it is given.
+    """ 
+    with profile_stage('map authors'):
+        publications = PublicationUtils.map_publications_with_users(all_publication_records, all_authors, fuzzy_matcher)
+    with profile_stage('update collaborators'):
+        AuthorUtils.update_author_collaborators_and_publications_info(publications)
     return publications
 
-def process_social_network(network_fabric, social_network_name, output_directory):
-    """Creates specified social network, analyses that network and saves results into output directory."""
+def get_network_cache_keys(path, authors_file_name, publications_file_name, options):
+    """
+    Returns dictionary network name -> result cache key. Key is built from hashes of input files, all dataset processing and network settings,
+    given options (e.g. fuzzy matching, network filter and analysis options) and network name, so it changes whenever anything that determines
+    network or its analytics changes.
+    """
+    dataset_key = ResultCache.make_key(
+        DatasetCache.get_file_hash(os.path.join(path, authors_file_name)),
+        DatasetCache.get_file_hash(os.path.join(path, publications_file_name)),
+        _get_settings(data_processing_settings),
+        _get_settings(network_settings),
+        sorted(options.items()))
+    return {social_network_name: ResultCache.make_key(dataset_key, social_network_name) for social_network_name in SOCIAL_NETWORK_NAMES}
 
-    # Creating network and exporting nodes and edges to .csv for analysis in 3rd party tools e.g. Gephi.
-    network = network_fabric.get_network(social_network_name)    
-    network.export_network_to_csv(path=output_directory, file_name=social_network_name)
+def get_dataset_snapshot_path(path, authors_file_name, publications_file_name, options):
+    """
+    Returns path of dataset snapshot in dataset cache directory. Snapshot directory is named by hash of input files, dataset processing settings
+    and given options (e.g. fuzzy matching and network filter), so snapshot of changed dataset is never used.
+    """
+    snapshot_key = ResultCache.make_key(
+        DatasetCache.get_file_hash(os.path.join(path, authors_file_name)),
+        DatasetCache.get_file_hash(os.path.join(path, publications_file_name)),
+        _get_settings(data_processing_settings),
+        sorted(options.items()))
+    return os.path.join(path, CACHE_DIRECTORY_NAME, SNAPSHOT_DIRECTORY_NAME, snapshot_key)
+
+def _get_settings(settings_module):
+    """Returns sorted list of (name, value) of all settings (upper case names) defined in settings module."""
+    return sorted((name, value) for name, value in vars(settings_module).items() if name.isupper())
+
+def _is_network_unchanged(previous_digest, digest, output_directory, output_files):
+    """
+    Returns True if network's digest equals its digest from previous run and all its output files exist.
+    Previous digest is None when networks are not compared between runs (not in incremental update mode), then network is always processed.
+    """
+    if previous_digest is None:
+        return False
+    return digest == previous_digest and all(os.path.isfile(os.path.join(output_directory, output_file)) for output_file in output_files)
+
+def process_social_network(network_fabric, social_network_name, output_directory, analysis_options=None, previous_digest=None, incremental_analytics=False, result_cache=None, cache_key=None, export_options=None, export_formats=None, report_options=None):
+    """
+    Creates specified social network, analyses that network and saves results into output directory.
+    Analysis options (e.g. centrality mode, sample size, seed) are passed to NetworkAnalytics.run_analysis.
+    Network is exported in each of export formats (csv by default), export options (compression, parallel writers) are passed to Network.export_network.
+    Report options (e.g. node metrics formats) are passed to NetworkAnalytics.export_metrics_to_file.
+    If network's content digest equals previous digest and its output files exist, export and analysis are skipped. Returns network's digest.
+    With incremental analytics, graph and centralities are kept in output directory and only changed components are recalculated in next run.
+    With result cache, network and its analytics stored under cache key are exported without creating and analysing network,
+    otherwise they are stored in cache once network is analysed.
+    """
+
+    # Creating network (or restoring it from result cache) and exporting nodes and edges to .csv for analysis in 3rd party tools e.g. Gephi.
+    cached_result = result_cache.get(cache_key) if result_cache is not None else None
+    if cached_result is not None:
+        print(f'{social_network_name} is in result cache, exporting cached network and analytics...')
+        network = StoredNetwork(cached_result['nodes'], cached_result['edges'])
+    else:
+        # Network is lazy, it is created here so that creation is not recorded as part of export
+        network = network_fabric.get_network(social_network_name).materialize()
+    digest = network.get_digest() if previous_digest is not None else None
+    export_formats = export_formats or DEFAULT_EXPORT_FORMATS
+    compression = (export_options or {}).get('compression')
+    output_files = [f'{social_network_name} - Analytics.txt']
+    for export_format in export_formats:
+        output_files += GraphExportUtils.get_file_names(social_network_name, export_format, compression)
+    for node_metrics_format in (report_options or {}).get('node_metrics_formats', []):
+        output_files.append(AnalyticsReportUtils.get_node_metrics_file_name(social_network_name, node_metrics_format))
+    if _is_network_unchanged(previous_digest, digest, output_directory, output_files):
+        print(f'{social_network_name} has not changed, skipping export and analysis...')
+        return digest
+    for export_format in export_formats:
+        with profile_stage(f'export {export_format}'):
+            network.export_network(path=output_directory, file_name=social_network_name, export_format=export_format, **(export_options or {}))
     
     # Running network analytics, calculating various metrics, using networkx.
-    network_analytics = NetworkAnalytics(network, social_network_name)
-    network_analytics.run_analysis()
-    network_analytics.export_metrics_to_file(path=output_directory)
-
-def create_and_process_social_networks(network_fabric, output_directory):
-    """Creates various social network and export network's nodes, edges and metrics for further analysis."""
-    # Creating CoAuthor Network and running network analysis
-    coauthor_network_name = 'CoAuthor Network'
-    process_social_network(network_fabric, coauthor_network_name, output_directory)
-    
-    # Creating Article Network and running network analysis
-    article_network_name = 'Article Network'
-    process_social_network(network_fabric, article_network_name, output_directory)
-    
-    # Creating Department network and running network analysis
-    department_network_name = 'Department Network'
-    process_social_network(network_fabric, department_network_name, output_directory)
-    
-    # Creating Department Yearly network and running network analysis
-    department_yearly_network_name = 'Department Yearly Network'
-    process_social_network(network_fabric, department_yearly_network_name, output_directory)
-    
-    # Creating Author-Publications network and running network analysis
-    author_publication_network_name = 'Author Publications Network'
-    process_social_network(network_fabric, author_publication_network_name, output_directory)
-    
-    # Creating Author-Publications network and running network analysis
-    article_paper_network_name = 'Article Paper Network'
-    process_social_network(network_fabric, article_paper_network_name, output_directory)
-    
-    # Creating Publications Yearly network and running network analysis
-    publications_yearly_network_name = 'Publications Yearly Network'
-    process_social_network(network_fabric, publications_yearly_network_name, output_directory)
+    with profile_stage('analysis'):
+        network_analytics = NetworkAnalytics(network, social_network_name)
+        if cached_result is not None:
+            network_analytics.set_results(cached_result['metrics'], cached_result['node_metrics'])
+        else:
+            state_path = os.path.join(output_directory, ANALYTICS_STATE_DIRECTORY_NAME, social_network_name + '.pkl') if incremental_analytics else None
+            network_analytics.run_analysis(**(analysis_options or {}), state_path=state_path)
+    with profile_stage('export analytics'):
+        network_analytics.export_metrics_to_file(path=output_directory, **(report_options or {}))
+    if result_cache is not None and cached_result is None:
+        with profile_stage('store in result cache'):
+            metrics, node_metrics = network_analytics.get_results()
+            result_cache.put(cache_key, {'nodes': network.nodes, 'edges': network.edges, 'metrics': metrics, 'node_metrics': node_metrics})
+    return digest
+
+def _init_social_network_worker(network_fabric):
+    """Keeps network fabric in worker process, so it is transferred only once per worker instead of once per network."""
+    global _worker_network_fabric
+    _worker_network_fabric = network_fabric
+
+def _process_social_network_in_worker(social_network_name, output_directory, analysis_options, previous_digest, incremental_analytics, result_cache, cache_key, export_options, export_formats, report_options):
+    """
+    Processes social network in worker process and returns its console output (so it can be printed without interleaving), 
+    network's digest and profiling records of the network.
+    """
+    log = io.StringIO()
+    first_record = len(profiler.records)
+    with redirect_stdout(log), profile_stage(social_network_name):
+        digest = process_social_network(_worker_network_fabric, social_network_name, output_directory, analysis_options, previous_digest, incremental_analytics, result_cache, cache_key, export_options, export_formats, report_options)
+    return log.getvalue(), digest, profiler.records[first_record:]
+
+def create_and_process_social_networks(network_fabric, output_directory, analysis_options=None, workers=1, network_digests=None, incremental_analytics=False, result_cache=None, network_cache_keys=None, export_options=None, export_formats=None, report_options=None):
+    """
+    Creates various social network and export network's nodes, edges and metrics for further analysis.
+    Networks are independent, so with more than one worker they are processed in a pool of processes 
+    (None uses all available cores). Console output of each network is printed in order, once that network is done.
+    With network digests (network name -> digest, from previous run), unchanged networks are skipped and digests are updated in place.
+    With incremental analytics, centralities of changed networks are recalculated only in components that changed since previous run.
+    With result cache (and network cache keys from get_network_cache_keys), networks found in cache are only exported. 
+    Network fabric can be None if all networks are in cache.
+    Export options (e.g. {'compression': 'gzip'}) control how nodes and edges files are written.
+    Export formats (network name -> list of formats, e.g. ['csv', 'gexf']) select formats of each network, networks that are not listed are exported to csv.
+    Report options (e.g. {'node_metrics_formats': ['csv']}) control which analytics files are written next to analytics report.
+    """
+    def get_previous_digest(social_network_name):
+        if network_digests is None:
+            return None
+        return network_digests.get(social_network_name, '')
+
+    def get_export_formats(social_network_name):
+        return (export_formats or {}).get(social_network_name, DEFAULT_EXPORT_FORMATS)
+
+    def get_cache_key(social_network_name):
+        return network_cache_keys[social_network_name] if network_cache_keys is not None else None
+
+    if workers == 1:
+        for social_network_name in SOCIAL_NETWORK_NAMES:
+            with profile_stage(social_network_name):
+                digest = process_social_network(network_fabric, social_network_name, output_directory, analysis_options, get_previous_digest(social_network_name), incremental_analytics, 
+                                                result_cache, get_cache_key(social_network_name), export_options, get_export_formats(social_network_name), report_options)
+            if network_digests is not None:
+                network_digests[social_network_name] = digest
+        return
 
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_social_network_worker, initargs=(network_fabric,)) as executor:
+        results = [executor.submit(_process_social_network_in_worker, social_network_name, output_directory, analysis_options, get_previous_digest(social_network_name), incremental_analytics, 
+                                   result_cache, get_cache_key(social_network_name), export_options, get_export_formats(social_network_name), report_options) for social_network_name in SOCIAL_NETWORK_NAMES]
+        for social_network_name, result in zip(SOCIAL_NETWORK_NAMES, results):
+            log, digest, profiling_records = result.result()
+            print(log, end='')
+            profiler.add_records(profiling_records)
+            if network_digests is not None:
+                network_digests[social_network_name] = digest